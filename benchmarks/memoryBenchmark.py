@@ -0,0 +1,121 @@
+"""Compare the memory used by StatementTemplates with that of the dataclass they replaced, and with ColumnarStatementTemplates.
+
+Run from the repository root with: PYTHONPATH=src python -m benchmarks.memoryBenchmark [number of templates]
+"""
+
+from dataclasses import dataclass, field
+from ap import StatementTemplate, ColumnarStatementTemplates
+import sys, tracemalloc
+
+
+@dataclass
+class DataclassStatementTemplate:
+    """The StatementTemplate fields as they were, a dataclass with eagerly allocated lists and dicts."""
+
+    shapes: list = field(default_factory=list)
+    properties: list = field(default_factory=list)
+    labels: dict = field(default_factory=dict)
+    mandatory: bool = False
+    repeatable: bool = True
+    valueNodeTypes: list = field(default_factory=list)
+    valueDataTypes: list = field(default_factory=list)
+    valueShapes: list = field(default_factory=list)
+    valueClasses: list = field(default_factory=list)
+    valueConstraints: list = field(default_factory=list)
+    valueConstraintType: str = ""
+    notes: dict = field(default_factory=dict)
+    severity: str = ""
+    message: dict = field(default_factory=dict)
+    propertyDescriptions: dict = field(default_factory=dict)
+
+
+def synthetic_rows(n, rows_per_shape=20):
+    """Return n TAP statement template rows, as dicts of cell values, in the typical mix of a large TAP."""
+    rows = []
+    for i in range(n):
+        row = {
+            "shapeID": "Shape%d" % (i // rows_per_shape),
+            "propertyID": "ex:property%d" % i,
+            "propertyLabel": "Property %d" % i,
+            "valueNodeType": "literal",
+        }
+        if i % 4 == 0:
+            row["valueNodeType"] = "iri"
+            row["valueShape"] = "Shape%d" % ((i // rows_per_shape) + 1)
+        else:
+            row["valueDataType"] = "xsd:string"
+        if i % 10 == 0:
+            row["note"] = "Note on property %d" % i
+        rows.append(row)
+    return rows
+
+
+def make_template(row):
+    ps = StatementTemplate()
+    ps.add_shape(row["shapeID"])
+    ps.add_property(row["propertyID"])
+    ps.add_label("en", row["propertyLabel"])
+    ps.add_valueNodeType(row["valueNodeType"])
+    if "valueDataType" in row:
+        ps.add_valueDataType(row["valueDataType"])
+    if "valueShape" in row:
+        ps.add_valueShape(row["valueShape"])
+    if "note" in row:
+        ps.add_note("en", row["note"])
+    return ps
+
+
+def make_dataclass_template(row):
+    ps = DataclassStatementTemplate()
+    ps.shapes.append(row["shapeID"])
+    ps.properties.append(row["propertyID"])
+    ps.labels["en"] = row["propertyLabel"]
+    ps.valueNodeTypes.append(row["valueNodeType"])
+    if "valueDataType" in row:
+        ps.valueDataTypes.append(row["valueDataType"])
+    if "valueShape" in row:
+        ps.valueShapes.append(row["valueShape"])
+    if "note" in row:
+        ps.notes["en"] = row["note"]
+    return ps
+
+
+def measure(make, rows):
+    """Return bytes allocated to build one object per row with make."""
+    tracemalloc.start()
+    objects = [make(row) for row in rows]
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size
+
+
+def measure_columnar(rows):
+    """Return bytes allocated to store a template per row in ColumnarStatementTemplates."""
+    tracemalloc.start()
+    columns = ColumnarStatementTemplates(make_template(row) for row in rows)
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size
+
+
+def main(n=50000):
+    rows = synthetic_rows(n)
+    old_size = measure(make_dataclass_template, rows)
+    new_size = measure(make_template, rows)
+    columnar_size = measure_columnar(rows)
+    print("%d statement templates" % n)
+    print("dataclass:         %10d bytes, %5d per template" % (old_size, old_size // n))
+    print("StatementTemplate: %10d bytes, %5d per template" % (new_size, new_size // n))
+    print("reduction:         %9.1f%%" % (100 * (old_size - new_size) / old_size))
+    print(
+        "columnar:          %10d bytes, %5d per template"
+        % (columnar_size, columnar_size // n)
+    )
+    print("reduction:         %9.1f%%" % (100 * (new_size - columnar_size) / new_size))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        main(int(sys.argv[1]))
+    else:
+        main()
@@ -0,0 +1,93 @@
+"""Time the stages of converting synthetic profiles of increasing size, to find where conversion stops scaling.
+
+For each size a SyntheticProfile is written to a temporary folder, then TAP2APConverter.load_tap, TAP2APConverter.convert_TAP_AP, AP2SHACLConverter.convert_AP_SHACL and dump_shacl are timed separately (loading the namespaces, shapes and about files is timed as load_profile).
+
+Run from the repository root with: PYTHONPATH=src python -m benchmarks.scalingBenchmark [rows ...] [options], see --help.
+"""
+
+from .syntheticProfile import add_profile_arguments, profile_from_arguments
+import argparse, json, tempfile, time
+
+default_sizes = [1000, 10000, 100000]
+# dctap's csvreader takes time quadratic in the number of rows (about 50 s for
+# 2000), so larger TAPs are skipped unless the fast reader is used
+dctap_max_rows = 2000
+phases = [
+    "load_tap",
+    "load_profile",
+    "convert_TAP_AP",
+    "convert_AP_SHACL",
+    "dump_shacl",
+]
+
+
+def time_phases(profile, config_fname, reader="fast", deterministic=True):
+    """Convert a Profile to SHACL in Turtle, return dict of the seconds taken by each phase and the numbers of statement templates and triples."""
+    from tap2shacl import TAP2SHACLConverter
+
+    times = dict()
+    start = time.perf_counter()
+    # the TAP2APConverter loads the TAP as it is made
+    c = TAP2SHACLConverter(profile.tap, config_fname, None, deterministic, reader)
+    times["load_tap"] = time.perf_counter() - start
+    start = time.perf_counter()
+    c.load_profile(profile.namespaces, profile.about, profile.shapes)
+    times["load_profile"] = time.perf_counter() - start
+    start = time.perf_counter()
+    c.tap2apConverter.convert_TAP_AP()
+    times["convert_TAP_AP"] = time.perf_counter() - start
+    start = time.perf_counter()
+    c.ap2shaclConverter.convert_AP_SHACL()
+    times["convert_AP_SHACL"] = time.perf_counter() - start
+    start = time.perf_counter()
+    c.dump_shacl(profile.output)
+    times["dump_shacl"] = time.perf_counter() - start
+    times["total"] = sum(times.values())
+    times["statementTemplates"] = len(c.ap.statementTemplates)
+    times["triples"] = len(c.sg)
+    times["reader"] = c.tap["reader"]
+    return times
+
+
+def print_table(results):
+    columns = ["rows"] + phases + ["total", "triples"]
+    print(" ".join("%16s" % column for column in columns))
+    for rows, times in results:
+        cells = ["%16d" % rows]
+        if times is None:
+            cells.append("  skipped (dctap reads this many rows too slowly)")
+        else:
+            cells.extend("%15.3fs" % times[phase] for phase in phases + ["total"])
+            cells.append("%16d" % times["triples"])
+        print(" ".join(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.scalingBenchmark",
+        description="Time the conversion phases of synthetic profiles of increasing size.",
+    )
+    parser.add_argument("sizes", type=int, nargs="*", default=default_sizes)
+    parser.add_argument("-c", "--config", default="dctap.yml")
+    parser.add_argument("--reader", choices=["dctap", "fast"], default="fast")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    results = []
+    for rows in args.sizes:
+        if (args.reader == "dctap") and (rows > dctap_max_rows):
+            results.append((rows, None))
+            continue
+        with tempfile.TemporaryDirectory() as folder:
+            synthetic = profile_from_arguments(args, rows)
+            profile = synthetic.write(folder)
+            times = time_phases(profile, args.config, args.reader)
+            results.append((synthetic.rows(), times))
+    if args.json:
+        print(json.dumps([{"rows": rows, "times": times} for rows, times in results]))
+    else:
+        print_table(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Check how long the tap2shacl CLI takes to start, and that --version and --help do not load the converters.
+
+Runs python -X importtime -m tap2shacl with each set of arguments, and fails (exit status 1) if any heavy module is imported or the import time, over that of starting python with nothing to run, is over the budget.
+
+Run from the repository root with: PYTHONPATH=src python -m benchmarks.startupBenchmark [budget in ms]
+"""
+
+import os, subprocess, sys
+
+# modules that take most of the start up time of a conversion
+heavy_modules = ["rdflib", "dctap", "yaml", "ruamel", "ap2shacl", "tap2ap"]
+# maximum time, in milliseconds, to import modules for --version or --help
+# (before lazy imports it was over 1000)
+default_budget = 100
+# best of this many runs is taken, to smooth out noise
+repeats = 5
+arguments = [["--version"], ["--help"]]
+
+
+def import_times(args):
+    """Return dict of module name: (depth, cumulative import time in microseconds) for python -m tap2shacl args, or for starting python if args is None."""
+    env = dict(os.environ)
+    src_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+    env["PYTHONPATH"] = os.path.abspath(src_dir)
+    if args is None:
+        command = [sys.executable, "-X", "importtime", "-c", "pass"]
+    else:
+        command = [sys.executable, "-X", "importtime", "-m", "tap2shacl"] + args
+    result = subprocess.run(command, env=env, capture_output=True, text=True)
+    return parse_import_times(result.stderr)
+
+
+def parse_import_times(text):
+    """Return dict of module name: (depth, cumulative import time in microseconds) from -X importtime output."""
+    times = dict()
+    for line in text.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_time, cumulative, name = line[len("import time:") :].split("|")
+        # the name follows a space, and two more for each level of nesting
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        times[name.strip()] = (depth, int(cumulative))
+    return times
+
+
+def total_import_time(times):
+    """Return total import time in microseconds, adding up modules imported at the top level."""
+    # nested imports are included in their importer's cumulative time, so
+    # count only those at depth 0
+    return sum(cumulative for (depth, cumulative) in times.values() if depth == 0)
+
+
+def best_import_time(args):
+    """Return the modules imported and the least total import time in ms of several runs."""
+    best = None
+    best_times = None
+    for i in range(repeats):
+        times = import_times(args)
+        total = total_import_time(times) / 1000
+        if best is None or total < best:
+            best = total
+            best_times = times
+    return (best_times, best)
+
+
+def check(args, budget=default_budget, baseline=0):
+    """Return list of problems with the start up for args; empty if within budget."""
+    problems = []
+    times, best = best_import_time(args)
+    best = best - baseline
+    loaded = [name for name in times if name.split(".")[0] in heavy_modules]
+    msg = "%-12s imports %4d modules in %6.1f ms more" % (
+        " ".join(args),
+        len(times),
+        best,
+    )
+    print(msg)
+    if loaded:
+        problems.append(" ".join(args) + " imports " + ", ".join(sorted(loaded)))
+    if best > budget:
+        problems.append(
+            "%s imports take %.1f ms, over the budget of %d ms"
+            % (" ".join(args), best, budget)
+        )
+    return problems
+
+
+def main(budget=default_budget):
+    problems = []
+    times, baseline = best_import_time(None)
+    print("python alone imports %4d modules in %6.1f ms" % (len(times), baseline))
+    for args in arguments:
+        problems.extend(check(args, budget, baseline))
+    for problem in problems:
+        print("FAIL:", problem)
+    return len(problems) == 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        ok = main(int(sys.argv[1]))
+    else:
+        ok = main()
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,178 @@
+"""Write synthetic profiles, a TAP with its shapes, about and namespaces csv files, of any size for benchmarks.
+
+Run from the repository root with: PYTHONPATH=src python -m benchmarks.syntheticProfile <folder> [options], see --help.
+"""
+
+from dataclasses import dataclass
+import argparse, csv, os
+
+tapColumns = [
+    "shapeID",
+    "propertyID",
+    "propertyLabel",
+    "mandatory",
+    "repeatable",
+    "valueNodeType",
+    "valueDataType",
+    "valueConstraint",
+    "valueConstraintType",
+    "valueShape",
+    "valueClass",
+    "note",
+]
+shapeColumns = ["shapeID", "label", "comment", "target", "targetType", "closed"]
+namespaces = [
+    ("ex", "http://example.org/terms/"),
+    ("sh", "http://www.w3.org/ns/shacl#"),
+    ("rdf", "http://www.w3.org/1999/02/22-rdf-syntax-ns#"),
+    ("rdfs", "http://www.w3.org/2000/01/rdf-schema#"),
+    ("xsd", "http://www.w3.org/2001/XMLSchema#"),
+]
+
+
+@dataclass
+class SyntheticProfile:
+    """A synthetic profile of shapes with rows_per_shape statement templates each.
+
+    The rows cycle through plain literals, picklists of picklist_size values, references to fan_out other shapes (in one multi-valued valueShape cell) and dates. Every multi_value_every-th row also has multi-valued node type and class cells. Only the first row of a shape gives its shapeID, as is usual in TAPs.
+    """
+
+    shapes: int = 20
+    rows_per_shape: int = 50
+    picklist_size: int = 5
+    fan_out: int = 2
+    multi_value_every: int = 10
+
+    def rows(self):
+        return self.shapes * self.rows_per_shape
+
+    def tap_row(self, shape, n):
+        """Return the TAP row dict for statement template n of shape."""
+        row = dict.fromkeys(tapColumns, "")
+        if n == 0:
+            row["shapeID"] = "Shape%d" % shape
+        row["propertyID"] = "ex:property%d" % n
+        row["propertyLabel"] = "Property %d of shape %d" % (n, shape)
+        row["mandatory"] = "TRUE" if n % 3 == 0 else "FALSE"
+        row["repeatable"] = "TRUE" if n % 2 == 0 else "FALSE"
+        kind = n % 4
+        if kind == 0:
+            row["valueNodeType"] = "literal"
+            row["valueDataType"] = "xsd:string"
+        elif kind == 1:
+            row["valueNodeType"] = "literal"
+            values = ["value%d" % i for i in range(self.picklist_size)]
+            row["valueConstraint"] = " ".join(values)
+            row["valueConstraintType"] = "picklist"
+        elif kind == 2:
+            row["valueNodeType"] = "IRI"
+            others = [(shape + i) % self.shapes for i in range(1, self.fan_out + 1)]
+            row["valueShape"] = " ".join("Shape%d" % other for other in others)
+        else:
+            row["valueNodeType"] = "literal"
+            row["valueDataType"] = "xsd:date"
+        if n % self.multi_value_every == 0:
+            row["valueNodeType"] = "IRI BNODE"
+            row["valueClass"] = "ex:ClassA, ex:ClassB"
+        if n % 10 == 5:
+            row["note"] = "Note on property %d, with a comma." % n
+        return row
+
+    def tap_rows(self):
+        """Yield the TAP row dicts, shape by shape."""
+        for shape in range(self.shapes):
+            for n in range(self.rows_per_shape):
+                yield self.tap_row(shape, n)
+
+    def shape_rows(self):
+        """Yield the shapes csv row dicts."""
+        for shape in range(self.shapes):
+            yield {
+                "shapeID": "Shape%d" % shape,
+                "label": "Shape %d" % shape,
+                "comment": "Synthetic shape %d" % shape,
+                "target": "ex:Class%d" % shape,
+                "targetType": "class",
+                "closed": "FALSE",
+            }
+
+    def write(self, folder):
+        """Write tap.csv, shapes.csv, about.csv and namespaces.csv in folder; return a Profile of them."""
+        from tap2shacl.batchConvert import Profile
+
+        os.makedirs(folder, exist_ok=True)
+        fnames = dict()
+        for part in ["tap", "shapes", "about", "namespaces"]:
+            fnames[part] = os.path.join(folder, part + ".csv")
+        write_csv(fnames["tap"], tapColumns, self.tap_rows())
+        write_csv(fnames["shapes"], shapeColumns, self.shape_rows())
+        with open(fnames["about"], "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["url", "tap.csv"])
+            writer.writerow(["title", "Synthetic profile of %d rows" % self.rows()])
+            writer.writerow(["language", "en"])
+        with open(fnames["namespaces"], "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["prefix", "URI"])
+            writer.writerows(namespaces)
+        return Profile(
+            fnames["tap"],
+            fnames["namespaces"],
+            fnames["about"],
+            fnames["shapes"],
+            os.path.join(folder, "shacl.ttl"),
+        )
+
+
+def write_csv(fname, columns, rows):
+    with open(fname, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def add_profile_arguments(parser):
+    """Add the options setting the shape of a SyntheticProfile, other than its size, to an argparse parser."""
+    default = SyntheticProfile()
+    parser.add_argument("--rows-per-shape", type=int, default=default.rows_per_shape)
+    parser.add_argument("--picklist-size", type=int, default=default.picklist_size)
+    parser.add_argument(
+        "--fan-out",
+        type=int,
+        default=default.fan_out,
+        help="number of shapes in each valueShape cell",
+    )
+    parser.add_argument(
+        "--multi-value-every",
+        type=int,
+        default=default.multi_value_every,
+        help="give every nth row multi-valued cells",
+    )
+
+
+def profile_from_arguments(args, rows):
+    """Return a SyntheticProfile of about rows rows (whole shapes) shaped by parsed arguments."""
+    return SyntheticProfile(
+        max(1, rows // args.rows_per_shape),
+        args.rows_per_shape,
+        args.picklist_size,
+        args.fan_out,
+        args.multi_value_every,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.syntheticProfile",
+        description="Write a synthetic profile for benchmarks.",
+    )
+    parser.add_argument("folder")
+    parser.add_argument("rows", type=int, nargs="?", default=1000)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profile = profile_from_arguments(args, args.rows).write(args.folder)
+    print("Wrote", profile.tap, profile.shapes, profile.about, profile.namespaces)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,8 @@
 from .ap import AP
+from .columnarAP import ColumnarAP, ColumnarStatementTemplates, SymbolTable
 from .statementTemplate import StatementTemplate
 from .shapeInfo import ShapeInfo, read_shapeInfoDict
+from .orderedSet import OrderedSet
+from .tokenizer import Tokenizer, default_tokenizer, tokenizer_from_config
+from .csvSource import open_csv, read_csv_rows, read_csv_text
+from .phaseTimer import Phase, PhaseTimer
@@ -1,7 +1,8 @@
 from dataclasses import dataclass, field, asdict
 from .statementTemplate import StatementTemplate
 from .shapeInfo import ShapeInfo, read_shapeInfoDict
-from csv import DictReader
+from .tokenizer import default_tokenizer
+from .csvSource import read_csv_rows
 import pprint, re
 
 defaultLang = "en"
@@ -15,6 +16,16 @@ class AP:
     namespaces: dict = field(default_factory=dict)
     metadata: dict = field(default_factory=dict)
     shapeInfo: dict = field(default_factory=dict)
+    # incremented whenever add_namespace changes the namespaces
+    namespacesVersion: int = field(default=0, init=False, repr=False, compare=False)
+    # keys of the statementTemplates, for fast duplicate checks, and the list,
+    # its length and last template when they were found, to notice changes
+    _statementTemplateKeys: set = field(
+        default_factory=set, init=False, repr=False, compare=False
+    )
+    _indexedStatementTemplates: tuple = field(
+        default=(None, 0, None), init=False, repr=False, compare=False
+    )
 
     def add_namespace(self, ns, uri):
         """Adds (over-writes) the ns: URI, key value pair to the namespaces dict."""
@@ -25,7 +36,9 @@ class AP:
                 prefix = ns[:-1]
             else:
                 prefix = ns
-            self.namespaces[prefix] = uri
+            if self.namespaces.get(prefix) != uri:
+                self.namespaces[prefix] = uri
+                self.namespacesVersion += 1
         else:
             msg = "Both ns and URI must be strings."
             raise TypeError(msg)
@@ -49,46 +62,98 @@ class AP:
             raise TypeError(msg)
 
     def add_statementTemplate(self, ps):
-        """Adds StatementTemplate object to the list of property statements."""
-        if ps in self.statementTemplates:
-            pass
-        elif type(ps) == StatementTemplate:
-            self.statementTemplates.append(ps)
-        else:
+        """Adds StatementTemplate object to the list of property statements, unless it is already there.
+
+        Duplicates are found from the key() that each StatementTemplate had when it was added, so templates should not be changed after they are added. The keys are found again if the list has been replaced, or lengthened, shortened or had its last template changed directly; to replace a template elsewhere, assign a new list.
+        """
+        if type(ps) != StatementTemplate:
             msg = "Statement must be of StatementTemplate type."
             raise TypeError(msg)
+        if self._statementTemplates_changed():
+            # list was changed directly, not through this method
+            self._index_statementTemplates()
+        key = ps.key()
+        if key in self._statementTemplateKeys:
+            pass
+        else:
+            self.statementTemplates.append(ps)
+            self._statementTemplateKeys.add(key)
+            self._indexedStatementTemplates = self._statementTemplates_state()
+
+    def _statementTemplates_state(self):
+        """Return the list of statementTemplates, its length and its last template."""
+        statementTemplates = self.statementTemplates
+        last = statementTemplates[-1] if statementTemplates else None
+        return (statementTemplates, len(statementTemplates), last)
+
+    def _statementTemplates_changed(self):
+        """Return True if the list of statementTemplates is not the one whose keys were found, or has a different length or last template."""
+        indexed, length, last = self._indexedStatementTemplates
+        statementTemplates = self.statementTemplates
+        return (
+            (statementTemplates is not indexed)
+            or (len(statementTemplates) != length)
+            or (length > 0 and statementTemplates[-1] is not last)
+        )
+
+    def _index_statementTemplates(self):
+        """Rebuild the set of keys of the statementTemplates."""
+        self._statementTemplateKeys = set(ps.key() for ps in self.statementTemplates)
+        self._indexedStatementTemplates = self._statementTemplates_state()
+
+    def statementTemplate_groups(self):
+        """Return dict of the first shape of each statement template ("" for none) and list of those with it, in the order first seen."""
+        groups = dict()
+        for ps in self.statementTemplates:
+            if ps.shapes:
+                shape = ps.shapes[0]
+            else:
+                shape = ""
+            groups.setdefault(shape, []).append(ps)
+        return groups
+
+    def statementTemplates_with(self, name, value):
+        """Return list of the statement templates whose field name has value: one of the values of a multi-valued field such as valueDataTypes, or the value of a single-valued one such as severity."""
+        results = []
+        for ps in self.statementTemplates:
+            values = getattr(ps, name)
+            if isinstance(values, (bool, str)):
+                if values == value:
+                    results.append(ps)
+            elif isinstance(values, dict):
+                msg = "Cannot search statement templates by " + str(name)
+                raise ValueError(msg)
+            elif value in values:
+                results.append(ps)
+        return results
 
     def load_namespaces(self, fname):
-        """Load namespaces from a (csv) file."""
+        """Load namespaces from a (csv) file, csv text, file object or iterable of row dicts with prefix and URI."""
         # TODO could add options for loading from other formats
-        with open(fname, "r") as csv_file:
-            csvReader = DictReader(csv_file)
-            for row in csvReader:
-                if row["prefix"] and row["URI"]:
-                    self.add_namespace(row["prefix"], row["URI"])
-                elif row["URI"]:
-                    self.add_namespace("", row["URI"])
-                else:  # pass rows with missing data
-                    pass
+        for row in read_csv_rows(fname):
+            if row.get("prefix") and row.get("URI"):
+                self.add_namespace(row["prefix"], row["URI"])
+            elif row.get("URI"):
+                self.add_namespace("", row["URI"])
+            else:  # pass rows with missing data
+                pass
 
     def load_metadata(self, fname):
-        """Load metadata from a (headingless csv) file."""
+        """Load metadata from a (headingless csv) file, csv text, file object or iterable of row dicts with key and value."""
         # TODO could add options for loading from other formats
         # TODO option to have header row or not
-        with open(fname, "r") as csv_file:
-            csvReader = DictReader(csv_file, fieldnames=["key", "value"])
-            for row in csvReader:
-                self.add_metadata(row["key"], row["value"])
+        for row in read_csv_rows(fname, fieldnames=["key", "value"]):
+            self.add_metadata(row["key"], row["value"])
 
-    def load_shapeInfo(self, fname):
-        """Load shapeInfo from a (csv) file."""
+    def load_shapeInfo(self, fname, tokenizer=default_tokenizer):
+        """Load shapeInfo from a (csv) file, csv text, file object or iterable of row dicts."""
         # TODO could add options for loading from other formats
         # TODO check shapeID column exists
         if ("lang" in self.metadata.keys()) and self.metadata["lang"]:
             lang = self.metadata["lang"]
         else:
             lang = defaultLang
-        shapeInfoDict = read_shapeInfoDict(fname, lang)
+        shapeInfoDict = read_shapeInfoDict(fname, lang, tokenizer)
         for key in shapeInfoDict.keys():
             self.add_shapeInfo(key, shapeInfoDict[key])
 
@@ -0,0 +1,266 @@
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from .ap import AP
+from .statementTemplate import StatementTemplate
+
+# StatementTemplate fields by how they are stored in columns
+multiValuedFields = [
+    "shapes",
+    "properties",
+    "valueNodeTypes",
+    "valueDataTypes",
+    "valueShapes",
+    "valueClasses",
+    "valueConstraints",
+]
+langStringFields = ["labels", "notes", "message", "propertyDescriptions"]
+booleanFields = ["mandatory", "repeatable"]
+stringFields = ["valueConstraintType", "severity"]
+# typecode of the arrays of symbol ids and offsets
+idType = "i"
+
+
+class SymbolTable:
+    """Numbers strings, so that each distinct string is stored once and referred to by its integer id."""
+
+    def __init__(self):
+        self.strings = []
+        self.ids = dict()
+
+    def __len__(self):
+        return len(self.strings)
+
+    def __getitem__(self, id):
+        return self.strings[id]
+
+    def intern(self, s):
+        """Return the id of string s, numbering it if it is new."""
+        id = self.ids.get(s)
+        if id is None:
+            id = self.ids[s] = len(self.strings)
+            self.strings.append(s)
+        return id
+
+    def id(self, s):
+        """Return the id of string s, or None if it has not been numbered."""
+        return self.ids.get(s)
+
+
+class ColumnarStatementTemplates:
+    """A sequence of statement templates stored column by column rather than as StatementTemplate objects.
+
+    Strings are held once, in a SymbolTable, and each field is an array of their ids: multi-valued fields are one array of the values of all the templates with an array of offsets where each template's values start, language-tagged strings the same with an array of languages, and booleans an array of 0 and 1. Reading a template, by index or iteration, gives a new StatementTemplate with its values; changing that does not change the stored template. Templates can only be appended.
+    """
+
+    def __init__(self, statementTemplates=(), symbols=None):
+        self.symbols = symbols if symbols is not None else SymbolTable()
+        self.count = 0
+        self.values = dict()
+        self.offsets = dict()
+        self.languages = dict()
+        for name in multiValuedFields + langStringFields:
+            self.values[name] = array(idType)
+            self.offsets[name] = array(idType, [0])
+        for name in langStringFields:
+            self.languages[name] = array(idType)
+        for name in booleanFields:
+            self.values[name] = array("b")
+        for name in stringFields:
+            self.values[name] = array(idType)
+        self.extend(statementTemplates)
+
+    def append(self, ps):
+        """Add StatementTemplate ps at the end."""
+        intern = self.symbols.intern
+        for name in multiValuedFields:
+            values = self.values[name]
+            values.extend([intern(value) for value in getattr(ps, name)])
+            self.offsets[name].append(len(values))
+        for name in langStringFields:
+            values = self.values[name]
+            for lang, value in getattr(ps, name).items():
+                self.languages[name].append(intern(lang))
+                values.append(intern(value))
+            self.offsets[name].append(len(values))
+        for name in booleanFields:
+            self.values[name].append(1 if getattr(ps, name) else 0)
+        for name in stringFields:
+            self.values[name].append(intern(getattr(ps, name)))
+        self.count = self.count + 1
+
+    def extend(self, statementTemplates):
+        for ps in statementTemplates:
+            self.append(ps)
+
+    def __len__(self):
+        return self.count
+
+    def template(self, n):
+        """Return a new StatementTemplate with the values of template n."""
+        strings = self.symbols.strings
+        fields = dict()
+        for name in multiValuedFields:
+            start, end = self.offsets[name][n], self.offsets[name][n + 1]
+            if end > start:
+                fields[name] = [strings[id] for id in self.values[name][start:end]]
+        for name in langStringFields:
+            start, end = self.offsets[name][n], self.offsets[name][n + 1]
+            if end > start:
+                langs = self.languages[name][start:end]
+                values = self.values[name][start:end]
+                fields[name] = dict(
+                    (strings[lang], strings[value])
+                    for (lang, value) in zip(langs, values)
+                )
+        for name in booleanFields:
+            fields[name] = self.values[name][n] == 1
+        for name in stringFields:
+            fields[name] = strings[self.values[name][n]]
+        return StatementTemplate(**fields)
+
+    def __getitem__(self, n):
+        if isinstance(n, slice):
+            return [self.template(i) for i in range(*n.indices(self.count))]
+        if n < 0:
+            n = n + self.count
+        if (n < 0) or (n >= self.count):
+            raise IndexError("statement template index out of range")
+        return self.template(n)
+
+    def __iter__(self):
+        for n in range(self.count):
+            yield self.template(n)
+
+    def __eq__(self, other):
+        if isinstance(other, (ColumnarStatementTemplates, TemplateSelection, list)):
+            return (len(self) == len(other)) and all(
+                a == b for (a, b) in zip(self, other)
+            )
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return self.__class__.__name__ + "(" + repr(list(self)) + ")"
+
+    def first_values(self, name):
+        """Yield the id of the first value of multi-valued field name of each template, or None if it has none."""
+        values = self.values[name]
+        offsets = self.offsets[name]
+        for n in range(self.count):
+            if offsets[n + 1] > offsets[n]:
+                yield values[offsets[n]]
+            else:
+                yield None
+
+    def indexes_with(self, name, value):
+        """Return list of the indexes of the templates whose field name has value: one of the values of a multi-valued field, or the value of a boolean or string field.
+
+        The arrays are searched, without making StatementTemplates.
+        """
+        if name in booleanFields:
+            id = 1 if value else 0
+        elif name in multiValuedFields + stringFields:
+            id = self.symbols.id(value)
+            if id is None:
+                return []
+        else:
+            msg = "Cannot search statement templates by " + str(name)
+            raise ValueError(msg)
+        values = self.values[name]
+        positions = [n for (n, v) in enumerate(values) if v == id]
+        if name not in multiValuedFields:
+            return positions
+        offsets = self.offsets[name]
+        # values are not repeated within a template, so indexes are distinct
+        return [bisect_right(offsets, position) - 1 for position in positions]
+
+    def select(self, indexes):
+        """Return a TemplateSelection of the templates at indexes."""
+        return TemplateSelection(self, indexes)
+
+
+class TemplateSelection:
+    """Some of the templates of a ColumnarStatementTemplates, held as their indexes; reads like a list of StatementTemplates."""
+
+    def __init__(self, statementTemplates, indexes=()):
+        self.statementTemplates = statementTemplates
+        self.indexes = array(idType, indexes)
+
+    def append_index(self, n):
+        self.indexes.append(n)
+
+    def __len__(self):
+        return len(self.indexes)
+
+    def __getitem__(self, n):
+        if isinstance(n, slice):
+            return [self.statementTemplates.template(i) for i in self.indexes[n]]
+        return self.statementTemplates.template(self.indexes[n])
+
+    def __iter__(self):
+        for n in self.indexes:
+            yield self.statementTemplates.template(n)
+
+    __eq__ = ColumnarStatementTemplates.__eq__
+    __hash__ = None
+
+    def __repr__(self):
+        return self.__class__.__name__ + "(" + repr(list(self)) + ")"
+
+
+@dataclass
+class ColumnarAP(AP):
+    """An AP which stores its statement templates in ColumnarStatementTemplates, for very large profiles.
+
+    It is used like AP; reading statementTemplates gives new StatementTemplate objects, so templates are added with add_statementTemplate rather than changed in place. Duplicates are found by the hash of their key, checked against the stored template, rather than by keeping every key.
+    """
+
+    statementTemplates: ColumnarStatementTemplates = field(
+        default_factory=ColumnarStatementTemplates
+    )
+    # hash of key: index of the template, or list of indexes if hashes collide
+    _statementTemplateHashes: dict = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def add_statementTemplate(self, ps):
+        """Adds StatementTemplate object to the statement templates, unless an equal one is already there."""
+        if type(ps) != StatementTemplate:
+            msg = "Statement must be of StatementTemplate type."
+            raise TypeError(msg)
+        key = ps.key()
+        h = hash(key)
+        indexes = self._statementTemplateHashes.get(h)
+        if indexes is None:
+            indexes = []
+        elif type(indexes) is int:
+            indexes = [indexes]
+        for n in indexes:
+            if self.statementTemplates.template(n).key() == key:
+                return
+        n = len(self.statementTemplates)
+        self.statementTemplates.append(ps)
+        if indexes:
+            self._statementTemplateHashes[h] = indexes + [n]
+        else:
+            self._statementTemplateHashes[h] = n
+
+    def statementTemplate_groups(self):
+        """Return dict of the first shape of each statement template ("" for none) and a TemplateSelection of those with it, in the order first seen."""
+        statementTemplates = self.statementTemplates
+        strings = statementTemplates.symbols.strings
+        groups = dict()
+        for n, id in enumerate(statementTemplates.first_values("shapes")):
+            shape = "" if id is None else strings[id]
+            group = groups.get(shape)
+            if group is None:
+                group = groups[shape] = statementTemplates.select(())
+            group.append_index(n)
+        return groups
+
+    def statementTemplates_with(self, name, value):
+        """Return a TemplateSelection of the statement templates whose field name has value (see ColumnarStatementTemplates.indexes_with)."""
+        statementTemplates = self.statementTemplates
+        return statementTemplates.select(statementTemplates.indexes_with(name, value))
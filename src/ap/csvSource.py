@@ -0,0 +1,82 @@
+from csv import DictReader, DictWriter
+from contextlib import contextmanager
+import io, os
+
+# The loaders for TAP, namespace, metadata and shape info csv accept any of
+# these sources, so that profiles can be converted without writing files.
+
+
+def is_csv_text(source):
+    """Return True if source is a string of csv text rather than a file name.
+
+    That is, it has a line break, or it has a comma and is not the name of an existing file, like a header row with no data rows. A string with neither is taken as a file name, so that a missing file is reported as such.
+    """
+    if not isinstance(source, str):
+        return False
+    if ("\n" in source) or ("\r" in source):
+        return True
+    return ("," in source) and not os.path.exists(source)
+
+
+def is_file_name(source):
+    return isinstance(source, os.PathLike) or (
+        isinstance(source, str) and not is_csv_text(source)
+    )
+
+
+def rows2csv(rows):
+    """Return csv text with a header row for an iterable of row dicts; the columns are the keys, in the order first seen."""
+    rows = list(rows)
+    fieldnames = dict()  # dict rather than set, to keep the order
+    for row in rows:
+        for key in row.keys():
+            fieldnames[key] = None
+    f = io.StringIO()
+    writer = DictWriter(f, fieldnames=list(fieldnames), lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(rows)
+    return f.getvalue()
+
+
+@contextmanager
+def open_csv(source):
+    """Open a csv source as a text file object.
+
+    source may be a file name, a string of csv text (see is_csv_text), a text or binary (utf-8) file object, or an iterable of row dicts. File objects are read from where they are, and not closed.
+    """
+    if is_file_name(source):
+        with open(source, "r") as csv_file:
+            yield csv_file
+    elif isinstance(source, str):
+        yield io.StringIO(source)
+    elif hasattr(source, "read"):
+        if isinstance(source, (io.RawIOBase, io.BufferedIOBase)):
+            text_file = io.TextIOWrapper(source, encoding="utf-8")
+            try:
+                yield text_file
+            finally:
+                text_file.detach()  # so that source is not closed with it
+        else:
+            yield source
+    elif isinstance(source, bytes):
+        yield io.StringIO(source.decode("utf-8"))
+    else:
+        yield io.StringIO(rows2csv(source))
+
+
+def read_csv_text(source):
+    """Return the csv text of a csv source (see open_csv)."""
+    with open_csv(source) as csv_file:
+        return csv_file.read()
+
+
+def read_csv_rows(source, fieldnames=None):
+    """Return an iterator over the rows of a csv source (see open_csv) as dicts.
+
+    If fieldnames are given the csv has no header row, and rows given as dicts must use them as keys.
+    """
+    if isinstance(source, (str, bytes, os.PathLike)) or hasattr(source, "read"):
+        with open_csv(source) as csv_file:
+            yield from DictReader(csv_file, fieldnames=fieldnames)
+    else:  # already rows
+        yield from source
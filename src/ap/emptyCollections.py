@@ -0,0 +1,76 @@
+from .orderedSet import OrderedSet
+
+# Shared, read-only empty collections used as the default values of
+# StatementTemplate and ShapeInfo fields, so that objects only allocate
+# their own list or dict when something is added to it.
+
+
+def _read_only(self, *args, **kwargs):
+    msg = "Shared empty " + type(self).__name__ + " cannot be changed."
+    raise TypeError(msg)
+
+
+class EmptyOrderedSet(OrderedSet):
+    """An OrderedSet that is always empty; reads like [], rejects additions."""
+
+    __slots__ = ()
+    add = append = extend = insert = __setitem__ = __iadd__ = _read_only
+
+    def __reduce__(self):
+        return "empty_set"
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class EmptyDict(dict):
+    """A dict that is always empty; reads like {}, rejects additions."""
+
+    __slots__ = ()
+    __setitem__ = update = setdefault = __ior__ = _read_only
+
+    def __reduce__(self):
+        return "empty_dict"
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+empty_set = EmptyOrderedSet()
+empty_dict = EmptyDict()
+
+
+def own_collection(obj, name):
+    """Return the collection in attribute name of obj, first replacing a shared empty one with a new one of its own."""
+    value = getattr(obj, name)
+    if value is empty_set:
+        value = OrderedSet()
+        setattr(obj, name, value)
+    elif value is empty_dict:
+        value = dict()
+        setattr(obj, name, value)
+    return value
+
+
+def as_ordered_set(value):
+    """Return value as an OrderedSet, using the shared empty one if it is empty."""
+    if type(value) is OrderedSet or value is empty_set:
+        return value
+    elif len(value) == 0:
+        return empty_set
+    else:
+        return OrderedSet(value)
+
+
+def as_dict(value):
+    """Return value, or the shared empty dict if it is empty."""
+    if len(value) == 0:
+        return empty_dict
+    else:
+        return value
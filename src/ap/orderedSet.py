@@ -0,0 +1,119 @@
+# lists up to this long are searched, longer ones get an index of item counts
+index_threshold = 8
+
+
+class OrderedSet(list):
+    """A list which also keeps a count of each of its items, so that `in` takes constant time.
+
+    It reads, compares and prints like a list, and all the list methods keep the counts up to date. Items must be hashable. add() appends an item only if it is not already present. Short lists, where a search is as quick, do not have the counts.
+    """
+
+    __slots__ = ("_counts",)
+
+    def __init__(self, iterable=()):
+        super().__init__(iterable)
+        self._counts = None
+        self._count(())
+
+    def _count(self, items):
+        """Count items which have just been put in the list."""
+        counts = self._counts
+        if counts is None:
+            if len(self) > index_threshold:
+                counts = self._counts = {}
+                items = self
+            else:
+                return
+        for item in items:
+            counts[item] = counts.get(item, 0) + 1
+
+    def _uncount(self, items):
+        """Uncount items which have just been taken out of the list."""
+        counts = self._counts
+        if counts is None:
+            return
+        for item in items:
+            if counts[item] == 1:
+                del counts[item]
+            else:
+                counts[item] -= 1
+
+    def __contains__(self, item):
+        counts = self._counts
+        if counts is None:
+            return super().__contains__(item)
+        try:
+            return item in counts
+        except TypeError:  # unhashable, so cannot be an item
+            return False
+
+    def __reduce__(self):
+        return (self.__class__, (list(self),))
+
+    def add(self, item):
+        """Append item if it is not already in the set."""
+        if item not in self:
+            super().append(item)
+            self._count((item,))
+
+    def append(self, item):
+        super().append(item)
+        self._count((item,))
+
+    def extend(self, iterable):
+        items = list(iterable)
+        super().extend(items)
+        self._count(items)
+
+    def __iadd__(self, iterable):
+        self.extend(iterable)
+        return self
+
+    def __imul__(self, n):
+        super().__imul__(n)
+        if self._counts is None:
+            self._count(())
+        elif n <= 0:
+            self._counts.clear()
+        else:
+            for item in self._counts:
+                self._counts[item] *= n
+        return self
+
+    def insert(self, index, item):
+        super().insert(index, item)
+        self._count((item,))
+
+    def remove(self, item):
+        super().remove(item)
+        self._uncount((item,))
+
+    def pop(self, index=-1):
+        item = super().pop(index)
+        self._uncount((item,))
+        return item
+
+    def clear(self):
+        super().clear()
+        self._counts = None
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            old_items = self[index]
+            value = list(value)
+            super().__setitem__(index, value)
+            self._uncount(old_items)
+            self._count(value)
+        else:
+            old_item = self[index]
+            super().__setitem__(index, value)
+            self._uncount((old_item,))
+            self._count((value,))
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            old_items = self[index]
+        else:
+            old_items = (self[index],)
+        super().__delitem__(index)
+        self._uncount(old_items)
@@ -0,0 +1,169 @@
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+import json, os, time, tracemalloc
+
+# number of allocation sites listed for each phase in a memory report
+default_top_allocations = 10
+# allocations left out of memory reports: those of tracemalloc and imports
+memory_filters = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+@dataclass
+class Phase:
+    """The wall and CPU time, in seconds, taken by one phase of a conversion, and the numbers of rows and triples it dealt with if known.
+
+    If memory is traced, memory is the bytes allocated at the end of the phase, peak the most allocated at once during it, and allocations a list of the sites (file:line) whose allocations changed most in the phase, as dicts of site, size and count, the changes in bytes and blocks.
+    """
+
+    name: str
+    wall: float = 0.0
+    cpu: float = 0.0
+    rows: int = None
+    triples: int = None
+    memory: int = None
+    peak: int = None
+    allocations: list = None
+
+
+def short_path(fname):
+    """Return fname from the package folder on if it is an installed package, or relative to the working directory if it is under it."""
+    if "site-packages" + os.sep in fname:
+        return fname.split("site-packages" + os.sep)[-1]
+    relative = os.path.relpath(fname)
+    if relative.startswith(".."):
+        return fname
+    return relative
+
+
+def megabytes(size):
+    return "%.1f" % (size / (1024 * 1024))
+
+
+class PhaseTimer:
+    """Records a Phase for each step of a conversion, in the order they are run.
+
+    CPU time is that of the thread running the conversion, so conversions in other threads are not counted. If trace_memory is True tracemalloc is started, if it is not already, and a snapshot taken after each phase, which is compared with the one before to find the top allocation sites of the phase; only the last snapshot is kept. Tracing memory makes conversion several times slower.
+    """
+
+    def __init__(self, trace_memory=False, top=default_top_allocations):
+        self.phases = []
+        self.trace_memory = trace_memory
+        self.top = top
+        self._snapshot = None
+        if trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            self._snapshot = self.take_snapshot()
+
+    @contextmanager
+    def phase(self, name):
+        """Time the with block as phase name; the Phase is yielded so that rows and triples can be set."""
+        record = Phase(name)
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            yield record
+        finally:
+            record.wall = time.perf_counter() - wall
+            record.cpu = time.thread_time() - cpu
+            if self.trace_memory:
+                self.record_memory(record)
+            self.phases.append(record)
+
+    def take_snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(memory_filters)
+
+    def record_memory(self, record):
+        """Set the memory, peak and allocations of Phase record, which has just ended."""
+        record.memory, record.peak = tracemalloc.get_traced_memory()
+        snapshot = self.take_snapshot()
+        record.allocations = []
+        for diff in snapshot.compare_to(self._snapshot, "lineno")[: self.top]:
+            frame = diff.traceback[0]
+            site = "%s:%d" % (short_path(frame.filename), frame.lineno)
+            record.allocations.append(
+                {"site": site, "size": diff.size_diff, "count": diff.count_diff}
+            )
+        self._snapshot = snapshot
+
+    def total(self):
+        """Return a Phase with the total times of all the phases and, if memory is traced, the memory at the end and highest peak."""
+        total = Phase("total")
+        for phase in self.phases:
+            total.wall = total.wall + phase.wall
+            total.cpu = total.cpu + phase.cpu
+        if self.trace_memory and self.phases:
+            total.memory = self.phases[-1].memory
+            total.peak = max(phase.peak for phase in self.phases)
+        return total
+
+    def as_dict(self):
+        """Return the phases and total as a dict for JSON, leaving out the memory used unless it is traced."""
+        memory_fields = ["memory", "peak", "allocations"]
+
+        def phase_dict(phase):
+            d = asdict(phase)
+            if not self.trace_memory:
+                for field in memory_fields:
+                    del d[field]
+            return d
+
+        return {
+            "phases": [phase_dict(phase) for phase in self.phases],
+            "total": phase_dict(self.total()),
+        }
+
+    def json(self):
+        return json.dumps(self.as_dict(), indent=2)
+
+    def table(self):
+        """Return the phases as a text table, one line each and the total last; with the memory at the end of each phase and its peak, in MB, if memory is traced."""
+        header = "%-22s %10s %10s %10s %10s" % (
+            "phase",
+            "wall s",
+            "CPU s",
+            "rows",
+            "triples",
+        )
+        if self.trace_memory:
+            header = header + " %10s %10s" % ("memory MB", "peak MB")
+        lines = [header]
+        for phase in self.phases + [self.total()]:
+            counts = ["" if n is None else str(n) for n in [phase.rows, phase.triples]]
+            line = "%-22s %10.4f %10.4f %10s %10s" % (
+                phase.name,
+                phase.wall,
+                phase.cpu,
+                counts[0],
+                counts[1],
+            )
+            if self.trace_memory and (phase.memory is not None):
+                line = line + " %10s %10s" % (
+                    megabytes(phase.memory),
+                    megabytes(phase.peak),
+                )
+            lines.append(line)
+        return "\n".join(lines)
+
+    def memory_report(self):
+        """Return the table, then for each phase the sites whose allocations changed most during it."""
+        lines = [self.table(), "", "Allocations changed by each phase, largest first:"]
+        for phase in self.phases:
+            lines.append(phase.name)
+            for allocation in phase.allocations or []:
+                lines.append(
+                    "  %+10.1f KB %+10d blocks  %s"
+                    % (
+                        allocation["size"] / 1024,
+                        allocation["count"],
+                        allocation["site"],
+                    )
+                )
+        return "\n".join(lines)
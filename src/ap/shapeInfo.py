@@ -1,69 +1,137 @@
-from dataclasses import dataclass, field, asdict
-from csv import DictReader
-import re
-
-# TODO read these from config
-# chars used to separate multiple entries in cells
-target_splitters = ", |; |,|;| \n| |\n"
-
-
-def read_shapeInfoDict(fname, lang):
-    """Read data from a (csv) file, return a list of ShapeInfo objects."""
+from .emptyCollections import (
+    empty_set,
+    empty_dict,
+    own_collection,
+    as_ordered_set,
+    as_dict,
+)
+from .tokenizer import default_tokenizer
+from .csvSource import read_csv_rows
+import sys
+
+
+def read_shapeInfoDict(fname, lang, tokenizer=default_tokenizer):
+    """Read data from a (csv) file, return a list of ShapeInfo objects.
+
+    fname may also be csv text, a file object or an iterable of row dicts (see csvSource.open_csv). The tokenizer is used to split cells with several targets or ignoreProps.
+    """
     # TODO could add options for loading from other formats
     shapeInfoDict = {}
-    with open(fname, "r") as csv_file:
-        csvReader = DictReader(csv_file)
-        for row in csvReader:
-            if row["shapeID"]:
-                id = row["shapeID"]
-                if id in shapeInfoDict.keys():
-                    s = shapeInfoDict[id]
-                else:
-                    s = ShapeInfo()
-                s.set_id(id)
-                if ("label" in row.keys()) and row["label"]:
-                    s.add_label(lang, row["label"])
-                if ("comment" in row.keys()) and row["comment"]:
-                    s.add_comment(lang, row["comment"])
-                if (
-                    ("target" in row.keys())
-                    and row["target"]
-                    and ("targetType" in row.keys())
-                    and row["targetType"]
-                ):
-                    s.append_target(row["target"], row["targetType"])
-                if ("closed" in row.keys()) and row["closed"]:
-                    s.set_closed(row["closed"])
-                if ("ignoreProps" in row.keys()) and row["ignoreProps"]:
-                    s.add_ignoreProps(row["ignoreProps"])
-                if ("mandatory" in row.keys()) and row["mandatory"]:
-                    s.set_mandatory(row["mandatory"])
-                if ("severity" in row.keys()) and row["severity"]:
-                    s.set_severity(row["severity"])
-                if ("note" in row.keys()) and row["note"]:
-                    s.add_note(lang, row["note"])
-                if ("message" in row.keys()) and row["message"]:
-                    s.add_message(lang, row["message"])
-                shapeInfoDict[id] = s
-            else:  # skip lines with no shape id
-                continue
+    for row in read_csv_rows(fname):
+        if row["shapeID"]:
+            id = row["shapeID"]
+            if id in shapeInfoDict.keys():
+                s = shapeInfoDict[id]
+            else:
+                s = ShapeInfo()
+            s.set_id(id)
+            if ("label" in row.keys()) and row["label"]:
+                s.add_label(lang, row["label"])
+            if ("comment" in row.keys()) and row["comment"]:
+                s.add_comment(lang, row["comment"])
+            if (
+                ("target" in row.keys())
+                and row["target"]
+                and ("targetType" in row.keys())
+                and row["targetType"]
+            ):
+                s.append_target(row["target"], row["targetType"], tokenizer)
+            if ("closed" in row.keys()) and row["closed"]:
+                s.set_closed(row["closed"])
+            if ("ignoreProps" in row.keys()) and row["ignoreProps"]:
+                s.add_ignoreProps(row["ignoreProps"], tokenizer)
+            if ("mandatory" in row.keys()) and row["mandatory"]:
+                s.set_mandatory(row["mandatory"])
+            if ("severity" in row.keys()) and row["severity"]:
+                s.set_severity(row["severity"])
+            if ("note" in row.keys()) and row["note"]:
+                s.add_note(lang, row["note"])
+            if ("message" in row.keys()) and row["message"]:
+                s.add_message(lang, row["message"])
+            shapeInfoDict[id] = s
+        else:  # skip lines with no shape id
+            continue
     return shapeInfoDict
 
 
-@dataclass
 class ShapeInfo:
-    """Data with information about a shape."""
-
-    id: str = ""
-    label: dict = field(default_factory=dict)
-    comment: dict = field(default_factory=dict)
-    targets: list = field(default_factory=dict)
-    closed: bool = False
-    ignoreProps: list = field(default_factory=list)
-    mandatory: bool = False
-    severity: str = ""
-    message: dict = field(default_factory=dict)
-    note: dict = field(default_factory=dict)
+    """Data with information about a shape.
+
+    Like StatementTemplate, uses __slots__ and shared empty collections until something is added.
+    """
+
+    __slots__ = (
+        "id",
+        "label",
+        "comment",
+        "targets",
+        "closed",
+        "ignoreProps",
+        "mandatory",
+        "severity",
+        "message",
+        "note",
+    )
+
+    def __init__(
+        self,
+        id="",
+        label=empty_dict,
+        comment=empty_dict,
+        targets=empty_dict,
+        closed=False,
+        ignoreProps=empty_set,
+        mandatory=False,
+        severity="",
+        message=empty_dict,
+        note=empty_dict,
+    ):
+        self.id = id
+        self.label = as_dict(label)
+        self.comment = as_dict(comment)
+        self.targets = as_dict(targets)
+        self.closed = closed
+        self.ignoreProps = as_ordered_set(ignoreProps)
+        self.mandatory = mandatory
+        self.severity = severity
+        self.message = as_dict(message)
+        self.note = as_dict(note)
+
+    def _values(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        if other.__class__ is self.__class__:
+            return self._values() == other._values()
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        fields = ", ".join(
+            name + "=" + repr(getattr(self, name)) for name in self.__slots__
+        )
+        return self.__class__.__name__ + "(" + fields + ")"
+
+    def key(self):
+        """Return a hashable value which is equal for ShapeInfos that are equal, and stable between runs, as StatementTemplate.key()."""
+        targets = []
+        for target_type, target in sorted(self.targets.items()):
+            if isinstance(target, list):
+                target = tuple(target)
+            targets.append((target_type, target))
+        return (
+            self.id,
+            tuple(sorted(self.label.items())),
+            tuple(sorted(self.comment.items())),
+            tuple(targets),
+            self.closed,
+            tuple(self.ignoreProps),
+            self.mandatory,
+            self.severity,
+            tuple(sorted(self.message.items())),
+            tuple(sorted(self.note.items())),
+        )
 
     def set_id(self, id):
         """Set the value of shapeID to be the id."""
@@ -78,7 +146,7 @@ class ShapeInfo:
         """Add {lang: label} to label dict."""
 
         if (type(lang) == str) and (type(label) == str):
-            self.label[lang] = label
+            own_collection(self, "label")[sys.intern(lang)] = label
         else:
             msg = "Language identifier and label must be strings."
             raise TypeError(msg)
@@ -87,25 +155,25 @@ class ShapeInfo:
         """Add {lang: label} to comments dict."""
 
         if (type(lang) == str) and (type(label) == str):
-            self.comment[lang] = label
+            own_collection(self, "comment")[sys.intern(lang)] = label
         else:
             msg = "Language identifier and comment must be strings."
             raise TypeError(msg)
 
-    def append_target(self, target, target_type):
+    def append_target(self, target, target_type, tokenizer=default_tokenizer):
         """Append {target_type: target} to targets dict."""
         known_types = ["class", "instance", "objectsof", "subjectsof"]
         if (type(target) == str) and (type(target_type) == str):
             lc_target_type = target_type.lower()
             if lc_target_type in self.targets.keys():
-                for t in re.split(target_splitters, target):
+                for t in tokenizer.split(target):
                     self.targets[lc_target_type].append(t)
             elif lc_target_type in known_types:
-                self.targets[lc_target_type] = list()
-                for t in re.split(target_splitters, target):
+                own_collection(self, "targets")[lc_target_type] = list()
+                for t in tokenizer.split(target):
                     self.targets[lc_target_type].append(t)
             else:
-                self.targets[target_type] = target
+                own_collection(self, "targets")[target_type] = target
                 msg = "Warning, ", target_type, " is unknown."
                 print(msg)
         else:
@@ -125,12 +193,11 @@ class ShapeInfo:
             msg = "Value not recognised as True or False."
             raise ValueError(msg)
 
-    def add_ignoreProps(self, properties):
+    def add_ignoreProps(self, properties, tokenizer=default_tokenizer):
         """Set list of properties to ignore from string properties"""
-        splitters = ", |; |,|;| \n| |\n"  # ideally read from config
         if type(properties) == str:
-            value_list = re.split(splitters, properties)
-            self.ignoreProps.extend(value_list)
+            value_list = tokenizer.split(properties)
+            own_collection(self, "ignoreProps").extend(value_list)
         else:
             msg = "Property id must be a string."
             raise TypeError(msg)
@@ -166,7 +233,7 @@ class ShapeInfo:
         """Add {lang: label} to note dict."""
 
         if (type(lang) == str) and (type(note) == str):
-            self.note[lang] = note
+            own_collection(self, "note")[sys.intern(lang)] = note
         else:
             msg = "Language identifier and note must be strings."
             raise TypeError(msg)
@@ -174,7 +241,7 @@ class ShapeInfo:
     def add_message(self, lang, message):
         """Append {lang: note} to message dict."""
         if (type(lang) == str) and (type(message) == str):
-            self.message[lang] = message
+            own_collection(self, "message")[sys.intern(lang)] = message
         else:
             msg = "Language identifier and message must be strings."
             raise TypeError(msg)
@@ -1,25 +1,109 @@
-from dataclasses import dataclass, field, asdict
+from .emptyCollections import (
+    empty_set,
+    empty_dict,
+    own_collection,
+    as_ordered_set,
+    as_dict,
+)
+import sys
 
 
-@dataclass
 class StatementTemplate:
-    """Data to define a Property Statement."""
-
-    shapes: list = field(default_factory=list)
-    properties: list = field(default_factory=list)
-    labels: dict = field(default_factory=dict)
-    mandatory: bool = False
-    repeatable: bool = True
-    valueNodeTypes: list = field(default_factory=list)
-    valueDataTypes: list = field(default_factory=list)
-    valueShapes: list = field(default_factory=list)
-    valueClasses: list = field(default_factory=list)
-    valueConstraints: list = field(default_factory=list)
-    valueConstraintType: str = ""
-    notes: dict = field(default_factory=dict)
-    severity: str = ""
-    message: dict = field(default_factory=dict)
-    propertyDescriptions: dict = field(default_factory=dict)
+    """Data to define a Property Statement.
+
+    Uses __slots__ rather than a per-instance __dict__, and list and dict fields start as shared empty collections, replaced by the object's own when something is first added through the add_* methods.
+    """
+
+    __slots__ = (
+        "shapes",
+        "properties",
+        "labels",
+        "mandatory",
+        "repeatable",
+        "valueNodeTypes",
+        "valueDataTypes",
+        "valueShapes",
+        "valueClasses",
+        "valueConstraints",
+        "valueConstraintType",
+        "notes",
+        "severity",
+        "message",
+        "propertyDescriptions",
+    )
+
+    def __init__(
+        self,
+        shapes=empty_set,
+        properties=empty_set,
+        labels=empty_dict,
+        mandatory=False,
+        repeatable=True,
+        valueNodeTypes=empty_set,
+        valueDataTypes=empty_set,
+        valueShapes=empty_set,
+        valueClasses=empty_set,
+        valueConstraints=empty_set,
+        valueConstraintType="",
+        notes=empty_dict,
+        severity="",
+        message=empty_dict,
+        propertyDescriptions=empty_dict,
+    ):
+        self.shapes = as_ordered_set(shapes)
+        self.properties = as_ordered_set(properties)
+        self.labels = as_dict(labels)
+        self.mandatory = mandatory
+        self.repeatable = repeatable
+        self.valueNodeTypes = as_ordered_set(valueNodeTypes)
+        self.valueDataTypes = as_ordered_set(valueDataTypes)
+        self.valueShapes = as_ordered_set(valueShapes)
+        self.valueClasses = as_ordered_set(valueClasses)
+        self.valueConstraints = as_ordered_set(valueConstraints)
+        self.valueConstraintType = valueConstraintType
+        self.notes = as_dict(notes)
+        self.severity = severity
+        self.message = as_dict(message)
+        self.propertyDescriptions = as_dict(propertyDescriptions)
+
+    def _values(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        if other.__class__ is self.__class__:
+            return self._values() == other._values()
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        fields = ", ".join(
+            name + "=" + repr(getattr(self, name)) for name in self.__slots__
+        )
+        return self.__class__.__name__ + "(" + fields + ")"
+
+    def key(self):
+        """Return a hashable value which is equal for StatementTemplates that are equal.
+
+        Lists become tuples and dicts become tuples of sorted (key, value) pairs, so the key is also stable between runs.
+        """
+        return (
+            tuple(self.shapes),
+            tuple(self.properties),
+            tuple(sorted(self.labels.items())),
+            self.mandatory,
+            self.repeatable,
+            tuple(self.valueNodeTypes),
+            tuple(self.valueDataTypes),
+            tuple(self.valueShapes),
+            tuple(self.valueClasses),
+            tuple(self.valueConstraints),
+            self.valueConstraintType,
+            tuple(sorted(self.notes.items())),
+            self.severity,
+            tuple(sorted(self.message.items())),
+            tuple(sorted(self.propertyDescriptions.items())),
+        )
 
     def add_property(self, propertyID):
         """Append propertyID to class properties list"""
@@ -28,7 +112,7 @@ class StatementTemplate:
             if propertyID in self.properties:
                 pass
             else:
-                self.properties.append(propertyID)
+                own_collection(self, "properties").append(propertyID)
         else:
             msg = "Property identifier must be a string."
             raise TypeError(msg)
@@ -40,7 +124,7 @@ class StatementTemplate:
             if shapeID in self.shapes:
                 pass
             else:
-                self.shapes.append(shapeID)
+                own_collection(self, "shapes").append(shapeID)
         else:
             msg = "Shape identifier must be a string."
             raise TypeError(msg)
@@ -49,7 +133,7 @@ class StatementTemplate:
         """Append {lang: label} to labels dict."""
 
         if (type(lang) == str) and (type(label) == str):
-            self.labels[lang] = label
+            own_collection(self, "labels")[sys.intern(lang)] = label
         else:
             msg = "Language identifier and label must be strings."
             raise TypeError(msg)
@@ -76,7 +160,7 @@ class StatementTemplate:
             if vNT in self.valueNodeTypes:
                 pass
             else:
-                self.valueNodeTypes.append(vNT)
+                own_collection(self, "valueNodeTypes").append(vNT)
         else:
             msg = "Value node type must be a string."
             raise TypeError(msg)
@@ -87,7 +171,7 @@ class StatementTemplate:
             if vDT in self.valueDataTypes:
                 pass
             else:
-                self.valueDataTypes.append(vDT)
+                own_collection(self, "valueDataTypes").append(vDT)
         else:
             msg = "Value data type must be a string."
             raise TypeError(msg)
@@ -98,7 +182,7 @@ class StatementTemplate:
             if shapeID in self.valueShapes:
                 pass
             else:
-                self.valueShapes.append(shapeID)
+                own_collection(self, "valueShapes").append(shapeID)
         else:
             msg = "Shape must be a string."
             raise TypeError(msg)
@@ -109,7 +193,7 @@ class StatementTemplate:
             if classID in self.valueClasses:
                 pass
             else:
-                self.valueClasses.append(classID)
+                own_collection(self, "valueClasses").append(classID)
         else:
             msg = "Class ID must be a string."
             raise TypeError(msg)
@@ -120,7 +204,7 @@ class StatementTemplate:
             if constraint in self.valueConstraints:
                 pass
             else:
-                self.valueConstraints.append(constraint)
+                own_collection(self, "valueConstraints").append(constraint)
         else:
             msg = "Constraint must be a string."
             raise TypeError(msg)
@@ -136,7 +220,7 @@ class StatementTemplate:
     def add_note(self, lang, note):
         """Append {lang: note} to notes dict."""
         if (type(lang) == str) and (type(note) == str):
-            self.notes[lang] = note
+            own_collection(self, "notes")[sys.intern(lang)] = note
         else:
             msg = "Language identifier and note must be strings."
             raise TypeError(msg)
@@ -151,7 +235,7 @@ class StatementTemplate:
     def add_propertyDescription(self, lang, desc):
         """Append {lang: desc} to propertyDescription dict."""
         if (type(lang) == str) and (type(desc) == str):
-            self.propertyDescriptions[lang] = desc
+            own_collection(self, "propertyDescriptions")[sys.intern(lang)] = desc
         else:
             msg = "Language identifier and property description must be strings."
             raise TypeError(msg)
@@ -159,7 +243,7 @@ class StatementTemplate:
     def add_message(self, lang, message):
         """Append {lang: note} to message dict."""
         if (type(lang) == str) and (type(message) == str):
-            self.message[lang] = message
+            own_collection(self, "message")[sys.intern(lang)] = message
         else:
             msg = "Language identifier and message must be strings."
             raise TypeError(msg)
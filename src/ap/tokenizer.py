@@ -0,0 +1,48 @@
+import re
+
+# strings used to separate multiple entries in cells, may be changed with
+# cell_separators in the TAP config file
+default_separators = [", ", "; ", ",", ";", " \n", " ", "\n"]
+
+
+class Tokenizer:
+    """Splits a cell holding several entries, e.g. "dct:title, dct:alternative", into the entries.
+
+    The separators are compiled into one pattern, longest first, which finds every separator in a single pass along the cell. Consecutive separators give empty entries, as re.split does.
+    """
+
+    def __init__(self, separators=default_separators):
+        if (type(separators) is not list) or (len(separators) == 0):
+            msg = "Separators must be a non-empty list of strings."
+            raise TypeError(msg)
+        for sep in separators:
+            if (type(sep) is not str) or (len(sep) == 0):
+                msg = "Separators must be a non-empty list of strings."
+                raise TypeError(msg)
+        self.separators = separators
+        ordered = sorted(separators, key=len, reverse=True)
+        self.pattern = re.compile("|".join(re.escape(sep) for sep in ordered))
+
+    def split(self, cell):
+        """Return list of the entries in cell."""
+        return self.pattern.split(cell)
+
+    def iter_split(self, cell):
+        """Yield the entries in cell one by one."""
+        start = 0
+        for match in self.pattern.finditer(cell):
+            yield cell[start : match.start()]
+            start = match.end()
+        yield cell[start:]
+
+
+default_tokenizer = Tokenizer()
+
+
+def tokenizer_from_config(config_dict):
+    """Return a Tokenizer for the cell_separators in a TAP config dict, or the default one."""
+    separators = config_dict.get("cell_separators")
+    if separators:
+        return Tokenizer(list(separators))
+    else:
+        return default_tokenizer
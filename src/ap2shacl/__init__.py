@@ -2,7 +2,11 @@ from ap import AP, StatementTemplate, ShapeInfo, read_shapeInfoDict
 from .ap2shaclConverter import (
     AP2SHACLConverter,
     make_property_shape_name,
+    template_hash,
     list2RDFList,
     str2URIRef,
+    NamespaceResolver,
     convert_nodeKind,
 )
+from .ntriplesWriter import NTriplesWriter, term2NT
+from .incrementalWriter import IncrementalWriter
@@ -3,7 +3,12 @@ from rdflib import Graph, URIRef, Literal, BNode, Namespace
 from rdflib import SH, RDF, RDFS, XSD, SDO
 from rdflib.collection import Collection
 from uuid import uuid4
+from hashlib import sha1
 from urllib.parse import quote
+from functools import lru_cache
+from contextlib import contextmanager
+from .ntriplesWriter import NTriplesWriter, text_writer
+import io, sys
 
 # stoopid conflicts with python key words
 SH_in = URIRef("http://www.w3.org/ns/shacl#in")
@@ -13,10 +18,23 @@ SH_class = URIRef("http://www.w3.org/ns/shacl#class")
 # default fallbacks for values that may be in AP metadata
 default_language = "en"
 default_base = "http://example.org/"
+# number of strings a NamespaceResolver remembers the URIRef for
+resolver_cache_size = 4096
+# number of hex digits of the template hash used in deterministic names
+name_hash_length = 16
 
 
-def make_property_shape_name(ps):
-    """Return a URI id based on a property statement label & shape."""
+def template_hash(ps):
+    """Return a hex digest of the shapes, properties and other content of a property statement, the same on every run."""
+    content = repr(ps.key()).encode("utf-8")
+    return sha1(content).hexdigest()[:name_hash_length]
+
+
+def make_property_shape_name(ps, deterministic=False):
+    """Return a URI id based on a property statement label & shape.
+
+    Property statements with no label get a random id, or if deterministic is True an id from a hash of their content.
+    """
     # TODO: allow user to set preferences for which labels to use.
     if ps.shapes == []:
         sh = "_"
@@ -25,7 +43,10 @@ def make_property_shape_name(ps):
         # need to avoid unnecessary #s
         sh = quote(ps.shapes[0].replace("#", "").replace(" ", "").lower())
     if ps.labels == {}:
-        name = sh + str(uuid4()).lower()
+        if deterministic:
+            name = sh + template_hash(ps)
+        else:
+            name = sh + str(uuid4()).lower()
         return name
     else:
         languages = ps.labels.keys()
@@ -73,10 +94,43 @@ def str2URIRef(namespaces, s):
         return URIRef(base + quote(s))
 
 
+class NamespaceResolver:
+    """Converts strings to URIRefs like str2URIRef, using the namespaces of an AP and remembering recent results.
+
+    The remembered results are dropped when the AP's namespaces are changed by add_namespace or replaced.
+    """
+
+    def __init__(self, ap, maxsize=resolver_cache_size):
+        self.ap = ap
+        self.namespaces = ap.namespaces
+        self.namespacesVersion = ap.namespacesVersion
+        self._cached_resolve = lru_cache(maxsize=maxsize)(self._resolve)
+
+    def _resolve(self, s):
+        return str2URIRef(self.namespaces, s)
+
+    def resolve(self, s):
+        """Return a URIRef from a string that may be a URI or a curie."""
+        if (self.namespaces is not self.ap.namespaces) or (
+            self.namespacesVersion != self.ap.namespacesVersion
+        ):
+            self.clear()
+        if type(s) is str:
+            return self._cached_resolve(s)
+        else:  # not cacheable, let str2URIRef report it
+            return str2URIRef(self.namespaces, s)
+
+    def clear(self):
+        """Forget all results and re-read the AP's namespaces."""
+        self.namespaces = self.ap.namespaces
+        self.namespacesVersion = self.ap.namespacesVersion
+        self._cached_resolve.cache_clear()
+
+
 def convert_nodeKind(node_types):
     """Return a shacl nodeKind IRI based on list of permitted node types."""
     # first convert all permitted node type strings in list to lower case
-    if type(node_types) is list:
+    if isinstance(node_types, list):
         pass
     else:
         print(node_types)
@@ -104,12 +158,18 @@ def convert_nodeKind(node_types):
 
 
 def list2RDFList(g, list, node_type, namespaces):
-    """Convert a python list to an RDF list of items with specified node type"""
+    """Convert a python list to an RDF list of items with specified node type
+
+    namespaces may be a dict or a NamespaceResolver."""
     # Currently only deals with lists that are all Literals or all IRIs
     # URIRef - already a rfdlib.URIRef ; anyURI text to convert to URIRef
     if not (node_type.lower() in ["literal", "anyuri", "uriref", "curie", "bnode"]):
         msg = "Node type " + node_type + " unknown."
         raise ValueError(msg)
+    if isinstance(namespaces, NamespaceResolver):
+        to_URIRef = namespaces.resolve
+    else:
+        to_URIRef = lambda s: str2URIRef(namespaces, s)
     start_node = BNode()
     current_node = start_node
     try:
@@ -122,9 +182,9 @@ def list2RDFList(g, list, node_type, namespaces):
         elif node_type.lower() == "uriref":
             g.add((current_node, RDF.first, item))
         elif node_type.lower() == "curie":
-            g.add((current_node, RDF.first, str2URIRef(namespaces, item)))
+            g.add((current_node, RDF.first, to_URIRef(item)))
         elif node_type.lower() == "anyuri":
-            item_uri = str2URIRef(namespaces, item)
+            item_uri = to_URIRef(item)
             g.add((current_node, RDF.first, item_uri))
         elif node_type.lower() == "bnode":
             g.add((current_node, RDF.first, item))
@@ -137,11 +197,40 @@ def list2RDFList(g, list, node_type, namespaces):
     return start_node
 
 
+def graph_turtle(g):
+    """Return the Turtle for graph g as a list of its @base and @prefix lines and a string of the rest."""
+    lines = g.serialize(format="turtle").splitlines(keepends=True)
+    n = 0
+    while n < len(lines) and lines[n].startswith(("@base", "@prefix")):
+        n = n + 1
+    return (lines[:n], "".join(lines[n:]).strip("\n") + "\n\n")
+
+
+def write_turtle_chunk(write, written, directives, statements):
+    """Write the Turtle statements for one shape, preceded by those of its @base and @prefix directives not in set written."""
+    new_directives = []
+    for directive in directives:
+        if directive not in written:
+            written.add(directive)
+            new_directives.append(directive)
+    if new_directives:
+        write("".join(new_directives) + "\n")
+    write(statements)
+
+
+def key_digest(key):
+    """Return a short digest of a StatementTemplate key, to find repeats without keeping the key."""
+    return sha1(repr(key).encode("utf-8")).digest()
+
+
 class AP2SHACLConverter:
-    def __init__(self, ap):
+    def __init__(self, ap, deterministic=False):
         base = default_base
         self.ap = ap
         self.sg = Graph(base=base)  # shacl graph
+        self.resolver = NamespaceResolver(ap)
+        # name unlabelled property shapes by content hash, not uuid
+        self.deterministic = deterministic
 
     def convert_AP_SHACL(self):
         self.convert_namespaces()
@@ -166,47 +255,46 @@ class AP2SHACLConverter:
             lang = default_language
         sh = "http://www.w3.org/ns/shacl#"
         for shape in shapeInfo.keys():
-            shape_uri = str2URIRef(self.ap.namespaces, shape)
-            self.sg.add((shape_uri, RDF.type, SH.NodeShape))
-            if shapeInfo[shape].label:
-                for key in shapeInfo[shape].label.keys():
-                    value = shapeInfo[shape].label[key]
-                    label = Literal(value, lang=key)
-                self.sg.add((shape_uri, RDFS.label, label))
-            if shapeInfo[shape].comment:
-                for key in shapeInfo[shape].comment.keys():
-                    value = shapeInfo[shape].comment[key]
-                    comment = Literal(value, lang=key)
-                    self.sg.add((shape_uri, RDFS.comment, comment))
-            if shapeInfo[shape].targets:
-                self._convertTargets(shapeInfo[shape].targets, shape_uri)
-            if shapeInfo[shape].severity:
-                severity = self.convert_severity(shapeInfo[shape].severity)
-                self.sg.add((shape_uri, SH.severity, severity))
-            if shapeInfo[shape].closed == True:
-                self.sg.add(
-                    (shape_uri, SH.closed, Literal("True", datatype=XSD.boolean))
-                )
-            elif shapeInfo[shape].closed == False:
-                self.sg.add(
-                    (shape_uri, SH.closed, Literal("False", datatype=XSD.boolean))
-                )
-            if shapeInfo[shape].ignoreProps:
-                properties = shapeInfo[shape].ignoreProps
-                ignore_list = list2RDFList(
-                    self.sg, properties, "CURIE", self.ap.namespaces
-                )
-                self.sg.add((shape_uri, SH.ignoredProperties, ignore_list))
-            if shapeInfo[shape].message:
-                for key in shapeInfo[shape].message.keys():
-                    value = shapeInfo[shape].message[key]
-                    message = Literal(value, lang=key)
-                self.sg.add((shape_uri, SH.message, message))
+            self.convert_shape(shape)
+
+    def convert_shape(self, shape):
+        """Add one shape from the application profile to the SHACL graph."""
+        shapeInfo = self.ap.shapeInfo
+        shape_uri = self.resolver.resolve(shape)
+        self.sg.add((shape_uri, RDF.type, SH.NodeShape))
+        if shapeInfo[shape].label:
+            for key in shapeInfo[shape].label.keys():
+                value = shapeInfo[shape].label[key]
+                label = Literal(value, lang=key)
+            self.sg.add((shape_uri, RDFS.label, label))
+        if shapeInfo[shape].comment:
+            for key in shapeInfo[shape].comment.keys():
+                value = shapeInfo[shape].comment[key]
+                comment = Literal(value, lang=key)
+                self.sg.add((shape_uri, RDFS.comment, comment))
+        if shapeInfo[shape].targets:
+            self._convertTargets(shapeInfo[shape].targets, shape_uri)
+        if shapeInfo[shape].severity:
+            severity = self.convert_severity(shapeInfo[shape].severity)
+            self.sg.add((shape_uri, SH.severity, severity))
+        if shapeInfo[shape].closed == True:
+            self.sg.add((shape_uri, SH.closed, Literal("True", datatype=XSD.boolean)))
+        elif shapeInfo[shape].closed == False:
+            self.sg.add((shape_uri, SH.closed, Literal("False", datatype=XSD.boolean)))
+        if shapeInfo[shape].ignoreProps:
+            properties = shapeInfo[shape].ignoreProps
+            ignore_list = list2RDFList(self.sg, properties, "CURIE", self.resolver)
+            self.sg.add((shape_uri, SH.ignoredProperties, ignore_list))
+        if shapeInfo[shape].message:
+            for key in shapeInfo[shape].message.keys():
+                value = shapeInfo[shape].message[key]
+                message = Literal(value, lang=key)
+            self.sg.add((shape_uri, SH.message, message))
 
     def _convertTargets(self, targets, shape_uri):
         for key in targets.keys():
             for targetStr in targets[key]:
-                target = str2URIRef(self.ap.namespaces, targetStr)
+                target = self.resolver.resolve(targetStr)
                 if key.lower() == "class":
                     targetType = SH.targetClass
                 elif key.lower() == "node":
@@ -223,92 +311,242 @@ class AP2SHACLConverter:
 
     def convert_statementTemplates(self):
         """Add the property statements from the application profile to the SHACL graph as property shapes."""
+        for ps in self.ap.statementTemplates:
+            self.convert_statementTemplate(ps)
+
+    def convert_statementTemplate(self, ps):
+        """Add one property statement from the application profile to the SHACL graph as property shape(s)."""
         # TODO: untangle this : there must be repeats that can be factored out
         # TODO: fix case when there are > 1 properties in template
-        for ps in self.ap.statementTemplates:
-            if len(ps.properties) > 1:  # Unusual case of alternative property paths
-                print(
-                    "# Warning: property template with multiple properties is not fully supported."
+        if len(ps.properties) > 1:  # Unusual case of alternative property paths
+            print(
+                "# Warning: property template with multiple properties is not fully supported."
+            )
+            ps_ids = []
+            severity = self.convert_severity(ps.severity)
+            for p in ps.properties:
+                # TODO this needs revisting, half the elements aren't processed
+                prop = quote(p.replace("#", "").replace(":", "_"))
+                ps_name = (
+                    make_property_shape_name(ps, self.deterministic)
+                    + "_"
+                    + prop
+                    + "_opt"
                 )
-                ps_ids = []
-                severity = self.convert_severity(ps.severity)
-                for p in ps.properties:
-                    # TODO this needs revisting, half the elements aren't processed
-                    prop = quote(p.replace("#", "").replace(":", "_"))
-                    ps_name = make_property_shape_name(ps) + "_" + prop + "_opt"
-                    ps_id = str2URIRef(self.ap.namespaces, ps_name)
-                    ps_ids.append(ps_id)
-                    ps_opt_uri = str2URIRef(self.ap.namespaces, ps_name)
-                    path = str2URIRef(self.ap.namespaces, p)
-                    self.sg.add((ps_opt_uri, RDF.type, SH.PropertyShape))
-                    self.sg.add((ps_opt_uri, SH.path, path))
-                    if ps.mandatory:
-                        self.sg.add((ps_opt_uri, SH.minCount, Literal(1)))
-                    if not ps.repeatable:
-                        self.sg.add((ps_opt_uri, SH.maxCount, Literal(1)))
-                    if severity:
-                        self.sg.add(((ps_opt_uri, SH.severity, severity)))
-                or_list = list2RDFList(self.sg, ps_ids, "URIRef", self.ap.namespaces)
-                for sh in ps.shapes:
-                    self.sg.add(
-                        (str2URIRef(self.ap.namespaces, sh), SH.property, ps_opt_uri)
-                    )
-            else:  # Normal case of just one property path
-                ps_name = make_property_shape_name(ps)
-                severity = self.convert_severity(ps.severity)
-                ps_uri = str2URIRef(self.ap.namespaces, ps_name)
-                for sh in ps.shapes:
-                    self.sg.add(
-                        (str2URIRef(self.ap.namespaces, sh), SH.property, ps_uri)
-                    )
-                self.sg.add((ps_uri, RDF.type, SH.PropertyShape))
-                for lang in ps.labels:
-                    name = Literal(ps.labels[lang], lang=lang)
-                    self.sg.add((ps_uri, SH.name, name))
-                for lang in ps.notes:
-                    note = Literal(ps.notes[lang], lang=lang)
-                    self.sg.add((ps_uri, RDFS.comment, note))
-                for lang in ps.propertyDescriptions:
-                    descr = Literal(ps.propertyDescriptions[lang], lang=lang)
-                    self.sg.add((ps_uri, SH.description, descr))
-                for property in ps.properties:
-                    path = str2URIRef(self.ap.namespaces, property)
-                    self.sg.add((ps_uri, SH.path, path))
-                for lang in ps.message:
-                    message = Literal(ps.message[lang], lang=lang)
-                    self.sg.add((ps_uri, SH.message, message))
-                if severity:
-                    self.sg.add(((ps_uri, SH.severity, severity)))
-                if ps.valueNodeTypes != []:
-                    nodeKind = convert_nodeKind(ps.valueNodeTypes)
-                    if nodeKind is not None:
-                        self.sg.add((ps_uri, SH.nodeKind, nodeKind))
-                if ps.valueDataTypes != []:
-                    (shProp, val) = self.convert_valueDataTypes(ps.valueDataTypes)
-                    self.sg.add((ps_uri, shProp, val))
-                if ps.valueConstraints != []:
-                    constr_dict = self.convert_valConstraints(ps)
-                    for constr_type in constr_dict.keys():
-                        for c in constr_dict[constr_type]:
-                            self.sg.add((ps_uri, constr_type, c))
-                else:  # no value constraints to add
-                    pass
-                if ps.valueShapes != []:
-                    (shProp, val) = self.convert_valueShapes(ps.valueShapes)
-                    self.sg.add((ps_uri, shProp, val))
-                if ps.valueClasses != []:
-                    (shProp, val) = self.convert_valueClasses(ps.valueClasses)
-                    self.sg.add((ps_uri, shProp, val))
+                ps_id = self.resolver.resolve(ps_name)
+                ps_ids.append(ps_id)
+                ps_opt_uri = self.resolver.resolve(ps_name)
+                path = self.resolver.resolve(p)
+                self.sg.add((ps_opt_uri, RDF.type, SH.PropertyShape))
+                self.sg.add((ps_opt_uri, SH.path, path))
                 if ps.mandatory:
-                    self.sg.add((ps_uri, SH.minCount, Literal(1)))
+                    self.sg.add((ps_opt_uri, SH.minCount, Literal(1)))
                 if not ps.repeatable:
-                    self.sg.add((ps_uri, SH.maxCount, Literal(1)))
+                    self.sg.add((ps_opt_uri, SH.maxCount, Literal(1)))
+                if severity:
+                    self.sg.add(((ps_opt_uri, SH.severity, severity)))
+            or_list = list2RDFList(self.sg, ps_ids, "URIRef", self.resolver)
+            for sh in ps.shapes:
+                self.sg.add((self.resolver.resolve(sh), SH.property, ps_opt_uri))
+        else:  # Normal case of just one property path
+            ps_name = make_property_shape_name(ps, self.deterministic)
+            severity = self.convert_severity(ps.severity)
+            ps_uri = self.resolver.resolve(ps_name)
+            for sh in ps.shapes:
+                self.sg.add((self.resolver.resolve(sh), SH.property, ps_uri))
+            self.sg.add((ps_uri, RDF.type, SH.PropertyShape))
+            for lang in ps.labels:
+                name = Literal(ps.labels[lang], lang=lang)
+                self.sg.add((ps_uri, SH.name, name))
+            for lang in ps.notes:
+                note = Literal(ps.notes[lang], lang=lang)
+                self.sg.add((ps_uri, RDFS.comment, note))
+            for lang in ps.propertyDescriptions:
+                descr = Literal(ps.propertyDescriptions[lang], lang=lang)
+                self.sg.add((ps_uri, SH.description, descr))
+            for property in ps.properties:
+                path = self.resolver.resolve(property)
+                self.sg.add((ps_uri, SH.path, path))
+            for lang in ps.message:
+                message = Literal(ps.message[lang], lang=lang)
+                self.sg.add((ps_uri, SH.message, message))
+            if severity:
+                self.sg.add(((ps_uri, SH.severity, severity)))
+            if ps.valueNodeTypes != []:
+                nodeKind = convert_nodeKind(ps.valueNodeTypes)
+                if nodeKind is not None:
+                    self.sg.add((ps_uri, SH.nodeKind, nodeKind))
+            if ps.valueDataTypes != []:
+                (shProp, val) = self.convert_valueDataTypes(ps.valueDataTypes)
+                self.sg.add((ps_uri, shProp, val))
+            if ps.valueConstraints != []:
+                constr_dict = self.convert_valConstraints(ps)
+                for constr_type in constr_dict.keys():
+                    for c in constr_dict[constr_type]:
+                        self.sg.add((ps_uri, constr_type, c))
+            else:  # no value constraints to add
+                pass
+            if ps.valueShapes != []:
+                (shProp, val) = self.convert_valueShapes(ps.valueShapes)
+                self.sg.add((ps_uri, shProp, val))
+            if ps.valueClasses != []:
+                (shProp, val) = self.convert_valueClasses(ps.valueClasses)
+                self.sg.add((ps_uri, shProp, val))
+            if ps.mandatory:
+                self.sg.add((ps_uri, SH.minCount, Literal(1)))
+            if not ps.repeatable:
+                self.sg.add((ps_uri, SH.maxCount, Literal(1)))
+
+    def shape_groups(self):
+        """Return dict of shape ids and lists of the property statements that belong to them.
+
+        A property statement belongs to its first shape; those with no shape are listed under "". Shapes come in the order of the AP shapeInfo, then of the property statements.
+        """
+        groups = dict()
+        for shape in self.ap.shapeInfo.keys():
+            groups[shape] = []
+        groups.update(self.ap.statementTemplate_groups())
+        return groups
+
+    def iter_shape_groups(self, statementTemplates):
+        """Yield (shape id, list of property statements) pairs for runs of property statements, from any iterable of them, that belong to the same shape (see shape_groups).
+
+        Only one run is held at a time, so statement templates can be converted as they are read from a TAP. A run of a shape already seen is yielded with None for the shape id, so that its node shape is not made again. Property statements repeated in the same shape, in the same run or an earlier one, are left out, as by AP.add_statementTemplate; for that a digest of the key of each property statement yielded is kept, rather than the key. The shapes with shapeInfo but no property statements come last.
+        """
+        seen = set()  # shapes yielded so far
+        digests = dict()  # shape: set of digests of the keys yielded for it
+        shape = None
+        run = []
+        for ps in statementTemplates:
+            if ps.shapes:
+                ps_shape = ps.shapes[0]
+            else:
+                ps_shape = ""
+            if run and (ps_shape != shape):
+                yield (shape if shape not in seen else None, run)
+                seen.add(shape)
+                run = []
+            shape = ps_shape
+            shape_digests = digests.setdefault(shape, set())
+            digest = key_digest(ps.key())
+            if digest not in shape_digests:
+                shape_digests.add(digest)
+                run.append(ps)
+        if run:
+            yield (shape if shape not in seen else None, run)
+            seen.add(shape)
+        for shape in self.ap.shapeInfo.keys():
+            if shape not in seen:
+                yield (shape, [])
+
+    def convert_shape_group(self, shape, statementTemplates):
+        """Add a shape, if it has shapeInfo, and the property statements that belong to it to the SHACL graph."""
+        if shape in self.ap.shapeInfo.keys():
+            self.convert_shape(shape)
+        for ps in statementTemplates:
+            self.convert_statementTemplate(ps)
+
+    @contextmanager
+    def _converting_into(self, g):
+        """Add triples to graph g instead of the SHACL graph while in the with block."""
+        sg = self.sg
+        self.sg = g
+        try:
+            yield g
+        finally:
+            self.sg = sg
+
+    def shape_graph(self, shape, statementTemplates):
+        """Return a small graph with the SHACL for one shape and the property statements that belong to it.
+
+        The graph shares the namespace bindings of the SHACL graph; nothing is added to the SHACL graph itself.
+        """
+        g = Graph(base=self.sg.base)
+        g.namespace_manager = self.sg.namespace_manager
+        with self._converting_into(g):
+            self.convert_shape_group(shape, statementTemplates)
+        return g
+
+    def iter_shape_graphs(self):
+        """Yield one small graph for each shape, with its node shape and property shapes."""
+        self.convert_namespaces()
+        groups = self.shape_groups()
+        for shape in groups.keys():
+            yield self.shape_graph(shape, groups[shape])
+
+    def shape_turtle(self, shape, statementTemplates):
+        """Return the Turtle for one shape and its property statements as a list of the @base and @prefix lines it needs and a string of the rest."""
+        return graph_turtle(self.shape_graph(shape, statementTemplates))
+
+    def shape_ntriples(self, shape, statementTemplates, graph=None):
+        """Return the N-Triples (or N-Quads if graph is given) for one shape and its property statements."""
+        f = io.StringIO()
+        writer = NTriplesWriter(f, graph)
+        with self._converting_into(writer):
+            self.convert_shape_group(shape, statementTemplates)
+        return f.getvalue()
+
+    def shape_fingerprint(self, shape, statementTemplates):
+        """Return a hex digest of everything the SHACL for one shape and its property statements is made from.
+
+        That is the shape's shapeInfo, the property statements, the AP namespaces and the naming mode; if the fingerprint is unchanged so is the SHACL (apart from random names of unlabelled property shapes).
+        """
+        if shape in self.ap.shapeInfo.keys():
+            shapeInfo = self.ap.shapeInfo[shape].key()
+        else:
+            shapeInfo = None
+        content = (
+            shape,
+            shapeInfo,
+            tuple(ps.key() for ps in statementTemplates),
+            tuple(sorted(self.ap.namespaces.items())),
+            self.deterministic,
+        )
+        return sha1(repr(content).encode("utf-8")).hexdigest()
+
+    def write_shacl(self, f, groups=None):
+        """Write the SHACL for the application profile in Turtle to file object f, one shape at a time.
+
+        Only the graph and Turtle for one shape are in memory at once. @base and @prefix lines are written before the first shape that uses them. f may be a text or binary (utf-8) file. groups is an iterable of (shape id, property statements) pairs, by default those of shape_groups(); see iter_shape_groups for converting statement templates as they are made. Return the number of triples written.
+        """
+        write = text_writer(f)
+        written = set()  # @base and @prefix lines already written
+        self.convert_namespaces()
+        if groups is None:
+            groups = self.shape_groups().items()
+        count = 0
+        for shape, statementTemplates in groups:
+            g = self.shape_graph(shape, statementTemplates)
+            count = count + len(g)
+            directives, statements = graph_turtle(g)
+            write_turtle_chunk(write, written, directives, statements)
+        return count
+
+    def write_ntriples(self, f, graph=None, groups=None):
+        """Write the SHACL for the application profile to file object f as N-Triples, or as N-Quads in the named graph if graph is given.
+
+        Triples are written as they are made, straight from the AP, without building an rdflib Graph; blank nodes of lists are written along with the shape that uses them. Shapes are written one at a time, and triples repeated within a shape (e.g. from property statements that share a label) are written once. groups is as for write_shacl. Return the number of triples written.
+        """
+        writer = NTriplesWriter(f, graph)
+        if groups is None:
+            groups = self.shape_groups().items()
+        with self._converting_into(writer):
+            for shape, statementTemplates in groups:
+                self.convert_shape_group(shape, statementTemplates)
+                writer.forget()
+        return len(writer)
+
+    def write_nquads(self, f, graph=None, groups=None):
+        """Write the SHACL to file object f as N-Quads in the named graph, by default the base namespace of the AP; return the number of quads written."""
+        if graph is None:
+            graph = self.ap.namespaces.get("base", default_base)
+        return self.write_ntriples(f, graph, groups)
 
     def convert_valueShapes(self, shapes):
         """Adds statements about sh:node values to add to shapes graph."""
         # see also convert valueDataTypes
         # if you find yourself copying this structure again, generalize it
-        if type(shapes) is not list:
+        if not isinstance(shapes, list):
             msg = "Value shapes must be in a list."
             raise TypeError(msg)
         elif len(shapes) == 0:
@@ -316,17 +554,17 @@ class AP2SHACLConverter:
             raise ValueError(msg)
         elif len(shapes) == 1:
             p = SH.node
-            v = str2URIRef(self.ap.namespaces, shapes[0])
+            v = self.resolver.resolve(shapes[0])
             return (p, v)
         else:
             bnode_list = list()
             for shape in shapes:
                 bnode = BNode()
-                shapeURI = str2URIRef(self.ap.namespaces, shape)
+                shapeURI = self.resolver.resolve(shape)
                 self.sg.add((bnode, SH.node, shapeURI))
                 bnode_list.append(bnode)
             p = SH_or
-            v = list2RDFList(self.sg, bnode_list, "bnode", self.ap.namespaces)
+            v = list2RDFList(self.sg, bnode_list, "bnode", self.resolver)
             return (p, v)
 
     def convert_valueClasses(self, class_ids):
@@ -341,17 +579,17 @@ class AP2SHACLConverter:
             raise ValueError(msg)
         elif len(class_ids) == 1:
             p = SH_class
-            v = str2URIRef(self.ap.namespaces, class_ids[0])
+            v = self.resolver.resolve(class_ids[0])
             return (p, v)
         else:
             bnode_list = list()
             for class_id in class_ids:
                 bnode = BNode()
-                classURI = str2URIRef(self.ap.namespaces, class_id)
+                classURI = self.resolver.resolve(class_id)
                 self.sg.add((bnode, SH_class, classURI))
                 bnode_list.append(bnode)
             p = SH_or
-            v = list2RDFList(self.sg, bnode_list, "bnode", self.ap.namespaces)
+            v = list2RDFList(self.sg, bnode_list, "bnode", self.resolver)
             return (p, v)
 
     def convert_severity(self, severity):
@@ -375,7 +613,7 @@ class AP2SHACLConverter:
         """
         # see also convert valueShapes
         # if you find yourself copying this structure again, generalize it
-        if type(dataTypes) is not list:
+        if not isinstance(dataTypes, list):
             msg = "Data types must be in a list."
             raise TypeError(msg)
         elif len(dataTypes) == 0:
@@ -383,17 +621,17 @@ class AP2SHACLConverter:
             raise ValueError(msg)
         elif len(dataTypes) == 1:
             p = SH.datatype
-            v = str2URIRef(self.ap.namespaces, dataTypes[0])
+            v = self.resolver.resolve(dataTypes[0])
             return (p, v)
         else:
             bnode_list = list()
             for dataType in dataTypes:
                 bnode = BNode()
-                dataTypeURI = str2URIRef(self.ap.namespaces, dataType)
+                dataTypeURI = self.resolver.resolve(dataType)
                 self.sg.add((bnode, SH.datatype, dataTypeURI))
                 bnode_list.append(bnode)
             p = SH_or
-            v = list2RDFList(self.sg, bnode_list, "bnode", self.ap.namespaces)
+            v = list2RDFList(self.sg, bnode_list, "bnode", self.resolver)
             return (p, v)
 
     def convert_valConstraints(self, ps):
@@ -404,11 +642,11 @@ class AP2SHACLConverter:
         if (constraint_type.lower() == "picklist") or (len(valueConstraints) > 1):
             if "literal" in ps.valueNodeTypes:
                 constraint_list = list2RDFList(
-                    self.sg, valueConstraints, "Literal", self.ap.namespaces
+                    self.sg, valueConstraints, "Literal", self.resolver
                 )
             elif "iri" in ps.valueNodeTypes:
                 constraint_list = list2RDFList(
-                    self.sg, valueConstraints, "anyURI", self.ap.namespaces
+                    self.sg, valueConstraints, "anyURI", self.resolver
                 )
             else:
                 print("Property statement is: ", ps)
@@ -418,7 +656,7 @@ class AP2SHACLConverter:
             if "literal" in ps.valueNodeTypes:
                 constraint = Literal(valueConstraints[0])
             elif "iri" in ps.valueNodeTypes:
-                constraint = str2URIRef(self.ap.namespaces, valueConstraints[0])
+                constraint = self.resolver.resolve(valueConstraints[0])
             else:
                 print("Property statement is: ", ps)
                 raise Exception("Incompatible node kind and constraint.")
@@ -463,3 +701,43 @@ class AP2SHACLConverter:
         else:
             print("# SHACL generated by python AP to shacl converter")
             print(self.sg.serialize(format="turtle"))
+
+    def stream_shacl(self, fname=None):
+        """Write the SHACL in Turtle shape by shape, without building the whole SHACL graph or output; return the number of triples written."""
+        if fname:
+            try:
+                f = open(fname, "w")
+            except Exception as e:
+                print("Could not open file %s for writing." % (fname))
+                raise e
+            f.write("# SHACL generated by python AP to shacl converter")
+            f.write("\n")
+            count = self.write_shacl(f)
+            f.close()
+        else:
+            print("# SHACL generated by python AP to shacl converter")
+            count = self.write_shacl(sys.stdout)
+        return count
+
+    def dump_ntriples(self, fname=None, graph=None):
+        """Write the SHACL as N-Triples, or N-Quads if graph is given, without building the SHACL graph; return the number of triples written."""
+        if fname:
+            try:
+                f = open(fname, "w", encoding="utf-8")
+            except Exception as e:
+                print("Could not open file %s for writing." % (fname))
+                raise e
+            f.write("# SHACL generated by python AP to shacl converter")
+            f.write("\n")
+            count = self.write_ntriples(f, graph)
+            f.close()
+        else:
+            print("# SHACL generated by python AP to shacl converter")
+            count = self.write_ntriples(sys.stdout, graph)
+        return count
+
+    def dump_nquads(self, fname=None, graph=None):
+        """Write the SHACL as N-Quads in the named graph, by default the base namespace of the AP."""
+        if graph is None:
+            graph = self.ap.namespaces.get("base", default_base)
+        return self.dump_ntriples(fname, graph)
@@ -0,0 +1,95 @@
+from .ap2shaclConverter import write_turtle_chunk, default_base
+from .ntriplesWriter import text_writer
+import re, sys
+
+# matches a Turtle @prefix line, giving the prefix and namespace
+prefix_directive = re.compile(r"@prefix ([^:]*): <([^>]*)> \.")
+
+
+def consistent_directives(chunks):
+    """Return False if two chunks bind the same prefix to different namespaces."""
+    namespaces = dict()
+    for fingerprint, directives, statements in chunks.values():
+        for directive in directives:
+            match = prefix_directive.match(directive)
+            if match:
+                prefix, namespace = match.groups()
+                if namespaces.setdefault(prefix, namespace) != namespace:
+                    return False
+    return True
+
+
+class IncrementalWriter:
+    """Keeps the SHACL output of each shape of an AP, and when the AP changes regenerates only the shapes it affects.
+
+    A shape's output is its node shape and the property shapes of the property statements that belong to it (see AP2SHACLConverter.shape_groups). It is regenerated when the shape's fingerprint changes, i.e. its shapeInfo or any of its property statements change, or the namespaces do. The output of unchanged shapes is reused and spliced in with the new.
+    format is "turtle", "nt" or "nquads"; for nquads graph is the name of the graph.
+    """
+
+    def __init__(self, format="turtle", graph=None):
+        if format not in ["turtle", "nt", "nquads"]:
+            msg = "Output format " + format + " unknown."
+            raise ValueError(msg)
+        self.format = format
+        self.graph = graph
+        self.chunks = dict()  # shape id: (fingerprint, directives, statements)
+
+    def _make_chunk(self, converter, shape, statementTemplates, fingerprint):
+        if self.format == "turtle":
+            directives, statements = converter.shape_turtle(shape, statementTemplates)
+        elif self.format == "nt":
+            directives = []
+            statements = converter.shape_ntriples(shape, statementTemplates)
+        else:
+            directives = []
+            graph = self.graph
+            if graph is None:
+                graph = converter.ap.namespaces.get("base", default_base)
+            statements = converter.shape_ntriples(shape, statementTemplates, graph)
+        return (fingerprint, directives, statements)
+
+    def update(self, converter):
+        """Bring the output up to date with the AP of an AP2SHACLConverter; return list of ids of the shapes regenerated."""
+        converter.convert_namespaces()
+        groups = converter.shape_groups()
+        chunks = dict()
+        regenerated = []
+        for shape in groups.keys():
+            fingerprint = converter.shape_fingerprint(shape, groups[shape])
+            old_chunk = self.chunks.get(shape)
+            if old_chunk and old_chunk[0] == fingerprint:
+                chunks[shape] = old_chunk
+            else:
+                chunks[shape] = self._make_chunk(
+                    converter, shape, groups[shape], fingerprint
+                )
+                regenerated.append(shape)
+        if self.chunks and not consistent_directives(chunks):
+            # prefixes made up by rdflib differ from last time, start again
+            self.chunks = dict()
+            return self.update(converter)
+        self.chunks = chunks
+        return regenerated
+
+    def write(self, f):
+        """Write the output for all shapes to file object f."""
+        write = text_writer(f)
+        written = set()  # @base and @prefix lines already written
+        for fingerprint, directives, statements in self.chunks.values():
+            write_turtle_chunk(write, written, directives, statements)
+
+    def dump(self, fname=None):
+        """Write the output to file fname, or print it."""
+        if fname:
+            try:
+                f = open(fname, "w", encoding="utf-8")
+            except Exception as e:
+                print("Could not open file %s for writing." % (fname))
+                raise e
+            f.write("# SHACL generated by python AP to shacl converter")
+            f.write("\n")
+            self.write(f)
+            f.close()
+        else:
+            print("# SHACL generated by python AP to shacl converter")
+            self.write(sys.stdout)
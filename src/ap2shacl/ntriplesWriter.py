@@ -0,0 +1,87 @@
+from rdflib import URIRef, BNode, Literal
+import io
+
+# number of IRIs a NTriplesWriter remembers the N-Triples form of
+iri_cache_size = 4096
+
+
+def text_writer(f):
+    """Return a function that writes strings to file object f, encoding them as utf-8 if f is binary."""
+    if isinstance(f, (io.RawIOBase, io.BufferedIOBase)):
+        return lambda text: f.write(text.encode("utf-8"))
+    else:
+        return f.write
+
+
+def escape_string(s):
+    """Return string s escaped for use in a N-Triples literal."""
+    return (
+        s.replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def term2NT(term):
+    """Return the N-Triples form of a rdflib URIRef, BNode or Literal."""
+    if isinstance(term, URIRef):
+        return "<" + str(term) + ">"
+    elif isinstance(term, BNode):
+        return "_:" + str(term)
+    elif isinstance(term, Literal):
+        nt = '"' + escape_string(str(term)) + '"'
+        if term.language:
+            return nt + "@" + term.language
+        elif term.datatype:
+            return nt + "^^<" + str(term.datatype) + ">"
+        else:
+            return nt
+    else:
+        msg = "Cannot write " + repr(term) + " as N-Triples."
+        raise TypeError(msg)
+
+
+class NTriplesWriter:
+    """Writes triples to a file object as N-Triples lines as they are added, or as N-Quads if a graph name is given.
+
+    It can stand in for the rdflib Graph that AP2SHACLConverter adds triples to. A triple added twice is written once, so the lines written since the last call to forget() are kept to check against.
+    """
+
+    def __init__(self, f, graph=None):
+        self.write = text_writer(f)
+        if graph:
+            self.end = " " + term2NT(URIRef(graph)) + " .\n"
+        else:
+            self.end = " .\n"
+        self.iris = dict()  # N-Triples form of the first IRIs written
+        self.lines = set()  # lines written since forget()
+        self.count = 0
+
+    def nt(self, term):
+        if type(term) is URIRef:
+            try:
+                return self.iris[term]
+            except KeyError:
+                nt = term2NT(term)
+                if len(self.iris) < iri_cache_size:
+                    self.iris[term] = nt
+                return nt
+        else:
+            return term2NT(term)
+
+    def add(self, triple):
+        """Write one triple."""
+        s, p, o = triple
+        line = self.nt(s) + " " + self.nt(p) + " " + self.nt(o) + self.end
+        if line not in self.lines:
+            self.lines.add(line)
+            self.write(line)
+            self.count = self.count + 1
+
+    def forget(self):
+        """Forget the lines written so far, e.g. once a shape is finished, so that memory use stays small."""
+        self.lines.clear()
+
+    def __len__(self):
+        return self.count
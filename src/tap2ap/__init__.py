@@ -1 +1,2 @@
-from .tap2apConverter import TAP2APConverter
+from .tap2apConverter import TAP2APConverter, read_config_namespaces
+from .tapReader import FastTAPReader
@@ -1,84 +1,216 @@
 from csv import DictReader
 from dctap import csvreader  # , TAPShape, TAPStatementConstraint
 from dctap.config import get_config
-from ap import AP, StatementTemplate
-import re
+from ap import (
+    AP,
+    ColumnarAP,
+    StatementTemplate,
+    tokenizer_from_config,
+    read_csv_text,
+    PhaseTimer,
+)
+from copy import deepcopy
+from functools import partial
+from .tapReader import FastTAPReader
 
 # defaults may be overridden by metadata file e.g. about.csv
 default_language = "en-US"  # default language
 # TODO read these from config
+# classes of AP that TAP2APConverter can store the statement templates in
+backends = {"objects": AP, "columnar": ColumnarAP}
 trueVals = ["true", "yes", "t", "y", "1"]  # probably not needed..
 falseVals = ["false", "no", "f", "n", "0"]  # ... I think dctap normalises this
-# chars used to separate multiple entries in cells
-prop_splitters = ", |; |,|;| \n| |\n"
-nodeType_splitters = ", |; |,|;| \n| |\n"
-dataType_splitters = ", |; |,|;| \n| |\n"
-class_splitters = ", |; |,|;| \n| |\n"
-constraint_splitters = ", |; |,|;| \n| |\n"
-shape_splitters = ", |; |,|;| \n| |\n"
+# lower case boolean strings and their values, looked up once per cell
+booleanValues = dict([(v, True) for v in trueVals] + [(v, False) for v in falseVals])
+# metadata keys that may give the language of notes, descriptions and messages
+languageKeys = ["lang", "language", "dc:language", "dct:language"]
+# statement template elements other than propertyID and the TAP2APConverter
+# methods that convert them
+elementConverters = [
+    ("propertyLabel", "convert_labels"),
+    ("mandatory", "convert_mandatory"),
+    ("repeatable", "convert_repeatable"),
+    ("valueNodeType", "convert_valueNodeTypes"),
+    ("valueDataType", "convert_valueDataTypes"),
+    ("valueConstraint", "convert_valueConstraints"),
+    ("valueConstraintType", "convert_valueConstraintType"),
+    ("valueShape", "convert_valueShapes"),
+    ("valueClass", "convert_valueClasses"),
+    ("note", "convert_notes"),
+    ("severity", "convert_severity"),
+    ("propertyDescription", "convert_propertyDescriptions"),
+    ("message", "convert_message"),
+]
+# elements whose converters take the language of the text
+labelElements = ["propertyLabel"]
+textElements = ["note", "propertyDescription", "message"]
+
+
+def label_language(metadata):
+    """Return the language of property labels given by AP metadata."""
+    try:
+        return metadata["language"]
+    except (KeyError, ValueError):
+        return default_language
+
+
+def text_language(metadata):
+    """Return the language of notes, property descriptions and messages given by AP metadata."""
+    for key in languageKeys:
+        if key in metadata.keys():
+            return metadata[key]
+    return default_language
+
+
+def read_config_namespaces(config_dict):
+    """Return dict of prefix: URI pairs declared in a dctap config dict."""
+    namespaces = {}
+    prefixes = config_dict["prefixes"]
+    for prefix in prefixes:
+        if (prefix != ":") and (prefix != ""):
+            if prefix[-1] == ":":  # ignore last char which is ":"
+                namespaces[prefix[:-1]] = prefixes[prefix]
+            else:
+                namespaces[prefix] = prefixes[prefix]
+        else:  # no prefix
+            namespaces["default"] = prefixes[prefix]
+    return namespaces
 
 
 class TAP2APConverter:
     """Classs comprising AP and TAP data, with methods to convert latter to former"""
 
-    def __init__(self, tap_fname, config_fname):
-        self.ap = AP()
+    def __init__(
+        self,
+        tap_fname,
+        config_fname,
+        config_dict=None,
+        reader="dctap",
+        timer=None,
+        backend="objects",
+    ):
+        # "columnar" stores the statement templates in arrays (see ap.ColumnarAP)
+        if backend not in backends:
+            msg = "AP backend " + str(backend) + " unknown."
+            raise ValueError(msg)
+        self.ap = backends[backend]()
+        # records the time taken by loading the config and TAP
+        self.timer = timer if timer is not None else PhaseTimer()
         self.tap = dict()
         self.tap["tap_fname"] = tap_fname
         self.tap["config_fname"] = config_fname
-        self.load_tap(tap_fname, config_fname)
-
-    def load_tap(self, tap_fname, config_fname):
-        """Load TAP data from file."""
-        self.tap["config_dict"] = get_config(nondefault_configfile_name=config_fname)
-        with open(tap_fname, "r") as csv_fileObj:
-            csvreader_output = csvreader(
-                open_csvfile_obj=csv_fileObj, config_dict=self.tap["config_dict"]
-            )
-            self.tap["shapes_dict"] = csvreader_output
-            self.tap["warnings_dict"] = csvreader_output["warnings"]
+        self.load_tap(tap_fname, config_fname, config_dict, reader)
+
+    def load_tap(self, tap_fname, config_fname, config_dict=None, reader="dctap"):
+        """Load TAP data from file.
+
+        tap_fname may also be csv text, a file object or an iterable of row dicts (see ap.csvSource.open_csv). If config_dict is given it is used instead of reading config_fname, so that a config can be parsed once and shared between several TAPs.
+        If reader is "fast" the rows are read by a FastTAPReader as they are converted, rather than all at once by dctap beforehand, and there are no warnings; dctap is used anyway for a TAP the FastTAPReader cannot read. self.tap["reader"] records which was used.
+        """
+        if reader not in ["dctap", "fast"]:
+            msg = "TAP reader " + str(reader) + " unknown."
+            raise ValueError(msg)
+        with self.timer.phase("config load"):
+            if config_dict is None:
+                config_dict = get_config(nondefault_configfile_name=config_fname)
+            else:
+                # dctap's csvreader extends lists in the config dict, work on a copy
+                config_dict = deepcopy(config_dict)
+            self.tap["config_dict"] = config_dict
+            # splits cells with several entries, e.g. propertyIDs
+            self.tokenizer = tokenizer_from_config(config_dict)
+        with self.timer.phase("TAP read") as phase:
+            self.read_tap(tap_fname, config_dict, reader)
+            if self.tap["reader"] == "dctap":
+                shapes = self.tap["shapes_dict"]["shapes"]
+                phase.rows = sum(
+                    len(sh.get("statement_templates", [])) for sh in shapes
+                )
+
+    def read_tap(self, tap_fname, config_dict, reader):
+        csv_text = read_csv_text(tap_fname)
+        if reader == "fast":
+            fastReader = FastTAPReader(config_dict)
+            if fastReader.read(csv_text) is not None:
+                # rows are read as they are converted, in convert_TAP_AP
+                self.tap["reader"] = "fast"
+                self.tap["fastReader"] = fastReader
+                self.tap["csv_text"] = csv_text
+                self.tap["shapes_dict"] = None
+                self.tap["warnings_dict"] = {}
+                return
+        csvreader_output = csvreader(csvfile_str=csv_text, config_dict=config_dict)
+        self.tap["reader"] = "dctap"
+        self.tap["shapes_dict"] = csvreader_output
+        self.tap["warnings_dict"] = csvreader_output["warnings"]
 
     def load_AP_Metadata(self, fname):
         self.ap.load_metadata(fname)
 
     def convert_TAP_AP(self):
         """Convert a TAP into python AP object."""
+        with self.timer.phase("TAP to AP") as phase:
+            for ps in self.iter_statementTemplates():
+                self.ap.add_statementTemplate(ps)
+            phase.rows = len(self.ap.statementTemplates)
+
+    def iter_statementTemplates(self):
+        """Yield a StatementTemplate for each statement template of the TAP, in order, without adding them to the AP.
+
+        The AP namespaces, shape info and metadata should be loaded first. With the fast reader each is made as its row is read, so the TAP is never held as statement templates all at once; repeats are not removed.
+        """
+        if self.tap["reader"] == "fast":
+            fastReader = self.tap["fastReader"]
+            rows = fastReader.read(self.tap["csv_text"])
+            plan = self.conversion_plan(fastReader.elements)
+            for sh_id, sc in rows:
+                if sc is None:  # first row of a shape
+                    self.check_shapeID(sh_id)
+                else:
+                    yield self.convert_statement(sh_id, sc, plan)
+            return
         shapes = self.tap["shapes_dict"]["shapes"]
+        elements = set()
+        for shape in shapes:
+            for sc in shape.get("statement_templates", []):
+                elements.update(sc.keys())
+        plan = self.conversion_plan(elements)
         for shape in shapes:
             # check shapeID once and add it to all prop statements in shape
             sh_id = self.check_shapeID(shape["shapeID"])
-            for sc in shape["statement_templates"]:
-                ps = StatementTemplate()
-                ps.add_shape(sh_id)
-                # property ID is mandatory, no need to check for key
-                self.convert_propertyIDs(sc["propertyID"], ps)
-                if "propertyLabel" in sc.keys():
-                    self.convert_labels(sc["propertyLabel"], ps)
-                if "mandatory" in sc.keys():
-                    self.convert_mandatory(sc["mandatory"], ps)
-                if "repeatable" in sc.keys():
-                    self.convert_repeatable(sc["repeatable"], ps)
-                if "valueNodeType" in sc.keys():
-                    self.convert_valueNodeTypes(sc["valueNodeType"], ps)
-                if "valueDataType" in sc.keys():
-                    self.convert_valueDataTypes(sc["valueDataType"], ps)
-                if "valueConstraint" in sc.keys():
-                    self.convert_valueConstraints(sc["valueConstraint"], ps)
-                if "valueConstraintType" in sc.keys():
-                    self.convert_valueConstraintType(sc["valueConstraintType"], ps)
-                if "valueShape" in sc.keys():
-                    self.convert_valueShapes(sc["valueShape"], ps)
-                if "valueClass" in sc.keys():
-                    self.convert_valueClasses(sc["valueClass"], ps)
-                if "note" in sc.keys():
-                    self.convert_notes(sc["note"], ps)
-                if "severity" in sc.keys():
-                    self.convert_severity(sc["severity"], ps)
-                if "propertyDescription" in sc.keys():
-                    self.convert_propertyDescriptions(sc["propertyDescription"], ps)
-                if "message" in sc.keys():
-                    self.convert_message(sc["message"], ps)
-                self.ap.add_statementTemplate(ps)
+            for sc in shape.get("statement_templates", []):
+                yield self.convert_statement(sh_id, sc, plan)
+
+    def conversion_plan(self, elements=None):
+        """Return dict of element: converter for the statement template elements, other than propertyID, of a TAP.
+
+        The plan is made once per TAP, from the elements it has (all elements if None) and the AP metadata, which should be loaded first: each converter takes the cell value and a StatementTemplate, with the language of text already worked out, and elements the TAP does not have are left out.
+        """
+        plan = dict()
+        for element, method in elementConverters:
+            if (elements is not None) and (element not in elements):
+                continue
+            converter = getattr(self, method)
+            if element in labelElements:
+                converter = partial(converter, lang=label_language(self.ap.metadata))
+            elif element in textElements:
+                converter = partial(converter, lang=text_language(self.ap.metadata))
+            plan[element] = converter
+        return plan
+
+    def convert_statement(self, sh_id, sc, plan=None):
+        """Return a StatementTemplate for shape sh_id from a dctap statement template dict, converting its elements as in plan (see conversion_plan), by default a plan for all elements."""
+        if plan is None:
+            plan = self.conversion_plan()
+        ps = StatementTemplate()
+        ps.add_shape(sh_id)
+        # property ID is mandatory, no need to check for key
+        self.convert_propertyIDs(sc["propertyID"], ps)
+        for element, value in sc.items():
+            converter = plan.get(element)
+            if converter is not None:  # other elements are ignored
+                converter(value, ps)
+        return ps
 
     def check_shapeID(self, sh_id):
         """Check a string matches a shape id."""
@@ -99,20 +231,18 @@ class TAP2APConverter:
     def convert_propertyIDs(self, propertiesStr, ps):
         """Convert a string to a list of property ids, add them to a statementTemplate."""
         if type(propertiesStr) == str:
-            for p in re.split(prop_splitters, propertiesStr):
+            for p in self.tokenizer.split(propertiesStr):
                 ps.add_property(p)
         else:
             msg = "Properties must be passed in a string."
             raise TypeError(msg)
 
-    def convert_labels(self, label, ps):
-        """Take string as label and add it to a statementTemplate."""
+    def convert_labels(self, label, ps, lang=None):
+        """Take string as label and add it to a statementTemplate, in language lang, by default that of the AP metadata."""
         # TODO: multiple labels, different languages
         # TODO: general convertString method for propertyDescription, note and labels
-        try:
-            lang = self.ap.metadata["language"]
-        except (KeyError, ValueError):
-            lang = default_language
+        if lang is None:
+            lang = label_language(self.ap.metadata)
         if type(label) == str:
             ps.add_label(lang, label)
         else:
@@ -122,10 +252,9 @@ class TAP2APConverter:
     def convert_mandatory(self, mandyStr, ps):
         """Convert a string to boolean true or false and add it as value of the `mandatory` property of statementTemplate."""
         if type(mandyStr) == str:
-            if mandyStr.lower() in trueVals:
-                ps.add_mandatory(True)
-            elif mandyStr.lower() in falseVals:
-                ps.add_mandatory(False)
+            value = booleanValues.get(mandyStr.lower())
+            if value is not None:
+                ps.add_mandatory(value)
             else:
                 msg = "Value for mandatory not recognised: " + mandyStr
                 raise ValueError(msg)
@@ -136,10 +265,9 @@ class TAP2APConverter:
     def convert_repeatable(self, rptStr, ps):
         """Convert a string to boolean true or false and add it as value of the `repeatable` property of statementTemplate."""
         if type(rptStr) == str:
-            if rptStr.lower() in trueVals:
-                ps.add_repeatable(True)
-            elif rptStr.lower() in falseVals:
-                ps.add_repeatable(False)
+            value = booleanValues.get(rptStr.lower())
+            if value is not None:
+                ps.add_repeatable(value)
             else:
                 msg = "Value for repeatable not recognised: " + rptStr
                 raise ValueError(msg)
@@ -150,7 +278,7 @@ class TAP2APConverter:
     def convert_valueNodeTypes(self, nodeTypesStr, ps):
         """Convert a string of node types and into separate types and add them as values of the `valueNodeTypes` property of statementTemplate."""
         if type(nodeTypesStr) == str:
-            for nodeType in re.split(nodeType_splitters, nodeTypesStr):
+            for nodeType in self.tokenizer.split(nodeTypesStr):
                 ps.add_valueNodeType(nodeType)
         else:
             msg = "Value for node types must be a string."
@@ -159,7 +287,7 @@ class TAP2APConverter:
     def convert_valueDataTypes(self, dataTypesStr, ps):
         """Convert a string of data types and into separate types and add them as values of the `valueNodeTypes` property of statementTemplate."""
         if type(dataTypesStr) == str:
-            for dataType in re.split(dataType_splitters, dataTypesStr):
+            for dataType in self.tokenizer.split(dataTypesStr):
                 ps.add_valueDataType(dataType)
         else:
             msg = "Value for data types must be a string."
@@ -169,7 +297,7 @@ class TAP2APConverter:
         """Convert a constraint or list of constraints into separate items and add them as values of the `valueConstraints` property of statementTemplate."""
         # To do: dctap is now providing integer values for some constraints, cludgy patch included, but need to check details of what dctap is doing.
         if type(constraints) is str:
-            for constraint in re.split(constraint_splitters, constraints):
+            for constraint in self.tokenizer.split(constraints):
                 ps.add_valueConstraint(constraint)
         elif type(constraints) is int:
             constraint = str(constraints)
@@ -177,7 +305,7 @@ class TAP2APConverter:
         elif type(constraints) is list:
             for list_item in constraints:
                 if type(list_item) is str:
-                    for constraint in re.split(constraint_splitters, list_item):
+                    for constraint in self.tokenizer.split(list_item):
                         ps.add_valueConstraint(constraint)
                 elif type(list_item) is int:
                     constraint = str(list_item)
@@ -203,7 +331,7 @@ class TAP2APConverter:
         """Convert a string of shapes into separate items and add them as values of the `valueShapes` property of statementTemplate."""
 
         if type(shapeStr) == str:
-            for shape in re.split(shape_splitters, shapeStr):
+            for shape in self.tokenizer.split(shapeStr):
                 self.check_shapeID(shape)
                 ps.add_valueShape(shape)
         else:
@@ -214,47 +342,30 @@ class TAP2APConverter:
         """Convert a string of class IDs into separate items and add them as values of the `valueClasses` property of statementTemplate."""
 
         if type(classesStr) == str:
-            for classID in re.split(shape_splitters, classesStr):
+            for classID in self.tokenizer.split(classesStr):
                 ps.add_valueClass(classID)
         else:
             msg = "Value for class IDs must be a string."
             raise TypeError(msg)
 
-    def convert_notes(self, noteStr, ps):
-        """Take string as note and add it to a statementTemplate."""
+    def convert_notes(self, noteStr, ps, lang=None):
+        """Take string as note and add it to a statementTemplate, in language lang, by default that of the AP metadata."""
         # TODO: multiple notes, different languages
         # TODO: general convertString method for propertyDescription, note and labels
-        lang_keys = ["lang", "language", "dc:language", "dct:language"]
-        if "lang" in self.ap.metadata.keys():
-            lang = self.ap.metadata["lang"]
-        elif "language" in self.ap.metadata.keys():
-            lang = self.ap.metadata["language"]
-        elif "dc:language" in self.ap.metadata.keys():
-            lang = self.ap.metadata["dc:language"]
-        elif "dct:language" in self.ap.metadata.keys():
-            lang = self.ap.metadata["dct:language"]
-        else:
-            lang = default_language
+        if lang is None:
+            lang = text_language(self.ap.metadata)
         if type(noteStr) == str:
             ps.add_note(lang, noteStr)
         else:
             msg = "Notes must be passed in a string."
             raise TypeError(msg)
 
-    def convert_propertyDescriptions(self, descStr, ps):
-        """Take string as note and add it to a statementTemplate."""
+    def convert_propertyDescriptions(self, descStr, ps, lang=None):
+        """Take string as note and add it to a statementTemplate, in language lang, by default that of the AP metadata."""
         # TODO: multiple notes, different languages
         # TODO: general convertString method for propertyDescription, note and labels
-        if "lang" in self.ap.metadata.keys():
-            lang = self.ap.metadata["lang"]
-        elif "language" in self.ap.metadata.keys():
-            lang = self.ap.metadata["language"]
-        elif "dc:language" in self.ap.metadata.keys():
-            lang = self.ap.metadata["dc:language"]
-        elif "dct:language" in self.ap.metadata.keys():
-            lang = self.ap.metadata["dct:language"]
-        else:
-            lang = default_language
+        if lang is None:
+            lang = text_language(self.ap.metadata)
         if type(descStr) == str:
             ps.add_propertyDescription(lang, descStr)
         else:
@@ -272,35 +383,21 @@ class TAP2APConverter:
     def convert_namespaces(self, source, fname=""):
         """Convert namespaces from TAP config file or load from AP csv."""
         if source == "TAP":
-            prefixes = self.tap["config_dict"]["prefixes"]
-            for prefix in prefixes:
-                if (prefix != ":") and (prefix != ""):
-                    if prefix[-1] == ":":  # ignore last char which is ":"
-                        self.ap.add_namespace(prefix[:-1], prefixes[prefix])
-                    else:
-                        self.ap.add_namespace(prefix, prefixes[prefix])
-                else:  # no prefix
-                    self.ap.add_namespace("default", prefixes[prefix])
+            namespaces = read_config_namespaces(self.tap["config_dict"])
+            for prefix in namespaces:
+                self.ap.add_namespace(prefix, namespaces[prefix])
         elif source == "csv":
             self.ap.load_namespaces(fname)
         else:
             msg = 'source for namespaces must be "TAP" or "csv".'
             raise ValueError(msg)
 
-    def convert_message(self, descStr, ps):
-        """Take string as note and add it to a statementTemplate."""
+    def convert_message(self, descStr, ps, lang=None):
+        """Take string as note and add it to a statementTemplate, in language lang, by default that of the AP metadata."""
         # TODO: multiple message, different languages
         # TODO: general convertString method for propertyDescription, note and labels
-        if "lang" in self.ap.metadata.keys():
-            lang = self.ap.metadata["lang"]
-        elif "language" in self.ap.metadata.keys():
-            lang = self.ap.metadata["language"]
-        elif "dc:language" in self.ap.metadata.keys():
-            lang = self.ap.metadata["dc:language"]
-        elif "dct:language" in self.ap.metadata.keys():
-            lang = self.ap.metadata["dct:language"]
-        else:
-            lang = default_language
+        if lang is None:
+            lang = text_language(self.ap.metadata)
         if type(descStr) == str:
             ps.add_message(lang, descStr)
         else:
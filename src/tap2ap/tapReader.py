@@ -0,0 +1,136 @@
+from csv import DictReader
+from dctap.utils import coerce_integer, coerce_numeric, coerce_concise
+import io, itertools
+
+# elements of dctap's TAPStatementTemplate, the statement template elements a
+# TAP row can set (others in the config are ignored, as by dctap)
+statement_template_fields = [
+    "propertyID",
+    "propertyLabel",
+    "mandatory",
+    "repeatable",
+    "valueNodeType",
+    "valueDataType",
+    "valueConstraint",
+    "valueConstraintType",
+    "valueShape",
+    "note",
+]
+# Boolean values dctap normalises to "true" and "false"
+true_values = ["true", "TRUE", "True", "1"]
+false_values = ["false", "FALSE", "False", "0"]
+
+
+class FastTAPReader:
+    """Reads a TAP csv row by row, straight to the statement template dicts that dctap's csvreader would give, without building the whole shapes dict first.
+
+    It follows dctap's reading of the header (aliases, extra elements), of shapeIDs (a row with none belongs to the last new shape, or the default shape) and its normalisation of values (Booleans, valueConstraints split or made numbers by valueConstraintType, lower case node types, picklist elements), but does not make dctap's warnings. read() returns None for csv it cannot read the same way, so that dctap can be used instead.
+    """
+
+    def __init__(self, config_dict):
+        self.config_dict = config_dict
+        self.default_shape_id = config_dict["default_shape_identifier"]
+        extra_shems = config_dict.get("extra_shape_elements") or []
+        extra_stems = config_dict.get("extra_statement_template_elements") or []
+        self.aliases = dict(config_dict.get("element_aliases") or {})
+        for element in extra_shems + extra_stems:
+            self.aliases[element.lower()] = element
+        main_stems = config_dict.get("statement_template_elements") or []
+        self.main_stems = set(main_stems) & set(statement_template_fields)
+        self.extra_stems = set(extra_stems)
+        self.separator = config_dict.get("picklist_item_separator", " ")
+        self.picklist_elements = config_dict.get("picklist_elements") or []
+        self.element_separator = config_dict.get("picklist_item_separator") or " "
+        # statement template elements the TAP read last can have
+        self.elements = None
+
+    def header(self, line):
+        """Return list of the element names in a header line, with aliases resolved."""
+        columns = []
+        for column in line.split(","):
+            column = coerce_concise(column)
+            columns.append(self.aliases.get(column, column))
+        return columns
+
+    def read(self, csv_text):
+        """Return an iterator over (shapeID, statement template dict) pairs for the rows of a TAP in csv_text, with None for the dict when a shape is first seen; or None if the TAP should be read by dctap."""
+        lines = (line.strip() for line in io.StringIO(csv_text))
+        lines = (line for line in lines if not line.startswith("#"))
+        header_line = next(lines, "")
+        first_line = next(lines, None)
+        if (first_line is None) or ('"' in header_line) or ("'" in header_line):
+            return None  # dctap reports no data, or has its own take on quotes
+        header = self.header(header_line)
+        if "propertyID" not in ",".join(header):
+            return None  # dctap reports the missing column
+        self.elements = [e for e in header if e in self.main_stems | self.extra_stems]
+        # put the header back as dctap does, and the first line back too
+        header_line = ",".join(header)
+        lines = itertools.chain([header_line, first_line], lines)
+        csv_lines = (line + "\n" for line in lines)
+        return self._statements(DictReader(csv_lines))
+
+    def _statements(self, rows):
+        shapes = set()
+        last_shape_id = None
+        for row in rows:
+            for key, value in row.items():
+                if isinstance(value, str):
+                    row[key] = value.strip()
+            shape_id = ""
+            if row.get("propertyID"):
+                if row.get("shapeID"):
+                    shape_id = row.get("shapeID")
+                elif last_shape_id is not None:
+                    shape_id = last_shape_id
+                else:
+                    shape_id = self.default_shape_id
+            elif row.get("shapeID"):
+                shape_id = row.get("shapeID")
+            if shape_id and (shape_id not in shapes):
+                shapes.add(shape_id)
+                last_shape_id = shape_id
+                yield (shape_id, None)
+            if row.get("propertyID"):
+                yield (shape_id, self.statement_template(row))
+
+    def statement_template(self, row):
+        """Return the normalised statement template dict for a row, leaving out empty elements."""
+        st = dict.fromkeys(statement_template_fields, "")
+        extras = dict()
+        for col in row:
+            if col in self.main_stems:
+                st[col] = row[col]
+            elif col in self.extra_stems:
+                extras[col] = row[col]
+        self.normalize(st)
+        st.update(extras)
+        return dict((key, value) for (key, value) in st.items() if value)
+
+    def normalize(self, st):
+        """Normalise the values of statement template dict st in place, in the same order as dctap's TAPStatementTemplate.normalize."""
+        for element in ["mandatory", "repeatable"]:
+            value = st[element]
+            if value in true_values:
+                st[element] = "true"
+            elif value in false_values:
+                st[element] = "false"
+        constraint_type = st["valueConstraintType"].lower()
+        st["valueConstraintType"] = constraint_type
+        if (constraint_type == "iristem") and st["valueConstraint"]:
+            st["valueConstraint"] = st["valueConstraint"].split()
+        if (constraint_type == "languagetag") and st["valueConstraint"]:
+            st["valueConstraint"] = self.split(st["valueConstraint"])
+        st["valueConstraint"] = coerce_integer(st["valueConstraint"])
+        if constraint_type in ["mininclusive", "maxinclusive"]:
+            if st["valueConstraint"]:
+                st["valueConstraint"] = coerce_numeric(st["valueConstraint"])
+        st["valueNodeType"] = st["valueNodeType"].lower()
+        if (constraint_type == "picklist") and st["valueConstraint"]:
+            st["valueConstraint"] = self.split(st["valueConstraint"])
+        for element in self.picklist_elements:
+            if st.get(element):
+                st[element] = st[element].split(self.element_separator)
+
+    def split(self, value):
+        return [item.strip() for item in value.split(self.separator) if item]
@@ -1,2 +1,27 @@
-from .tap2shaclConverter import TAP2SHACLConverter, TAP2APConverter, AP2SHACLConverter
 from ._version import __version__
+import importlib
+
+# The converters import rdflib and dctap, which are slow to load, so they are
+# only imported when first used, and not at all for e.g. --help or --version.
+_lazy_imports = {
+    "TAP2SHACLConverter": ".tap2shaclConverter",
+    "TAP2APConverter": ".tap2shaclConverter",
+    "AP2SHACLConverter": ".tap2shaclConverter",
+    "AsyncConverter": ".asyncConvert",
+    "convert_tap_async": ".asyncConvert",
+}
+__all__ = list(_lazy_imports) + ["__version__"]
+
+
+def __getattr__(name):
+    if name in _lazy_imports:
+        module = importlib.import_module(_lazy_imports[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    msg = "module " + repr(__name__) + " has no attribute " + repr(name)
+    raise AttributeError(msg)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_imports))
@@ -1,22 +1,222 @@
 #!/usr/bin/env python
-from tap2shacl import (
-    TAP2SHACLConverter,
-    TAP2APConverter,
-    AP2SHACLConverter,
-    __version__,
-)
+from tap2shacl import __version__
 from tap2shacl.parseArguments import parse_arguments
+import sys
+
+# Converters are imported in the functions that use them, so that --help and
+# --version do not wait for rdflib and dctap to load.
 
 
 def main():
     args = parse_arguments()
+    if args.cprofile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.runcall(run, args)
+        finally:
+            profiler.dump_stats(args.cprofile)
+            print("cProfile statistics written to", args.cprofile, file=sys.stderr)
+    else:
+        run(args)
+
+
+def run(args):
+    if args.serve is not None:
+        check_single_profile_options(args, "in server mode")
+        serve_main(args)
+        return
+    if args.noCache or args.profile or args.memoryReport:
+        # a report needs a conversion, not output copied from the cache
+        cache = None
+    else:
+        from tap2shacl.outputCache import OutputCache
+
+        cache = OutputCache(args.cacheDir)
+    if args.batch:
+        check_single_profile_options(args, "in batch mode")
+        batch_main(args, cache)
+        return
     print(args.tapFileName)
     tapFName = args.tapFileName
-    c = TAP2SHACLConverter(tapFName, args.configFileName)
-    c.convertTAP2AP(args.namespaceFileName, args.aboutFileName, args.shapesFileName)
-    c.convertAP2SHACL()
-    #    c.dump_ap()
-    c.dump_shacl(args.outputFileName)
+    if tapFName.lower().endswith(".zip"):
+        check_single_profile_options(args, "for a zip")
+        bundle_main(args, cache)
+        return
+    if args.watch:
+        check_single_profile_options(args, "in watch mode")
+        watch_main(args)
+        return
+    if cache and args.outputFileName:
+        fnames = [
+            tapFName,
+            args.configFileName,
+            args.namespaceFileName,
+            args.aboutFileName,
+            args.shapesFileName,
+        ]
+        options = (args.format, args.stream, args.deterministic, args.graph)
+        key = cache.key(fnames, options)
+        if cache.fetch(key, args.outputFileName):
+            print("Inputs unchanged, output copied from cache.")
+            return
+    from tap2shacl.tap2shaclConverter import TAP2SHACLConverter
+    from ap import PhaseTimer
+
+    c = TAP2SHACLConverter(
+        tapFName,
+        args.configFileName,
+        deterministic=args.deterministic,
+        reader=reader(args),
+        timer=PhaseTimer(trace_memory=args.memoryReport),
+        backend=backend(args),
+    )
+    if args.stream:
+        c.load_profile(args.namespaceFileName, args.aboutFileName, args.shapesFileName)
+        c.dump_pipeline(args.outputFileName, args.format, args.graph)
+    else:
+        c.convertTAP2AP(args.namespaceFileName, args.aboutFileName, args.shapesFileName)
+        #    c.dump_ap()
+        c.dump_output(args.outputFileName, args.format, graph=args.graph)
+    if cache and args.outputFileName:
+        cache.store(key, args.outputFileName)
+    if args.profile == "json":
+        print(c.timer.json(), file=sys.stderr)
+    elif args.memoryReport:
+        print(c.timer.memory_report(), file=sys.stderr)
+    elif args.profile:
+        print(c.timer.table(), file=sys.stderr)
+
+
+def check_single_profile_options(args, mode):
+    """Exit with an error if options that report on converting a single profile from its files are used in another mode."""
+    for option, value in [
+        ("--profile", args.profile),
+        ("--memory-report", args.memoryReport),
+    ]:
+        if value:
+            sys.exit(option + " reports on converting a single TAP, not " + mode + ".")
+
+
+def reader(args):
+    if args.fastReader:
+        return "fast"
+    return "dctap"
+
+
+def backend(args):
+    if args.columnar:
+        return "columnar"
+    return "objects"
+
+
+def serve_main(args):
+    from tap2shacl.server import serve
+
+    serve(args.configFileName, args.host, args.serve, args.deterministic)
+
+
+def watch_main(args):
+    if args.stream:
+        sys.exit(
+            "--stream cannot be used in watch mode, which always writes shape by shape."
+        )
+    from tap2shacl.batchConvert import Profile
+    from tap2shacl.watch import ProfileWatcher
+
+    profile = Profile(
+        args.tapFileName,
+        args.namespaceFileName,
+        args.aboutFileName,
+        args.shapesFileName,
+        args.outputFileName,
+    )
+    watcher = ProfileWatcher(
+        profile,
+        args.configFileName,
+        args.outputFileName,
+        args.format,
+        args.graph,
+        args.deterministic,
+        reader=reader(args),
+        backend=backend(args),
+    )
+    print("Watching for changes, press Ctrl-C to stop.", file=sys.stderr)
+    try:
+        watcher.run(report=lambda msg: print(msg, file=sys.stderr))
+    except KeyboardInterrupt:
+        pass
+
+
+def bundle_main(args, cache=None):
+    from tap2shacl.batchConvert import BatchConverter, Profile
+    from tap2shacl import parseArguments
+
+    if args.watch:
+        sys.exit("Watch mode needs the TAP and csv files, not a zip.")
+    for option, name, default in [
+        ("-ns", args.namespaceFileName, parseArguments.namespaceFileName),
+        ("-a", args.aboutFileName, parseArguments.aboutFileName),
+        ("-s", args.shapesFileName, parseArguments.shapesFileName),
+    ]:
+        if name != default:
+            sys.exit(
+                option + " cannot be used with a zip, which has its own csv files."
+            )
+    profile = Profile(
+        args.tapFileName,
+        None,
+        None,
+        None,
+        args.outputFileName,
+        bundle=args.tapFileName,
+    )
+    converter = BatchConverter(
+        args.configFileName,
+        None,
+        args.deterministic,
+        args.stream,
+        args.format,
+        cache,
+        reader(args),
+        args.graph,
+        backend(args),
+    )
+    fname, cached = converter._convert(profile)
+    if cached:
+        print("Inputs unchanged, output copied from cache.")
+
+
+def batch_main(args, cache=None):
+    from tap2shacl.batchConvert import BatchConverter, read_profiles
+
+    profiles = []
+    for source in args.batch:
+        profiles.extend(read_profiles(source))
+    converter = BatchConverter(
+        args.configFileName,
+        args.outputDir,
+        args.deterministic,
+        args.stream,
+        args.format,
+        cache,
+        reader(args),
+        args.graph,
+        backend(args),
+    )
+    results = converter.convert_all(profiles, args.jobs)
+    errors = [r for r in results if r.error]
+    for r in results:
+        if r.error:
+            print(r.profile.tap, "failed:", r.error, file=sys.stderr)
+        elif r.cached:
+            print(r.profile.tap, "->", r.output, "(unchanged, from cache)")
+        else:
+            print(r.profile.tap, "->", r.output)
+    if errors:
+        msg = "%d of %d profiles could not be converted." % (len(errors), len(results))
+        sys.exit(msg)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,150 @@
+from concurrent.futures import ThreadPoolExecutor
+from .batchConvert import BatchConverter, Profile, ProfileResult
+from .tap2shaclConverter import TAP2SHACLConverter
+import asyncio, io, threading
+
+# number of conversions an AsyncConverter runs at once
+default_max_workers = 4
+
+
+class ConversionCancelled(Exception):
+    """Raised in a worker thread to stop a conversion that has been cancelled."""
+
+
+class AsyncConverter:
+    """Converts profiles for asyncio code, in a pool of worker threads so that the event loop is never blocked.
+
+    Reading the TAP, config and csv files, converting and writing the output all happen in the workers. At most max_workers conversions are submitted at once; more wait, without blocking the loop, for one to finish. The config is read once, by the first conversion, and the config and namespace tables are shared between conversions as in batch mode. Cancelling a conversion that has started stops it at the next step (loading, converting or writing).
+    """
+
+    def __init__(
+        self, config_fname, max_workers=default_max_workers, deterministic=False
+    ):
+        self.config_fname = config_fname
+        self.max_workers = max_workers
+        self.deterministic = deterministic
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix="tap2shacl")
+        self._batchConverter = None
+        self._lock = threading.Lock()
+        self._semaphore = None
+        self._semaphore_loop = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Stop the worker threads once they have finished the conversions already started."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def batchConverter(self):
+        """Return the BatchConverter holding the config and namespace tables, reading the config the first time."""
+        with self._lock:
+            if self._batchConverter is None:
+                self._batchConverter = BatchConverter(
+                    self.config_fname, deterministic=self.deterministic
+                )
+        return self._batchConverter
+
+    def semaphore(self):
+        """Return the semaphore limiting the conversions submitted at once, one for each event loop."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    def convert_in_worker(self, profile, output, format, stream, graph, cancelled):
+        """Convert profile in the calling (worker) thread, stopping if threading.Event cancelled is set; return output, or the output as bytes if output is None."""
+
+        def check():
+            if cancelled.is_set():
+                raise ConversionCancelled(profile.tap)
+
+        check()
+        batchConverter = self.batchConverter()
+        c = TAP2SHACLConverter(
+            profile.tap,
+            self.config_fname,
+            batchConverter.config_dict,
+            self.deterministic,
+        )
+        check()
+        c.convertTAP2AP(
+            profile.namespaces,
+            profile.about,
+            profile.shapes,
+            batchConverter.namespace_table(profile.namespaces),
+        )
+        check()
+        if output:
+            c.dump_output(output, format, stream, graph)
+            return output
+        f = io.BytesIO()
+        c.write_output(f, format, stream, graph)
+        return f.getvalue()
+
+    async def convert(
+        self, profile, output=None, format="turtle", stream=False, graph=None
+    ):
+        """Convert a Profile, writing the output to file output; return output, or the output as bytes if output is None."""
+        async with self.semaphore():
+            cancelled = threading.Event()
+            future = asyncio.get_running_loop().run_in_executor(
+                self.executor,
+                self.convert_in_worker,
+                profile,
+                output,
+                format,
+                stream,
+                graph,
+                cancelled,
+            )
+            try:
+                return await future
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+    async def try_convert(self, profile, format="turtle", stream=False):
+        """Convert profile to its output file, return a ProfileResult recording any error rather than raising it."""
+        try:
+            fname = await self.convert(profile, profile.output, format, stream)
+            return ProfileResult(profile, output=fname)
+        except Exception as e:
+            return ProfileResult(profile, error=type(e).__name__ + ": " + str(e))
+
+    async def convert_all(self, profiles, format="turtle", stream=False):
+        """Convert a list of Profiles to their output files, return list of ProfileResults in the same order."""
+        return await asyncio.gather(
+            *[self.try_convert(profile, format, stream) for profile in profiles]
+        )
+
+
+async def convert_tap_async(
+    tap_fname,
+    config_fname,
+    namespace_fname,
+    about_fname,
+    shapes_fname,
+    output=None,
+    format="turtle",
+    stream=False,
+    graph=None,
+    deterministic=False,
+    converter=None,
+):
+    """Convert a TAP and its csv files to SHACL without blocking the event loop; return output, or the output as bytes if output is None.
+
+    Pass an AsyncConverter as converter to share its config, threads and limit on conversions at once between calls.
+    """
+    profile = Profile(tap_fname, namespace_fname, about_fname, shapes_fname, output)
+    if converter is None:
+        async with AsyncConverter(config_fname, 1, deterministic) as converter:
+            return await converter.convert(profile, output, format, stream, graph)
+    elif converter.config_fname != config_fname:
+        msg = "AsyncConverter uses config " + converter.config_fname
+        raise ValueError(msg)
+    return await converter.convert(profile, output, format, stream, graph)
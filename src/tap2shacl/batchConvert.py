@@ -0,0 +1,348 @@
+from dataclasses import dataclass
+from csv import DictReader
+from dctap.config import get_config
+from ap import AP
+from ap.csvSource import is_file_name
+from tap2ap import read_config_namespaces
+from .tap2shaclConverter import TAP2SHACLConverter
+from .outputCache import OutputCache, digest_contents
+from .profileBundle import read_files, read_file, read_zip, is_bundle
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from hashlib import sha256
+import os
+
+# file names expected in a profile folder, as in examples/SimpleBook
+tapFileName = "tap.csv"
+namespaceFileName = "namespaces.csv"
+aboutFileName = "about.csv"
+shapesFileName = "shapes.csv"
+outputFileName = "shacl.ttl"
+# file name extensions for each output format
+outputExtensions = {"turtle": ".ttl", "nt": ".nt", "nquads": ".nq"}
+
+
+@dataclass
+class Profile:
+    """File names for the TAP and csv files of one application profile, or of a zip bundle of them."""
+
+    tap: str
+    namespaces: str
+    about: str
+    shapes: str
+    output: str = None
+    bundle: str = None
+
+    @classmethod
+    def from_dir(cls, dir_name, output=None):
+        """Return a Profile for a folder laid out like examples/SimpleBook."""
+        if output is None:
+            output = os.path.join(dir_name, outputFileName)
+        return cls(
+            tap=os.path.join(dir_name, tapFileName),
+            namespaces=os.path.join(dir_name, namespaceFileName),
+            about=os.path.join(dir_name, aboutFileName),
+            shapes=os.path.join(dir_name, shapesFileName),
+            output=output,
+        )
+
+    @classmethod
+    def from_bundle(cls, fname, output=None):
+        """Return a Profile for a zip of the TAP and csv files (see profileBundle.read_zip); the output is by default named after the zip."""
+        if output is None:
+            output = os.path.splitext(fname)[0] + ".ttl"
+        return cls(
+            tap=fname,
+            namespaces=None,
+            about=None,
+            shapes=None,
+            output=output,
+            bundle=fname,
+        )
+
+
+@dataclass
+class ProfileResult:
+    """Outcome of converting one profile: the output file name or an error message."""
+
+    profile: Profile
+    output: str = None
+    error: str = None
+    cached: bool = False
+
+
+def find_profiles(dir_name):
+    """Return a list of Profiles for the sub-folders of dir_name that have a TAP, and the zip bundles in it."""
+    profiles = []
+    for entry in sorted(os.listdir(dir_name)):
+        profile_dir = os.path.join(dir_name, entry)
+        if os.path.isfile(os.path.join(profile_dir, tapFileName)):
+            profiles.append(Profile.from_dir(profile_dir))
+        elif entry.lower().endswith(".zip") and is_bundle(profile_dir):
+            profiles.append(Profile.from_bundle(profile_dir))
+    return profiles
+
+
+def read_manifest(fname):
+    """Return a list of Profiles from a (csv) manifest file.
+
+    The manifest must have a `profile` column giving a profile folder; optional `tap`, `namespaces`, `about`, `shapes` and `output` columns override the default file names in that folder. Relative paths are relative to the manifest.
+    """
+    manifest_dir = os.path.dirname(fname)
+    profiles = []
+    with open(fname, "r") as csv_file:
+        csvReader = DictReader(csv_file)
+        for row in csvReader:
+            if row.get("profile"):
+                profile_dir = os.path.join(manifest_dir, row["profile"])
+            else:  # skip lines with no profile folder
+                continue
+            profile = Profile.from_dir(profile_dir)
+            for key in ["tap", "namespaces", "about", "shapes", "output"]:
+                if row.get(key):
+                    setattr(profile, key, os.path.join(profile_dir, row[key]))
+            profiles.append(profile)
+    return profiles
+
+
+def read_profiles(source):
+    """Return a list of Profiles from a profile folder, a zip bundle, a folder of profile folders or a manifest file."""
+    if os.path.isfile(os.path.join(source, tapFileName)):
+        return [Profile.from_dir(source)]
+    elif is_bundle(source):
+        return [Profile.from_bundle(source)]
+    elif os.path.isdir(source):
+        return find_profiles(source)
+    elif os.path.isfile(source):
+        return read_manifest(source)
+    else:
+        msg = "No profile folder or manifest file " + source
+        raise ValueError(msg)
+
+
+class BatchConverter:
+    """Converts many profiles in one process, sharing the TAP config and namespace tables between them."""
+
+    def __init__(
+        self,
+        config_fname,
+        output_dir=None,
+        deterministic=False,
+        stream=False,
+        format="turtle",
+        cache=None,
+        reader="dctap",
+        graph=None,
+        backend="objects",
+    ):
+        self.config_fname = config_fname
+        self.config_dict = get_config(nondefault_configfile_name=config_fname)
+        self.config_content = read_file(config_fname)  # for cache keys
+        self.config_namespaces = read_config_namespaces(self.config_dict)
+        self.namespace_tables = dict()
+        self.output_dir = output_dir
+        self.deterministic = deterministic
+        self.stream = stream
+        self.format = format
+        self.cache = cache  # an OutputCache, or None to always convert
+        self.reader = reader  # "fast" for FastTAPReader, see TAP2APConverter
+        self.graph = graph  # N-Quads graph name, None for each profile's base
+        self.backend = backend  # "columnar" for ColumnarAP, see TAP2APConverter
+
+    def read_namespaces(self, namespace_source):
+        """Return the namespaces from the config and a namespaces csv file name, text, file object or rows."""
+        ap = AP()
+        for prefix in self.config_namespaces:
+            ap.add_namespace(prefix, self.config_namespaces[prefix])
+        ap.load_namespaces(namespace_source)
+        return ap.namespaces
+
+    def namespace_table(self, namespace_fname):
+        """Return the namespaces from the config and namespace_fname, reading each file only once.
+
+        namespace_fname may be any source ap.load_namespaces reads, but only files, and contents as bytes, are read once.
+        """
+        if isinstance(namespace_fname, bytes):
+            key = sha256(namespace_fname).hexdigest()
+        elif is_file_name(namespace_fname):
+            key = os.path.abspath(namespace_fname)
+        else:
+            return self.read_namespaces(namespace_fname)
+        if key not in self.namespace_tables.keys():
+            self.namespace_tables[key] = self.read_namespaces(namespace_fname)
+        return self.namespace_tables[key]
+
+    def output_fname(self, profile):
+        """Return the name of the file the SHACL for profile is written to."""
+        extension = outputExtensions[self.format]
+        if self.output_dir and profile.bundle:
+            profile_name = os.path.splitext(os.path.basename(profile.bundle))[0]
+            return os.path.join(self.output_dir, profile_name + extension)
+        elif self.output_dir:
+            profile_name = os.path.basename(os.path.dirname(profile.tap))
+            return os.path.join(self.output_dir, profile_name + extension)
+        elif profile.output is None:
+            return None
+        elif (
+            profile.bundle
+            and profile.output == Profile.from_bundle(profile.bundle).output
+        ):
+            return os.path.splitext(profile.output)[0] + extension
+        elif os.path.basename(profile.output) == outputFileName:
+            # default name, change the extension to suit the format
+            return os.path.splitext(profile.output)[0] + extension
+        else:
+            return profile.output
+
+    def read_bundle(self, profile):
+        """Return a ProfileBundle with the contents of the files of profile, reading each file once."""
+        if profile.bundle:
+            return read_zip(profile.bundle)
+        else:
+            return read_files(profile)
+
+    def cache_key(self, profile, bundle=None):
+        """Return the OutputCache key for the input files of profile, or their contents in a ProfileBundle, and the conversion options."""
+        if bundle is None:
+            bundle = self.read_bundle(profile)
+        contents = bundle.contents()
+        contents.insert(1, self.config_content)
+        if bundle.config is not None:
+            contents.append(bundle.config)
+        # as for a single profile
+        options = (self.format, self.stream, self.deterministic, self.graph)
+        return digest_contents(contents, options)
+
+    def convert(self, profile):
+        """Convert one profile, return the name of the output file."""
+        fname, cached = self._convert(profile)
+        return fname
+
+    def _convert(self, profile):
+        """Convert one profile, or copy its output from the cache; return the output file name and whether it was cached."""
+        fname = self.output_fname(profile)
+        # the files are read once, for both the cache key and the conversion
+        bundle = self.read_bundle(profile)
+        if self.cache and fname:
+            key = self.cache_key(profile, bundle)
+            if self.cache.fetch(key, fname):
+                return (fname, True)
+        config_dict = bundle.config_dict()
+        if config_dict is None:
+            config_dict = self.config_dict
+            namespaces = self.namespace_table(bundle.namespaces)
+        else:  # the profile has its own config
+            namespaces = None
+        c = TAP2SHACLConverter(
+            bundle.tap,
+            self.config_fname,
+            config_dict,
+            self.deterministic,
+            self.reader,
+            backend=self.backend,
+        )
+        if self.stream:
+            c.load_profile(bundle.namespaces, bundle.about, bundle.shapes, namespaces)
+            c.dump_pipeline(fname, self.format, self.graph)
+        else:
+            c.convertTAP2AP(bundle.namespaces, bundle.about, bundle.shapes, namespaces)
+            c.dump_output(fname, self.format, graph=self.graph)
+        if self.cache and fname:
+            self.cache.store(key, fname)
+        return (fname, False)
+
+    def try_convert(self, profile):
+        """Convert one profile, return a ProfileResult recording any error rather than raising it."""
+        try:
+            fname, cached = self._convert(profile)
+            return ProfileResult(profile, output=fname, cached=cached)
+        except Exception as e:
+            return error_result(profile, e)
+
+    def convert_all(self, profiles, jobs=1):
+        """Convert a list of profiles, return list of ProfileResults in the same order.
+
+        If jobs is more than 1 the profiles are converted by a pool of that many worker processes, each of which reads the config once; if jobs is 0 one worker per CPU is used. If a worker cannot start, or dies, the profiles it would have converted get its error. Profiles that would write the same output file (e.g. folders of the same name with an output folder) are not converted, and get an error saying so.
+        """
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+        collisions = self.output_collisions(profiles)
+        to_convert = [p for (n, p) in enumerate(profiles) if n not in collisions]
+        converted = iter(self._convert_profiles(to_convert, jobs))
+        results = []
+        for n, profile in enumerate(profiles):
+            if n in collisions:
+                results.append(ProfileResult(profile, error=collisions[n]))
+            else:
+                results.append(next(converted))
+        return results
+
+    def output_collisions(self, profiles):
+        """Return dict of the indexes of profiles whose output file is also that of another profile and an error message for each."""
+        by_output = dict()
+        for n, profile in enumerate(profiles):
+            fname = self.output_fname(profile)
+            if fname is not None:
+                by_output.setdefault(os.path.abspath(fname), []).append(n)
+        collisions = dict()
+        for fname, indexes in by_output.items():
+            if len(indexes) > 1:
+                taps = ", ".join(profiles[n].tap for n in indexes)
+                for n in indexes:
+                    msg = "Output file " + fname + " is the output of " + taps
+                    collisions[n] = msg
+        return collisions
+
+    def _convert_profiles(self, profiles, jobs):
+        """Convert a list of profiles, serially or by a pool of jobs workers (see convert_all), return list of ProfileResults in the same order."""
+        if jobs == 1:
+            return [self.try_convert(profile) for profile in profiles]
+        with ProcessPoolExecutor(
+            max_workers=jobs or None,
+            initializer=_init_worker,
+            initargs=(
+                self.config_fname,
+                self.output_dir,
+                self.deterministic,
+                self.stream,
+                self.format,
+                self.cache,
+                self.reader,
+                self.graph,
+                self.backend,
+            ),
+        ) as executor:
+            futures = []
+            for profile in profiles:
+                try:
+                    futures.append(executor.submit(_convert_in_worker, profile))
+                except BrokenProcessPool as e:
+                    futures.append(e)
+            results = []
+            for profile, future in zip(profiles, futures):
+                if isinstance(future, BrokenProcessPool):
+                    results.append(error_result(profile, future))
+                    continue
+                try:
+                    results.append(future.result())
+                except BrokenProcessPool as e:
+                    results.append(error_result(profile, e))
+            return results
+
+
+def error_result(profile, e):
+    """Return a ProfileResult for profile with exception e as its error."""
+    return ProfileResult(profile, error=type(e).__name__ + ": " + str(e))
+
+
+# each worker process in a pool keeps its own BatchConverter
+_worker_converter = None
+
+
+def _init_worker(*args):
+    global _worker_converter
+    _worker_converter = BatchConverter(*args)
+
+
+def _convert_in_worker(profile):
+    return _worker_converter.try_convert(profile)
@@ -0,0 +1,125 @@
+from ._version import __version__
+from hashlib import sha256
+import os, shutil, tempfile, time
+
+# defaults for where cached output is kept and when it is evicted
+default_cache_dir = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "tap2shacl",
+)
+default_max_size = 100 * 1024 * 1024  # bytes
+default_max_age = 30 * 24 * 60 * 60  # seconds
+
+
+def digest_contents(contents, options=()):
+    """Return a hex digest of the tool version, the options and a list of file contents as bytes, None for a missing file."""
+    digest = sha256()
+    digest.update(("tap2shacl " + __version__ + "\n").encode("utf-8"))
+    digest.update((repr(tuple(options)) + "\n").encode("utf-8"))
+    for content in contents:
+        if content is None:
+            digest.update(b"missing\n")
+        else:
+            digest.update(b"file %d\n" % len(content))
+            digest.update(content)
+    return digest.hexdigest()
+
+
+def digest_inputs(fnames, options=()):
+    """Return a hex digest of the tool version, the options and the contents of the files in list fnames."""
+    contents = []
+    for fname in fnames:
+        try:
+            with open(fname, "rb") as f:
+                contents.append(f.read())
+        except OSError:  # let the converter report it, if it matters
+            contents.append(None)
+    return digest_contents(contents, options)
+
+
+class OutputCache:
+    """A folder of converted output files, each named by a digest of the inputs it was made from.
+
+    When a profile's TAP, config, namespace, about and shapes files, the options and the tool version all match an earlier conversion, its output is copied from the cache rather than converted again. Entries not used for max_age seconds are removed, then the least recently used ones until the cache is no bigger than max_size bytes.
+    """
+
+    def __init__(
+        self,
+        cache_dir=None,
+        max_size=default_max_size,
+        max_age=default_max_age,
+    ):
+        if cache_dir is None:
+            cache_dir = default_cache_dir
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.max_age = max_age
+
+    def key(self, fnames, options=()):
+        """Return a hex digest of the tool version, the options and the contents of the files in list fnames."""
+        return digest_inputs(fnames, options)
+
+    def entry_fname(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def fetch(self, key, fname):
+        """Copy the output cached for key to fname; return False if there is none."""
+        entry = self.entry_fname(key)
+        try:
+            shutil.copyfile(entry, fname)
+        except FileNotFoundError:
+            return False
+        os.utime(entry)  # mark as recently used
+        return True
+
+    def store(self, key, fname):
+        """Put a copy of output file fname in the cache under key, then evict old entries."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # copy then rename, so that other processes never see part of an entry
+        handle, temp_fname = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(handle)
+        try:
+            shutil.copyfile(fname, temp_fname)
+            os.replace(temp_fname, self.entry_fname(key))
+        except Exception as e:
+            os.remove(temp_fname)
+            raise e
+        self.evict()
+
+    def entries(self):
+        """Return list of (last used time, size, file name) of the cache entries, oldest first."""
+        entries = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except FileNotFoundError:
+            return entries
+        for name in names:
+            if name.endswith(".tmp"):
+                continue
+            entry = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(entry)
+            except FileNotFoundError:  # evicted by another process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        entries.sort()
+        return entries
+
+    def evict(self):
+        """Remove entries older than max_age, then the oldest until the total size is within max_size."""
+        entries = self.entries()
+        total_size = sum(size for (used, size, entry) in entries)
+        oldest_allowed = time.time() - self.max_age
+        for used, size, entry in entries:
+            if (used >= oldest_allowed) and (total_size <= self.max_size):
+                break
+            try:
+                os.remove(entry)
+            except FileNotFoundError:
+                pass
+            total_size = total_size - size
+
+    def clear(self):
+        """Remove all entries."""
+        for used, size, entry in self.entries():
+            os.remove(entry)
@@ -8,6 +8,23 @@ namespaceFileName = "namespaces.csv"
 aboutFileName = "about.csv"
 shapesFileName = "shapes.csv"
 outputFileName = None
+batchSource = None
+outputDir = None
+jobs = 1
+deterministic = False
+stream = False
+outputFormat = "turtle"
+graphName = None
+noCache = False
+cacheDir = None  # OutputCache default
+watch = False
+fastReader = False
+servePort = None
+serverHost = "127.0.0.1"
+profile = None
+cprofileFileName = None
+memoryReport = False
+columnar = False
 
 
 def parse_arguments():
@@ -15,7 +32,13 @@ def parse_arguments():
         prog="tap2shacl.py",
         description="Reads a Dublin Core Tabular Application Profile, with some extensions, and converts it to SHACL.",
     )
-    parser.add_argument("tapFileName", type=str, metavar="<tap csv file>")
+    parser.add_argument(
+        "tapFileName",
+        nargs="?",
+        type=str,
+        metavar="<tap csv file>",
+        default=tapFileName,
+    )
     parser.add_argument(
         "-c",
         "--configFileName",
@@ -51,7 +74,135 @@ def parse_arguments():
         metavar="<output file>",
         default=outputFileName,
     )
+    parser.add_argument(
+        "-b",
+        "--batch",
+        action="append",
+        type=str,
+        metavar="<profiles folder or manifest csv file>",
+        default=batchSource,
+        help="convert a profile folder, every profile in a folder of profile folders, or every profile listed in a manifest; may be repeated",
+    )
+    parser.add_argument(
+        "-o",
+        "--outputDir",
+        type=str,
+        metavar="<output folder>",
+        default=outputDir,
+        help="in batch mode, write <profile folder name>.ttl files here",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        metavar="<number of worker processes>",
+        default=jobs,
+        help="in batch mode, convert profiles in this many parallel processes (0 for one per CPU)",
+    )
+    parser.add_argument(
+        "-d",
+        "--deterministic",
+        action="store_true",
+        default=deterministic,
+        help="name unlabelled property shapes from a hash of their content, so the same input always gives the same output",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        default=stream,
+        help="convert the TAP rows and write the SHACL one shape at a time, without holding the whole profile or graph in memory",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        type=str,
+        choices=["turtle", "nt", "nquads"],
+        default=outputFormat,
+        help="output format; nt and nquads are written straight from the profile, without building a graph",
+    )
+    parser.add_argument(
+        "-g",
+        "--graph",
+        type=str,
+        metavar="<graph IRI>",
+        default=graphName,
+        help="for nquads output, the named graph (default each profile's base namespace)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="noCache",
+        action="store_true",
+        default=noCache,
+        help="always convert, rather than copying unchanged profiles' output from the cache",
+    )
+    parser.add_argument(
+        "--cacheDir",
+        type=str,
+        metavar="<cache folder>",
+        default=cacheDir,
+        help="folder for cached output (default ~/.cache/tap2shacl)",
+    )
+    parser.add_argument(
+        "-w",
+        "--watch",
+        action="store_true",
+        default=watch,
+        help="keep running, and convert again whenever the TAP, config or csv files change",
+    )
+    parser.add_argument(
+        "--fastReader",
+        action="store_true",
+        default=fastReader,
+        help="read the TAP row by row as it is converted, rather than with dctap; faster for large TAPs, but gives no dctap warnings",
+    )
+    parser.add_argument(
+        "--serve",
+        nargs="?",
+        type=int,
+        const=8642,
+        metavar="<port>",
+        default=servePort,
+        help="run a server that converts profiles posted to /convert as JSON (default port 8642)",
+    )
+    parser.add_argument(
+        "--host",
+        type=str,
+        metavar="<address>",
+        default=serverHost,
+        help="address the server listens on (default 127.0.0.1, this machine only)",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        choices=["table", "json"],
+        const="table",
+        default=profile,
+        help="print the time taken by each phase of converting a single profile, as a table (the default) or JSON, to stderr",
+    )
+    parser.add_argument(
+        "--cprofile",
+        type=str,
+        metavar="<stats file>",
+        default=cprofileFileName,
+        help="run under cProfile and write its statistics to this file, for pstats or snakeviz",
+    )
+    parser.add_argument(
+        "--memory-report",
+        dest="memoryReport",
+        action="store_true",
+        default=memoryReport,
+        help="trace memory with tracemalloc while converting a single profile and print the memory used and peak in each phase, and the allocation sites that changed most, to stderr (with --profile json, as JSON); converting is several times slower",
+    )
+    parser.add_argument(
+        "--columnar",
+        action="store_true",
+        default=columnar,
+        help="store the statement templates column by column, with each string held once, rather than as objects; uses less memory for very large profiles",
+    )
     parser.add_argument(
         "-v", "--version", action="version", version="%(prog)s " + __version__
     )
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.jobs < 0:
+        parser.error("argument -j/--jobs: must be 0 or more")
+    return args
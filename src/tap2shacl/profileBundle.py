@@ -0,0 +1,83 @@
+from dataclasses import dataclass
+from dctap.config import get_config
+import io, os, zipfile
+
+# the csv files of a profile; in a zip, a csv file is taken to be one of these
+# if its name (less .csv) ends with the part, as in tap.csv or
+# "Book AP - shapes.csv" from a workbook exported sheet by sheet
+bundleParts = ["tap", "namespaces", "about", "shapes"]
+# extensions of a TAP config file in a zip
+configExtensions = [".yml", ".yaml"]
+
+
+@dataclass
+class ProfileBundle:
+    """The contents of the TAP and csv files of a profile, read into memory, and the TAP config if the profile has its own.
+
+    Each is bytes, which the loaders read as utf-8 csv.
+    """
+
+    tap: bytes
+    namespaces: bytes = b""
+    about: bytes = b""
+    shapes: bytes = b""
+    config: bytes = None
+
+    def contents(self):
+        """Return list of the contents of the TAP and csv files."""
+        return [self.tap, self.namespaces, self.about, self.shapes]
+
+    def config_dict(self):
+        """Return the profile's own dctap config dict, or None if it has none."""
+        if self.config is None:
+            return None
+        return get_config(nondefault_configyaml_str=self.config.decode("utf-8"))
+
+
+def read_file(fname):
+    """Return the contents of file fname as bytes, read in one go."""
+    with open(fname, "rb") as f:
+        return f.read()
+
+
+def read_files(profile):
+    """Return a ProfileBundle with the contents of the TAP and csv files of a Profile, each read once."""
+    return ProfileBundle(
+        read_file(profile.tap),
+        read_file(profile.namespaces),
+        read_file(profile.about),
+        read_file(profile.shapes),
+    )
+
+
+def read_zip(fname):
+    """Return a ProfileBundle from a zip of the TAP, csv files and, optionally, a TAP config.
+
+    The zip is read in one go. Files may be in a folder in the zip; only the TAP is required.
+    """
+    contents = dict()
+    with zipfile.ZipFile(io.BytesIO(read_file(fname))) as zip_file:
+        for name in zip_file.namelist():
+            if name.endswith("/") or "__MACOSX" in name:
+                continue
+            stem, extension = os.path.splitext(os.path.basename(name).lower())
+            if extension == ".csv":
+                parts = [part for part in bundleParts if stem.endswith(part)]
+            elif extension in configExtensions:
+                parts = ["config"]
+            else:
+                continue
+            for part in parts:
+                if part in contents.keys():
+                    msg = "More than one " + part + " file in " + fname
+                    raise ValueError(msg)
+                contents[part] = zip_file.read(name)
+    if "tap" not in contents.keys():
+        msg = "No TAP (tap.csv) in " + fname
+        raise ValueError(msg)
+    return ProfileBundle(**contents)
+
+
+def is_bundle(fname):
+    """Return True if fname is a zip file that may hold a profile."""
+    return os.path.isfile(fname) and zipfile.is_zipfile(fname)
@@ -0,0 +1,198 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from hashlib import sha256
+from ._version import __version__
+from .tap2shaclConverter import TAP2SHACLConverter
+from .batchConvert import BatchConverter
+import io, json, sys, threading
+
+# where the server listens by default; it is meant for localhost only
+default_host = "127.0.0.1"
+default_port = 8642
+# largest request body accepted, in bytes
+max_request_size = 16 * 1024 * 1024
+# number of namespace tables kept, keyed by the content of their csv
+max_namespace_tables = 256
+# content types of the output formats
+contentTypes = {
+    "turtle": "text/turtle; charset=utf-8",
+    "nt": "application/n-triples",
+    "nquads": "application/n-quads",
+}
+
+
+class RequestError(ValueError):
+    """A conversion request that is not well formed, as opposed to a profile that cannot be converted."""
+
+
+class ConversionService:
+    """Converts profiles sent as csv text, keeping the TAP config and namespace tables between conversions.
+
+    A conversion request is a dict with the csv text of the TAP in "tap", and optionally of the namespaces, about and shapes files in "namespaces", "about" and "shapes"; the output "format" (turtle, nt or nquads); "stream" for Turtle written shape by shape; the "graph" IRI for nquads; and "deterministic". Conversions may run in several threads at once.
+    """
+
+    def __init__(self, config_fname, deterministic=False):
+        self.config_fname = config_fname
+        self.deterministic = deterministic
+        # holds the parsed config and the namespaces it declares
+        self.batchConverter = BatchConverter(config_fname, deterministic=deterministic)
+        self.namespace_tables = dict()  # digest of namespaces csv: namespaces
+        self.lock = threading.Lock()
+        self.count = 0
+
+    def namespace_table(self, namespaces_csv):
+        """Return the namespaces from the config and namespaces_csv text, read only the first time it is seen."""
+        key = sha256(namespaces_csv.encode("utf-8")).hexdigest()
+        with self.lock:
+            namespaces = self.namespace_tables.get(key)
+        if namespaces is None:
+            namespaces = self.batchConverter.read_namespaces(
+                io.StringIO(namespaces_csv)
+            )
+            with self.lock:
+                if len(self.namespace_tables) >= max_namespace_tables:
+                    # forget the oldest
+                    del self.namespace_tables[next(iter(self.namespace_tables))]
+                self.namespace_tables[key] = namespaces
+        return namespaces
+
+    def convert(self, request):
+        """Convert the profile in a request dict, return the output as bytes."""
+        if not isinstance(request, dict):
+            msg = "Request must be a JSON object."
+            raise RequestError(msg)
+        if not isinstance(request.get("tap"), str):
+            msg = "Request must have the TAP csv as a string in tap."
+            raise RequestError(msg)
+        format = request.get("format", "turtle")
+        if format not in contentTypes.keys():
+            msg = "Output format " + str(format) + " unknown."
+            raise RequestError(msg)
+        csvs = dict()
+        for name in ["tap", "namespaces", "about", "shapes"]:
+            csvs[name] = request.get(name) or ""
+            if not isinstance(csvs[name], str):
+                msg = name + " must be a string."
+                raise RequestError(msg)
+        for name in ["stream", "deterministic"]:
+            if not isinstance(request.get(name, False), bool):
+                msg = name + " must be true or false."
+                raise RequestError(msg)
+        if not isinstance(request.get("graph", ""), (str, type(None))):
+            msg = "graph must be a string."
+            raise RequestError(msg)
+        deterministic = request.get("deterministic", self.deterministic)
+        # csv text is read from memory, the converter never touches the disk
+        c = TAP2SHACLConverter(
+            io.StringIO(csvs["tap"]),
+            self.config_fname,
+            self.batchConverter.config_dict,
+            deterministic,
+        )
+        c.convertTAP2AP(
+            io.StringIO(csvs["namespaces"]),
+            io.StringIO(csvs["about"]),
+            io.StringIO(csvs["shapes"]),
+            self.namespace_table(csvs["namespaces"]),
+        )
+        output = io.BytesIO()
+        c.write_output(
+            output, format, request.get("stream", False), request.get("graph")
+        )
+        with self.lock:
+            self.count = self.count + 1
+        return output.getvalue()
+
+    def status(self):
+        """Return a dict describing the service."""
+        return {
+            "version": __version__,
+            "config": self.config_fname,
+            "conversions": self.count,
+            "namespaceTables": len(self.namespace_tables),
+        }
+
+
+class ConversionRequestHandler(BaseHTTPRequestHandler):
+    """Handles GET / (status) and POST /convert (a JSON conversion request, see ConversionService)."""
+
+    server_version = "tap2shacl/" + __version__
+
+    def send_body(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, status, data):
+        body = json.dumps(data).encode("utf-8")
+        self.send_body(status, "application/json", body)
+
+    def send_error_json(self, status, message):
+        self.send_json(status, {"error": message})
+
+    def do_GET(self):
+        if self.path in ["/", "/status"]:
+            self.send_json(200, self.server.service.status())
+        else:
+            self.send_error_json(404, "No such path " + self.path)
+
+    def do_POST(self):
+        if self.path != "/convert":
+            self.send_error_json(404, "No such path " + self.path)
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if (length < 0) or (length > max_request_size):
+            self.close_connection = True
+            self.send_error_json(
+                413, "Request body must be up to %d bytes." % max_request_size
+            )
+            return
+        try:
+            request = json.loads(self.rfile.read(length).decode("utf-8"))
+        except ValueError as e:
+            self.send_error_json(400, "Request is not JSON: " + str(e))
+            return
+        try:
+            body = self.server.service.convert(request)
+        except RequestError as e:
+            self.send_error_json(400, str(e))
+            return
+        except Exception as e:
+            self.send_error_json(422, type(e).__name__ + ": " + str(e))
+            return
+        format = request.get("format", "turtle")
+        self.send_body(200, contentTypes[format], body)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class ConversionServer(ThreadingHTTPServer):
+    """HTTP server that converts profiles with a shared ConversionService, one thread per request."""
+
+    daemon_threads = True
+
+    def __init__(self, service, host=default_host, port=default_port, quiet=False):
+        self.service = service
+        self.quiet = quiet
+        super().__init__((host, port), ConversionRequestHandler)
+
+
+def serve(config_fname, host=default_host, port=default_port, deterministic=False):
+    """Run a conversion server until interrupted."""
+    service = ConversionService(config_fname, deterministic)
+    with ConversionServer(service, host, port) as server:
+        host, port = server.server_address[:2]
+        print(
+            "Serving on http://%s:%d/, press Ctrl-C to stop." % (host, port),
+            file=sys.stderr,
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -1,30 +1,159 @@
 from tap2ap import TAP2APConverter
 from ap2shacl import AP2SHACLConverter
+from ap2shacl.ntriplesWriter import text_writer
+from ap import PhaseTimer
+import sys
 
 
 class TAP2SHACLConverter:
     """Classs comprising TAP, AP data, with methods to convert from TAP to SHACL via AP"""
 
-    def __init__(self, tap_fname, config_fname):
-        self.tap2apConverter = TAP2APConverter(tap_fname, config_fname)
+    def __init__(
+        self,
+        tap_fname,
+        config_fname,
+        config_dict=None,
+        deterministic=False,
+        reader="dctap",
+        timer=None,
+        backend="objects",
+    ):
+        # records the time taken by each phase of the conversion; pass a
+        # PhaseTimer(trace_memory=True) to record the memory used too
+        self.timer = timer if timer is not None else PhaseTimer()
+        self.tap2apConverter = TAP2APConverter(
+            tap_fname, config_fname, config_dict, reader, self.timer, backend
+        )
         self.tap = self.tap2apConverter.tap
         self.ap = self.tap2apConverter.ap
-        self.ap2shaclConverter = AP2SHACLConverter(self.ap)
+        self.ap2shaclConverter = AP2SHACLConverter(self.ap, deterministic)
         self.sg = self.ap2shaclConverter.sg
 
-    def convertTAP2AP(self, namespace_fname, about_fname, shapes_fname):
-        self.tap2apConverter.convert_namespaces("TAP")
-        self.tap2apConverter.convert_namespaces("csv", namespace_fname)
-        self.tap2apConverter.ap.load_shapeInfo(shapes_fname)
-        self.tap2apConverter.ap.load_metadata(about_fname)
+    def convertTAP2AP(
+        self, namespace_fname, about_fname, shapes_fname, namespaces=None
+    ):
+        """Convert the TAP and its csv files to AP.
+
+        Each of the files may instead be given as csv text, a file object or an iterable of row dicts, as may the TAP, so that a profile can be converted without files. If namespaces (a dict of prefix: URI pairs) is given it is used instead of reading the TAP config and namespace_fname.
+        """
+        self.load_profile(namespace_fname, about_fname, shapes_fname, namespaces)
         self.tap2apConverter.convert_TAP_AP()
         return self.tap2apConverter.ap
 
+    def load_profile(self, namespace_fname, about_fname, shapes_fname, namespaces=None):
+        """Load the namespaces, metadata and shape info of the AP as for convertTAP2AP, but not the statement templates of the TAP, ready for write_pipeline."""
+        ap = self.tap2apConverter.ap
+        with self.timer.phase("namespace conversion") as phase:
+            if namespaces is None:
+                self.tap2apConverter.convert_namespaces("TAP")
+                self.tap2apConverter.convert_namespaces("csv", namespace_fname)
+            else:
+                for prefix in namespaces:
+                    ap.add_namespace(prefix, namespaces[prefix])
+            phase.rows = len(ap.namespaces)
+        with self.timer.phase("shapeInfo load") as phase:
+            ap.load_shapeInfo(shapes_fname, self.tap2apConverter.tokenizer)
+            phase.rows = len(ap.shapeInfo)
+        with self.timer.phase("metadata load") as phase:
+            ap.load_metadata(about_fname)
+            phase.rows = len(ap.metadata)
+        return ap
+
     def convertAP2SHACL(self):
-        return self.ap2shaclConverter.convert_AP_SHACL()
+        with self.timer.phase("AP to SHACL") as phase:
+            result = self.ap2shaclConverter.convert_AP_SHACL()
+            phase.triples = len(self.sg)
+        return result
 
     def dump_shacl(self, fname=None):
-        self.ap2shaclConverter.dump_shacl(fname)
+        with self.timer.phase("output") as phase:
+            self.ap2shaclConverter.dump_shacl(fname)
+            phase.triples = len(self.sg)
+
+    def stream_shacl(self, fname=None):
+        """Convert the AP to SHACL and write it shape by shape, instead of convertAP2SHACL then dump_shacl."""
+        with self.timer.phase("AP to SHACL output") as phase:
+            phase.triples = self.ap2shaclConverter.stream_shacl(fname)
+
+    def dump_ntriples(self, fname=None):
+        """Convert the AP to SHACL and write it as N-Triples, without building the SHACL graph."""
+        with self.timer.phase("AP to SHACL output") as phase:
+            phase.triples = self.ap2shaclConverter.dump_ntriples(fname)
+
+    def dump_nquads(self, fname=None, graph=None):
+        """Convert the AP to SHACL and write it as N-Quads, without building the SHACL graph."""
+        with self.timer.phase("AP to SHACL output") as phase:
+            phase.triples = self.ap2shaclConverter.dump_nquads(fname, graph)
+
+    def dump_output(self, fname=None, format="turtle", stream=False, graph=None):
+        """Convert the AP to SHACL and write it in format turtle, nt or nquads."""
+        if format == "nt":
+            self.dump_ntriples(fname)
+        elif format == "nquads":
+            self.dump_nquads(fname, graph)
+        elif format != "turtle":
+            msg = "Output format " + format + " unknown."
+            raise ValueError(msg)
+        elif stream:
+            self.stream_shacl(fname)
+        else:
+            self.convertAP2SHACL()
+            self.dump_shacl(fname)
+
+    def write_output(self, f, format="turtle", stream=False, graph=None):
+        """Convert the AP to SHACL and write it in format turtle, nt or nquads to file object f, which may be text or binary (utf-8)."""
+        write = text_writer(f)
+        write("# SHACL generated by python AP to shacl converter\n")
+        if format not in ["turtle", "nt", "nquads"]:
+            msg = "Output format " + format + " unknown."
+            raise ValueError(msg)
+        if (format == "turtle") and not stream:
+            self.convertAP2SHACL()
+            with self.timer.phase("output") as phase:
+                write(self.sg.serialize(format="turtle"))
+                phase.triples = len(self.sg)
+            return
+        with self.timer.phase("AP to SHACL output") as phase:
+            if format == "nt":
+                phase.triples = self.ap2shaclConverter.write_ntriples(f)
+            elif format == "nquads":
+                phase.triples = self.ap2shaclConverter.write_nquads(f, graph)
+            else:
+                phase.triples = self.ap2shaclConverter.write_shacl(f)
 
     def dump_ap(self):
         self.tap2apConverter.ap.dump()
+
+    def write_pipeline(self, f, format="turtle", graph=None):
+        """Convert the TAP rows to SHACL and write it in format turtle, nt or nquads to file object f, after load_profile rather than convertTAP2AP.
+
+        Rows are made into statement templates, the templates of a shape into triples and the triples written, one shape at a time, so that only the largest shape (and with the dctap reader, the TAP as read by dctap) is in memory, not the statement templates of the whole profile. Shapes are written in the order of the TAP rather than of the shape info.
+        """
+        if format not in ["turtle", "nt", "nquads"]:
+            msg = "Output format " + format + " unknown."
+            raise ValueError(msg)
+        write = text_writer(f)
+        write("# SHACL generated by python AP to shacl converter\n")
+        with self.timer.phase("TAP to SHACL output") as phase:
+            phase.rows = 0
+
+            def statementTemplates():
+                for ps in self.tap2apConverter.iter_statementTemplates():
+                    phase.rows = phase.rows + 1
+                    yield ps
+
+            groups = self.ap2shaclConverter.iter_shape_groups(statementTemplates())
+            if format == "nt":
+                phase.triples = self.ap2shaclConverter.write_ntriples(f, groups=groups)
+            elif format == "nquads":
+                phase.triples = self.ap2shaclConverter.write_nquads(f, graph, groups)
+            else:
+                phase.triples = self.ap2shaclConverter.write_shacl(f, groups)
+
+    def dump_pipeline(self, fname=None, format="turtle", graph=None):
+        """Convert the TAP rows to SHACL as in write_pipeline, writing to file fname or standard output."""
+        if fname:
+            with open(fname, "w", encoding="utf-8") as f:
+                self.write_pipeline(f, format, graph)
+        else:
+            self.write_pipeline(sys.stdout, format, graph)
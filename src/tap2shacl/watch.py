@@ -0,0 +1,138 @@
+from ap2shacl import IncrementalWriter
+from .tap2shaclConverter import TAP2SHACLConverter
+from .batchConvert import BatchConverter
+from .outputCache import digest_inputs
+import os, time
+
+# seconds between checks of the files, and that they must be unchanged for
+# before converting, so that a save in several writes converts only once
+default_interval = 0.5
+default_debounce = 0.3
+
+
+class ProfileWatcher:
+    """Converts a profile, then converts it again whenever the content of its TAP, config, namespace, about or shapes files changes.
+
+    reader and backend are as for TAP2APConverter. There is no stream option, as the output is always made shape by shape.
+    The process stays warm between conversions: rdflib is imported, the TAP config is parsed and the namespace table built only when their files change, and the output of shapes that have not changed is reused (see IncrementalWriter). Files are polled, which needs nothing outside the standard library and works on every platform.
+    """
+
+    def __init__(
+        self,
+        profile,
+        config_fname,
+        output=None,
+        format="turtle",
+        graph=None,
+        deterministic=False,
+        interval=default_interval,
+        debounce=default_debounce,
+        reader="dctap",
+        backend="objects",
+    ):
+        self.profile = profile
+        self.config_fname = config_fname
+        self.output = output
+        self.deterministic = deterministic
+        self.interval = interval
+        self.debounce = debounce
+        self.reader = reader
+        self.backend = backend
+        self.batchConverter = None  # holds the parsed config and namespaces
+        self.writer = IncrementalWriter(format, graph)
+        self.digests = dict()  # file name: digest at the last conversion
+        self.stats = self.stat()
+
+    def fnames(self):
+        return [
+            self.profile.tap,
+            self.config_fname,
+            self.profile.namespaces,
+            self.profile.about,
+            self.profile.shapes,
+        ]
+
+    def stat(self):
+        """Return the modification time and size of each file, None if it is missing."""
+        stats = []
+        for fname in self.fnames():
+            try:
+                s = os.stat(fname)
+                stats.append((s.st_mtime_ns, s.st_size))
+            except OSError:
+                stats.append(None)
+        return stats
+
+    def wait_for_change(self, timeout=None):
+        """Wait until a file changes and then stays unchanged for the debounce time; return False if timeout seconds pass first."""
+        start = time.monotonic()
+        while self.stat() == self.stats:
+            if (timeout is not None) and (time.monotonic() - start > timeout):
+                return False
+            time.sleep(self.interval)
+        stats = self.stat()
+        while True:
+            time.sleep(self.debounce)
+            new_stats = self.stat()
+            if new_stats == stats:
+                break
+            stats = new_stats
+        self.stats = stats
+        return True
+
+    def convert(self):
+        """Convert the profile if the content of any file has changed since the last conversion.
+
+        Return list of the ids of the shapes regenerated, or None if nothing changed.
+        """
+        digests = dict()
+        for fname in self.fnames():
+            digests[fname] = digest_inputs([fname])
+        if digests == self.digests:
+            return None
+        config_changed = digests[self.config_fname] != self.digests.get(
+            self.config_fname
+        )
+        namespaces_changed = digests[self.profile.namespaces] != self.digests.get(
+            self.profile.namespaces
+        )
+        if config_changed or (self.batchConverter is None):
+            self.batchConverter = BatchConverter(self.config_fname)
+        elif namespaces_changed:
+            self.batchConverter.namespace_tables.clear()
+        c = TAP2SHACLConverter(
+            self.profile.tap,
+            self.config_fname,
+            self.batchConverter.config_dict,
+            self.deterministic,
+            self.reader,
+            backend=self.backend,
+        )
+        c.convertTAP2AP(
+            self.profile.namespaces,
+            self.profile.about,
+            self.profile.shapes,
+            self.batchConverter.namespace_table(self.profile.namespaces),
+        )
+        regenerated = self.writer.update(c.ap2shaclConverter)
+        self.writer.dump(self.output)
+        self.digests = digests
+        return regenerated
+
+    def run(self, report=print):
+        """Convert now and after every change, until interrupted; errors are reported and watching carries on."""
+        while True:
+            start = time.monotonic()
+            try:
+                regenerated = self.convert()
+                if regenerated is not None:
+                    msg = "%s -> %s: %d shapes regenerated in %.2f s" % (
+                        self.profile.tap,
+                        self.output or "stdout",
+                        len(regenerated),
+                        time.monotonic() - start,
+                    )
+                    report(msg)
+            except Exception as e:
+                report("%s failed: %s: %s" % (self.profile.tap, type(e).__name__, e))
+            self.wait_for_change()
@@ -83,7 +83,7 @@ def test_add_shapeInfo(test_AP):
     shapeInfo.id = "testShape"
     shapeInfo.label = "test shape"
     shapeInfo.comment = "just a shape for tests"
-    shapeInfo.target = {"objectsof": ["dc:author"]}
+    shapeInfo.targets = {"objectsof": ["dc:author"]}
     shapeInfo.closed = True
     shapeInfo.mandatory = False
     shapeInfo.severity = "Warning"
@@ -97,6 +97,50 @@ def test_add_shapeInfo(test_AP):
     assert ap.shapeInfo["testShape"].ignoreProps == ["p1", "p2"]
 
 
+def test_add_statementTemplate(test_AP):
+    ap = test_AP
+    ps1 = StatementTemplate()
+    ps1.add_shape("BookShape")
+    ps1.add_property("dct:title")
+    ps1.add_label("en", "Title")
+    ps2 = StatementTemplate()
+    ps2.add_shape("BookShape")
+    ps2.add_property("dct:title")
+    ps2.add_label("en", "Title")
+    ps3 = StatementTemplate()
+    ps3.add_shape("BookShape")
+    ps3.add_property("dct:creator")
+    ap.add_statementTemplate(ps1)
+    ap.add_statementTemplate(ps1)
+    ap.add_statementTemplate(ps2)
+    assert ap.statementTemplates == [ps1]
+    ap.add_statementTemplate(ps3)
+    assert ap.statementTemplates == [ps1, ps3]
+    with pytest.raises(TypeError) as e:
+        ap.add_statementTemplate("dct:title")
+    assert str(e.value) == "Statement must be of StatementTemplate type."
+    # list changed directly is re-indexed
+    ap.statementTemplates.remove(ps3)
+    ap.add_statementTemplate(ps3)
+    assert ap.statementTemplates == [ps1, ps3]
+    # so is one with the same length but a different last template
+    ps4 = StatementTemplate()
+    ps4.add_shape("BookShape")
+    ps4.add_property("dct:date")
+    ap.statementTemplates.pop()
+    ap.statementTemplates.append(ps4)
+    ap.add_statementTemplate(ps3)
+    assert ap.statementTemplates == [ps1, ps4, ps3]
+    ap.add_statementTemplate(ps4)
+    assert ap.statementTemplates == [ps1, ps4, ps3]
+    # and a new list of the same length
+    ap.statementTemplates = [ps1, ps2, ps3]
+    ap.add_statementTemplate(ps4)
+    assert ap.statementTemplates == [ps1, ps2, ps3, ps4]
+    ap.statementTemplates.clear()
+    assert ap.statementTemplates == []
+
+
 def test_load_shapeInfo(test_AP):
     ap = test_AP
     ap.load_shapeInfo(shapeInfo_fname)
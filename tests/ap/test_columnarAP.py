@@ -0,0 +1,123 @@
+import pytest
+from ap import AP, ColumnarAP, ColumnarStatementTemplates, StatementTemplate
+from ap.columnarAP import SymbolTable, TemplateSelection
+
+
+@pytest.fixture(scope="module")
+def test_statementTemplates():
+    return [
+        StatementTemplate(
+            shapes=["BookShape"],
+            properties=["dct:title"],
+            labels={"en": "Title", "fr": "Titre"},
+            mandatory=True,
+            repeatable=False,
+            valueNodeTypes=["literal"],
+            valueDataTypes=["xsd:string"],
+            notes={"en": "The title of the book."},
+        ),
+        StatementTemplate(
+            shapes=["BookShape"],
+            properties=["dct:creator"],
+            valueNodeTypes=["IRI", "BNode"],
+            valueShapes=["AuthorShape"],
+            severity="Warning",
+        ),
+        StatementTemplate(
+            shapes=["AuthorShape"],
+            properties=["foaf:name"],
+            valueDataTypes=["xsd:string"],
+            valueConstraints=["a", "b"],
+            valueConstraintType="picklist",
+            message={"en": "Not a name."},
+            propertyDescriptions={"en": "The name."},
+        ),
+        StatementTemplate(properties=["dct:date"], valueDataTypes=["xsd:date"]),
+    ]
+
+
+def test_symbolTable():
+    symbols = SymbolTable()
+    assert symbols.intern("a") == 0
+    assert symbols.intern("b") == 1
+    assert symbols.intern("a") == 0
+    assert len(symbols) == 2
+    assert symbols[1] == "b"
+    assert symbols.id("b") == 1
+    assert symbols.id("c") is None
+
+
+def test_columnarStatementTemplates(test_statementTemplates):
+    sts = ColumnarStatementTemplates(test_statementTemplates)
+    assert len(sts) == 4
+    assert sts == test_statementTemplates
+    assert list(sts) == test_statementTemplates
+    assert sts[0] == test_statementTemplates[0]
+    assert sts[-1] == test_statementTemplates[-1]
+    assert sts[1:3] == test_statementTemplates[1:3]
+    with pytest.raises(IndexError):
+        sts[4]
+    # each string is held once
+    assert len(sts.symbols) == len(set(sts.symbols.strings))
+    assert sts.values["valueDataTypes"].count(sts.symbols.id("xsd:string")) == 2
+    # templates read are copies
+    ps = sts[0]
+    ps.add_property("dct:alternative")
+    assert sts[0] == test_statementTemplates[0]
+
+
+def test_indexes_with(test_statementTemplates):
+    sts = ColumnarStatementTemplates(test_statementTemplates)
+    assert sts.indexes_with("valueDataTypes", "xsd:string") == [0, 2]
+    assert sts.indexes_with("valueNodeTypes", "BNode") == [1]
+    assert sts.indexes_with("shapes", "AuthorShape") == [2]
+    assert sts.indexes_with("valueShapes", "AuthorShape") == [1]
+    assert sts.indexes_with("valueDataTypes", "xsd:integer") == []
+    assert sts.indexes_with("severity", "Warning") == [1]
+    assert sts.indexes_with("valueConstraintType", "") == [0, 1, 3]
+    assert sts.indexes_with("mandatory", True) == [0]
+    assert sts.indexes_with("repeatable", True) == [1, 2, 3]
+    with pytest.raises(ValueError):
+        sts.indexes_with("labels", "Title")
+    selection = sts.select([3, 0])
+    assert type(selection) == TemplateSelection
+    assert len(selection) == 2
+    assert selection == [test_statementTemplates[3], test_statementTemplates[0]]
+    assert selection[1] == test_statementTemplates[0]
+
+
+def test_columnarAP(test_statementTemplates):
+    ap = AP()
+    columnar_ap = ColumnarAP()
+    assert columnar_ap.statementTemplates == []
+    for ps in test_statementTemplates + test_statementTemplates:
+        ap.add_statementTemplate(ps)
+        columnar_ap.add_statementTemplate(ps)
+    assert len(columnar_ap.statementTemplates) == 4
+    assert columnar_ap.statementTemplates == ap.statementTemplates
+    with pytest.raises(TypeError):
+        columnar_ap.add_statementTemplate("dct:title")
+    for field, value in [
+        ("valueDataTypes", "xsd:string"),
+        ("properties", "dct:date"),
+        ("severity", "Warning"),
+        ("mandatory", False),
+    ]:
+        expected = ap.statementTemplates_with(field, value)
+        assert expected
+        assert columnar_ap.statementTemplates_with(field, value) == expected
+    groups = columnar_ap.statementTemplate_groups()
+    assert list(groups.keys()) == list(ap.statementTemplate_groups().keys())
+    assert list(groups.keys()) == ["BookShape", "AuthorShape", ""]
+    for shape, group in ap.statementTemplate_groups().items():
+        assert groups[shape] == group
+    # statement templates with different keys but the same hash are both kept
+    hashes = columnar_ap._statementTemplateHashes
+    hashes[hash(test_statementTemplates[1].key())] = [0, 1]
+    columnar_ap.add_statementTemplate(test_statementTemplates[1])
+    assert len(columnar_ap.statementTemplates) == 4
+    ps = StatementTemplate(properties=["dct:subject"])
+    hashes[hash(ps.key())] = 0
+    columnar_ap.add_statementTemplate(ps)
+    assert len(columnar_ap.statementTemplates) == 5
+    assert hashes[hash(ps.key())] == [0, 4]
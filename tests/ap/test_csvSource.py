@@ -0,0 +1,67 @@
+import pytest
+import io
+from ap.csvSource import (
+    is_csv_text,
+    open_csv,
+    read_csv_rows,
+    read_csv_text,
+    rows2csv,
+)
+
+csv_text = "prefix,URI\nex,http://example.org/\n,http://example.org/default#\n"
+rows = [
+    {"prefix": "ex", "URI": "http://example.org/"},
+    {"prefix": "", "URI": "http://example.org/default#"},
+]
+
+
+@pytest.fixture(scope="module")
+def csv_file(tmp_path_factory):
+    path = tmp_path_factory.mktemp("csv") / "namespaces.csv"
+    path.write_text(csv_text)
+    return path
+
+
+def test_is_csv_text(tmp_path):
+    assert is_csv_text(csv_text)
+    assert not is_csv_text("namespaces.csv")
+    assert not is_csv_text(io.StringIO(csv_text))
+    # single line csv text, with no line break
+    assert is_csv_text("prefix,URI")
+    assert list(read_csv_rows("prefix,URI")) == []
+    # but an existing file name with a comma is a file name
+    path = tmp_path / "name,with comma.csv"
+    path.write_text(csv_text)
+    assert not is_csv_text(str(path))
+    assert list(read_csv_rows(str(path))) == rows
+
+
+def test_read_csv_rows(csv_file):
+    assert list(read_csv_rows(str(csv_file))) == rows
+    assert list(read_csv_rows(csv_file)) == rows  # a Path
+    assert list(read_csv_rows(csv_text)) == rows
+    assert list(read_csv_rows(csv_text.encode("utf-8"))) == rows
+    assert list(read_csv_rows(io.StringIO(csv_text))) == rows
+    assert list(read_csv_rows(io.BytesIO(csv_text.encode("utf-8")))) == rows
+    assert list(read_csv_rows(rows)) == rows
+    assert list(read_csv_rows(iter(rows))) == rows
+
+
+def test_read_csv_rows_fieldnames():
+    about = "title,Book\nlang,en\n"
+    rows = list(read_csv_rows(about, fieldnames=["key", "value"]))
+    assert rows[0] == {"key": "title", "value": "Book"}
+    assert len(rows) == 2
+
+
+def test_open_csv_leaves_file_open():
+    f = io.BytesIO(csv_text.encode("utf-8"))
+    with open_csv(f) as csv_file:
+        assert csv_file.read() == csv_text
+    assert not f.closed
+
+
+def test_rows2csv():
+    assert rows2csv(rows) == csv_text
+    assert read_csv_text(rows) == csv_text
+    assert rows2csv([{"a": "1"}, {"b": "2"}]) == "a,b\n1,\n,2\n"
@@ -0,0 +1,76 @@
+import pytest
+import pickle
+from copy import copy, deepcopy
+from ap import StatementTemplate, ShapeInfo
+from ap.emptyCollections import empty_set, empty_dict, own_collection
+
+
+def test_empty_set():
+    assert empty_set == []
+    assert len(empty_set) == 0
+    assert "a" not in empty_set
+    with pytest.raises(TypeError) as e:
+        empty_set.append("a")
+    assert str(e.value) == "Shared empty EmptyOrderedSet cannot be changed."
+    for method in [empty_set.add, empty_set.extend]:
+        with pytest.raises(TypeError):
+            method("a")
+    with pytest.raises(ValueError):
+        empty_set.remove("")  # as for an empty list
+    assert empty_set == []
+
+
+def test_empty_dict():
+    assert empty_dict == {}
+    with pytest.raises(TypeError) as e:
+        empty_dict["en"] = "a"
+    assert str(e.value) == "Shared empty EmptyDict cannot be changed."
+    with pytest.raises(TypeError):
+        empty_dict.update({"en": "a"})
+    assert empty_dict == {}
+
+
+def test_copies():
+    for c in [empty_set, empty_dict]:
+        assert copy(c) is c
+        assert deepcopy(c) is c
+        assert pickle.loads(pickle.dumps(c)) is c
+
+
+def test_slotted_objects():
+    ps1 = StatementTemplate()
+    ps2 = StatementTemplate()
+    sh = ShapeInfo()
+    for obj in [ps1, ps2, sh]:
+        assert not hasattr(obj, "__dict__")
+    assert ps1.labels is ps2.labels is sh.label is empty_dict
+    assert ps1.properties is ps2.properties is sh.ignoreProps is empty_set
+    ps1.add_label("en", "Title")
+    ps1.add_property("dct:title")
+    assert ps1.labels == {"en": "Title"}
+    assert ps1.properties == ["dct:title"]
+    assert ps2.labels == {}
+    assert ps2.properties == []
+    assert empty_dict == {}
+    assert empty_set == []
+    with pytest.raises(AttributeError):
+        ps1.notAField = "x"
+    copy_ps = pickle.loads(pickle.dumps(ps1))
+    assert copy_ps == ps1
+    assert copy_ps.notes is empty_dict
+
+
+def test_interned_languages():
+    lang = "".join(["e", "n"])  # a new str object
+    ps = StatementTemplate()
+    ps.add_note(lang, "A note.")
+    ps.add_label("en", "Label")
+    assert list(ps.notes)[0] is list(ps.labels)[0]
+
+
+def test_own_collection():
+    ps = StatementTemplate()
+    notes = own_collection(ps, "notes")
+    assert notes is not empty_dict
+    assert ps.notes is notes
+    assert own_collection(ps, "notes") is notes
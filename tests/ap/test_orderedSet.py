@@ -0,0 +1,98 @@
+import pytest
+import pickle
+from copy import deepcopy
+from ap import OrderedSet, StatementTemplate
+
+
+@pytest.fixture(scope="module")
+def test_OrderedSet():
+    s = OrderedSet(["a", "b"])
+    return s
+
+
+def test_init(test_OrderedSet):
+    s = test_OrderedSet
+    assert s == ["a", "b"]
+    assert isinstance(s, list)
+    assert "a" in s
+    assert "c" not in s
+    assert ["a"] not in s
+    assert OrderedSet() == []
+
+
+def test_add(test_OrderedSet):
+    s = test_OrderedSet
+    s.add("c")
+    s.add("a")
+    assert s == ["a", "b", "c"]
+    assert s[0] == "a"
+    assert s[-1] == "c"
+    assert len(s) == 3
+
+
+def test_list_methods(test_OrderedSet):
+    s = test_OrderedSet
+    s.remove("b")
+    assert "b" not in s
+    s.append("d")
+    s.extend(["e", "f"])
+    s += ["g"]
+    s.insert(0, "z")
+    assert s == ["z", "a", "c", "d", "e", "f", "g"]
+    assert all(item in s for item in s)
+    assert s.pop() == "g"
+    assert "g" not in s
+    s[0] = "y"
+    assert "z" not in s
+    assert "y" in s
+    s[1:3] = ["h"]
+    assert s == ["y", "h", "d", "e", "f"]
+    assert "a" not in s
+    assert "c" not in s
+    del s[0]
+    del s[-2:]
+    assert s == ["h", "d"]
+    assert "y" not in s
+    assert "f" not in s
+    with pytest.raises(ValueError):
+        s.remove("")
+    s.append("h")
+    s.remove("h")
+    assert "h" in s
+    s.clear()
+    assert s == []
+    assert "d" not in s
+
+
+def test_copies():
+    s = OrderedSet(["a", "b"])
+    for copy_s in [deepcopy(s), pickle.loads(pickle.dumps(s))]:
+        assert type(copy_s) is OrderedSet
+        assert copy_s == s
+        copy_s.remove("a")
+        assert "a" not in copy_s
+        assert "a" in s
+
+
+def test_StatementTemplate_fields():
+    ps = StatementTemplate(properties=["dct:title"])
+    assert type(ps.properties) is OrderedSet
+    assert isinstance(ps.valueConstraints, OrderedSet)
+    for i in range(1000):
+        ps.add_valueConstraint(str(i))
+        ps.add_valueConstraint(str(i))
+    assert len(ps.valueConstraints) == 1000
+    assert ps.valueConstraints[0:2] == ["0", "1"]
+
+
+def test_index():
+    s = OrderedSet(str(i) for i in range(5))
+    assert s._counts is None  # short lists are searched
+    s.extend(str(i) for i in range(5, 20))
+    assert s._counts is not None
+    assert all(str(i) in s for i in range(20))
+    del s[10:]
+    assert "9" in s
+    assert "10" not in s
+    s.add("9")
+    assert len(s) == 10
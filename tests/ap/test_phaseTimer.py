@@ -0,0 +1,80 @@
+import pytest
+import json, tracemalloc
+from ap import Phase, PhaseTimer
+
+
+def test_phase():
+    timer = PhaseTimer()
+    with timer.phase("read") as phase:
+        sum(range(10000))
+        phase.rows = 3
+    with timer.phase("write") as phase:
+        phase.triples = 12
+    assert [phase.name for phase in timer.phases] == ["read", "write"]
+    assert timer.phases[0].rows == 3
+    assert timer.phases[0].triples is None
+    assert timer.phases[1].triples == 12
+    for phase in timer.phases:
+        assert phase.wall >= 0
+        assert phase.cpu >= 0
+    total = timer.total()
+    assert total.wall == timer.phases[0].wall + timer.phases[1].wall
+    assert total.cpu == timer.phases[0].cpu + timer.phases[1].cpu
+
+
+def test_phase_error():
+    timer = PhaseTimer()
+    with pytest.raises(ValueError):
+        with timer.phase("fails"):
+            raise ValueError("oops")
+    assert timer.phases[0].name == "fails"  # still recorded
+
+
+def test_reports():
+    timer = PhaseTimer()
+    timer.phases.append(Phase("read", 1.5, 1.25, rows=10))
+    timer.phases.append(Phase("write", 0.5, 0.25, triples=40))
+    data = json.loads(timer.json())
+    assert data == timer.as_dict()
+    assert data["phases"][1] == {
+        "name": "write",
+        "wall": 0.5,
+        "cpu": 0.25,
+        "rows": None,
+        "triples": 40,
+    }
+    assert data["total"]["wall"] == 2.0
+    lines = timer.table().splitlines()
+    assert len(lines) == 4
+    assert lines[1].split() == ["read", "1.5000", "1.2500", "10"]
+    assert lines[2].split() == ["write", "0.5000", "0.2500", "40"]
+    assert lines[3].split() == ["total", "2.0000", "1.5000"]
+
+
+def test_trace_memory():
+    was_tracing = tracemalloc.is_tracing()
+    try:
+        timer = PhaseTimer(trace_memory=True, top=3)
+        assert tracemalloc.is_tracing()
+        with timer.phase("allocate") as phase:
+            data = [str(i) * 10 for i in range(20000)]
+        with timer.phase("free"):
+            del data
+        allocate, free = timer.phases
+        assert allocate.peak >= allocate.memory > free.memory
+        assert len(allocate.allocations) <= 3
+        biggest = allocate.allocations[0]
+        assert "test_phaseTimer.py" in biggest["site"]
+        assert biggest["size"] > 20000 * 10 and biggest["count"] >= 20000
+        assert free.allocations[0]["size"] < 0
+        assert timer.total().peak == max(allocate.peak, free.peak)
+        assert timer.as_dict()["phases"][0]["allocations"] == allocate.allocations
+        lines = timer.table().splitlines()
+        assert lines[0].split()[-4:] == ["memory", "MB", "peak", "MB"]
+        assert len(lines[1].split()) == 5  # no rows or triples
+        report = timer.memory_report()
+        assert report.startswith(timer.table())
+        assert biggest["site"] in report
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
@@ -1,4 +1,5 @@
 import pytest
+from copy import deepcopy
 from ap import AP, StatementTemplate
 
 
@@ -273,3 +274,22 @@ def test_result(test_PS):
     assert ps.message["en"] == "Something is wrong."
     assert ps.message["es"] == "Algo es incorrecto."
     # which doesn't make much sense, but it is what we entered
+
+
+def test_key(test_PS):
+    ps = test_PS
+    copy_ps = deepcopy(ps)
+    assert copy_ps == ps
+    assert copy_ps.key() == ps.key()
+    assert hash(ps.key())
+    copy_ps.add_valueClass("sdo:Thing")
+    assert copy_ps != ps
+    assert copy_ps.key() != ps.key()
+    other_ps = StatementTemplate()
+    other_ps.add_note("es", "Uno.")
+    other_ps.add_note("en", "One.")
+    same_ps = StatementTemplate()
+    same_ps.add_note("en", "One.")
+    same_ps.add_note("es", "Uno.")
+    assert other_ps == same_ps
+    assert other_ps.key() == same_ps.key()
@@ -1,4 +1,5 @@
 import pytest
+from copy import deepcopy
 from ap import ShapeInfo, read_shapeInfoDict
 from ap.shapeInfo import ShapeInfo
 
@@ -199,3 +200,18 @@ def test_read_shapeInfoDict():
         ),
     }
     assert shapeDict == expectedShapeDict
+
+
+def test_key():
+    sh1 = ShapeInfo()
+    sh1.set_id("BookShape")
+    sh1.add_label("en", "Book")
+    sh1.append_target("sdo:Book", "class")
+    sh2 = deepcopy(sh1)
+    assert sh1.key() == sh2.key()
+    assert hash(sh1.key()) == hash(sh2.key())
+    sh2.append_target("sdo:Periodical", "class")
+    assert sh1.key() != sh2.key()
+    sh2 = deepcopy(sh1)
+    sh2.set_closed(True)
+    assert sh1.key() != sh2.key()
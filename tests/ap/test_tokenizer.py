@@ -0,0 +1,48 @@
+import pytest
+import re
+from ap import Tokenizer, default_tokenizer, tokenizer_from_config
+
+cells = [
+    "dct:title",
+    "dct:title, dct:alternative",
+    "a; b;c,d e\nf \ng",
+    "a,, b",
+    "",
+    " leading and trailing ",
+]
+
+
+def test_split():
+    for cell in cells:
+        assert default_tokenizer.split(cell) == re.split(", |; |,|;| \n| |\n", cell)
+    assert default_tokenizer.split("dct:title, dct:alternative") == [
+        "dct:title",
+        "dct:alternative",
+    ]
+
+
+def test_iter_split():
+    for cell in cells:
+        assert list(default_tokenizer.iter_split(cell)) == default_tokenizer.split(cell)
+
+
+def test_separators():
+    t = Tokenizer(["|", " | "])
+    assert t.split("a | b|c, d") == ["a", "b", "c, d"]
+    t = Tokenizer(["."])
+    assert t.split("a.b") == ["a", "b"]
+    with pytest.raises(TypeError) as e:
+        Tokenizer([])
+    assert str(e.value) == "Separators must be a non-empty list of strings."
+    with pytest.raises(TypeError) as e:
+        Tokenizer([",", ""])
+    assert str(e.value) == "Separators must be a non-empty list of strings."
+    with pytest.raises(TypeError) as e:
+        Tokenizer(",")
+    assert str(e.value) == "Separators must be a non-empty list of strings."
+
+
+def test_tokenizer_from_config():
+    assert tokenizer_from_config({}) is default_tokenizer
+    t = tokenizer_from_config({"cell_separators": ["|"]})
+    assert t.split("a|b c") == ["a", "b c"]
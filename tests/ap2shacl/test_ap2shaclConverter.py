@@ -2,14 +2,18 @@ import pytest
 from ap2shacl import (
     AP2SHACLConverter,
     make_property_shape_name,
+    template_hash,
     list2RDFList,
     AP,
     StatementTemplate,
     ShapeInfo,
     str2URIRef,
+    NamespaceResolver,
     convert_nodeKind,
 )
 from rdflib import Graph, URIRef, Literal, BNode, Namespace, RDF, RDFS, SH
+from rdflib.compare import isomorphic
+import io
 
 schema = Namespace("https://schema.org/")
 SDO = Namespace("https://schema.org/")  # "httpS"
@@ -499,6 +503,27 @@ def test_make_property_shape_name():
     ps.add_label("en", "Colour Property")
     name = make_property_shape_name(ps)
     assert name == "_ColourProperty"
+    assert make_property_shape_name(ps, deterministic=True) == "_ColourProperty"
+
+
+def test_make_property_shape_name_deterministic():
+    ps1 = StatementTemplate()
+    ps1.add_shape("#Person")
+    ps1.add_property("schema:name")
+    ps2 = StatementTemplate()
+    ps2.add_shape("#Person")
+    ps2.add_property("schema:name")
+    name = make_property_shape_name(ps1, deterministic=True)
+    assert name == make_property_shape_name(ps2, deterministic=True)
+    assert name == "person" + template_hash(ps1)
+    assert len(template_hash(ps1)) == 16
+    assert make_property_shape_name(ps1) != make_property_shape_name(ps2)
+    ps2.add_valueNodeType("literal")
+    assert name != make_property_shape_name(ps2, deterministic=True)
+    ps2 = StatementTemplate()
+    ps2.add_shape("#Person")
+    ps2.add_property("schema:givenName")
+    assert name != make_property_shape_name(ps2, deterministic=True)
 
 
 def test_ap2shaclInit(simple_ap):
@@ -533,6 +558,86 @@ def test_convert_AP_SHACL(simple_ap):
         assert s in ttl
 
 
+def test_shape_groups(simple_ap):
+    converter = AP2SHACLConverter(simple_ap)
+    groups = converter.shape_groups()
+    assert list(groups.keys()) == ["#Person", "#Address"]
+    assert len(groups["#Person"]) + len(groups["#Address"]) == 11
+    for shape in groups:
+        for ps in groups[shape]:
+            assert ps.shapes[0] == shape
+
+
+def test_write_shacl(simple_ap):
+    converter = AP2SHACLConverter(simple_ap, deterministic=True)
+    converter.convert_AP_SHACL()
+    stream_converter = AP2SHACLConverter(simple_ap, deterministic=True)
+    f = io.StringIO()
+    stream_converter.write_shacl(f)
+    assert len(stream_converter.sg) == 0  # nothing added to the SHACL graph
+    ttl = f.getvalue()
+    assert ttl.count("@prefix sh: <http://www.w3.org/ns/shacl#> .") == 1
+    assert ttl.count("@base <http://example.org/shapes#> .") == 1
+    # compare parsed Turtle, as both are written relative to @base
+    g = Graph().parse(data=ttl, format="turtle")
+    expected_g = Graph().parse(data=converter.sg.serialize(format="turtle"))
+    assert isomorphic(g, expected_g)
+    f = io.BytesIO()
+    stream_converter.write_shacl(f)
+    assert f.getvalue().decode("utf-8") == ttl
+
+
+def test_write_ntriples(simple_ap):
+    converter = AP2SHACLConverter(simple_ap, deterministic=True)
+    converter.convert_AP_SHACL()
+    nt_converter = AP2SHACLConverter(simple_ap, deterministic=True)
+    f = io.StringIO()
+    count = nt_converter.write_ntriples(f)
+    assert len(nt_converter.sg) == 0  # nothing added to the SHACL graph
+    assert count == len(f.getvalue().splitlines()) == len(converter.sg)
+    g = Graph().parse(data=f.getvalue(), format="nt")
+    assert isomorphic(g, converter.sg)
+
+
+def test_iter_shape_groups(simple_ap):
+    converter = AP2SHACLConverter(simple_ap, deterministic=True)
+    converter.convert_AP_SHACL()
+    person = [ps for ps in simple_ap.statementTemplates if ps.shapes[0] == "#Person"]
+    address = [ps for ps in simple_ap.statementTemplates if ps.shapes[0] != "#Person"]
+    # Person's templates split by Address's, with a repeat in the first run
+    templates = person[:2] + [person[1]] + address + person[2:]
+    stream_converter = AP2SHACLConverter(simple_ap, deterministic=True)
+    groups = list(stream_converter.iter_shape_groups(iter(templates)))
+    assert groups == [
+        ("#Person", person[:2]),
+        ("#Address", address),
+        (None, person[2:]),
+    ]
+    f = io.StringIO()
+    stream_converter.write_shacl(f, iter(groups))
+    g = Graph().parse(data=f.getvalue(), format="turtle")
+    expected_g = Graph().parse(data=converter.sg.serialize(format="turtle"))
+    assert isomorphic(g, expected_g)
+    f = io.StringIO()
+    stream_converter.write_ntriples(f, groups=iter(groups))
+    assert isomorphic(Graph().parse(data=f.getvalue(), format="nt"), converter.sg)
+    # repeats in a later run of a shape are left out, so no triple is written twice
+    templates = person[:2] + address + [person[0]] + person[1:] + address[:1]
+    groups = list(stream_converter.iter_shape_groups(iter(templates)))
+    assert groups == [
+        ("#Person", person[:2]),
+        ("#Address", address),
+        (None, person[2:]),
+    ]
+    f = io.StringIO()
+    count = stream_converter.write_ntriples(f, groups=iter(groups))
+    lines = [line for line in f.getvalue().splitlines() if line.endswith(" .")]
+    assert count == len(lines) == len(set(lines)) == len(converter.sg)
+    # shapes with no templates come last
+    groups = list(stream_converter.iter_shape_groups(iter(person)))
+    assert groups == [("#Person", person), ("#Address", [])]
+
+
 def test_str2URIRef():
     ns = {"rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#"}
     string = "rdf:label"
@@ -565,6 +670,36 @@ def test_str2URIRef():
     assert str(e.value) == "Prefix ns not in namespace list."
 
 
+def test_NamespaceResolver():
+    ap = AP()
+    ap.add_namespace("sdo", "https://schema.org/")
+    resolver = NamespaceResolver(ap, maxsize=2)
+    assert resolver.resolve("sdo:name") == SDO.name
+    assert resolver.resolve("sdo:name") is resolver.resolve("sdo:name")
+    assert resolver.resolve("name") == URIRef("http://example.org/name")
+    assert resolver._cached_resolve.cache_info().currsize == 2
+    # unchanged namespace keeps the cache
+    ap.add_namespace("sdo", "https://schema.org/")
+    assert resolver._cached_resolve.cache_info().currsize == 2
+    ap.add_namespace("sdo", "http://schema.org/")
+    assert resolver.resolve("sdo:name") == URIRef("http://schema.org/name")
+    ap.add_namespace("base", "http://example.org/shapes#")
+    assert resolver.resolve("name") == URIRef("http://example.org/shapes#name")
+    ap.namespaces = {"sdo": "https://schema.org/"}
+    assert resolver.resolve("sdo:name") == SDO.name
+    with pytest.raises(TypeError) as e:
+        resolver.resolve(42)
+    assert str(e.value) == "Value to convert should be a non-empty string."
+    with pytest.raises(ValueError) as e:
+        resolver.resolve("ns:name")
+    assert str(e.value) == "Prefix ns not in namespace list."
+    g = Graph()
+    start_node = list2RDFList(g, ["sdo:name", "sdo:email"], "anyURI", resolver)
+    g.add((URIRef("#cont"), SH_or, start_node))
+    expected_ttl = "<#cont> sh:or ( schema:name schema:email )"
+    assert expected_ttl in g.serialize(format="turtle")
+
+
 def test_convertNodeKind():
     assert convert_nodeKind(["IrI"]) == SH.IRI
     assert convert_nodeKind(["bNode"]) == SH.BlankNode
@@ -0,0 +1,95 @@
+import pytest
+import io
+from ap2shacl import (
+    AP2SHACLConverter,
+    IncrementalWriter,
+    AP,
+    StatementTemplate,
+    ShapeInfo,
+)
+from rdflib import Graph
+from rdflib.compare import isomorphic
+
+
+def make_ap(book_title_label="Title"):
+    ap = AP()
+    ap.load_namespaces("tests/ap2shacl/TestData/namespaces.csv")
+    for shape, label in [("BookShape", "Book"), ("AuthorShape", "Author")]:
+        shapeInfo = ShapeInfo()
+        shapeInfo.set_id(shape)
+        shapeInfo.add_label("en", label)
+        ap.add_shapeInfo(shape, shapeInfo)
+    for shape, prop, label in [
+        ("BookShape", "dct:title", book_title_label),
+        ("BookShape", "dct:creator", "Author"),
+        ("AuthorShape", "foaf:name", "Name"),
+    ]:
+        ps = StatementTemplate()
+        ps.add_shape(shape)
+        ps.add_property(prop)
+        ps.add_label("en", label)
+        ps.add_valueNodeType("literal")
+        ps.add_valueDataType("xsd:string")
+        ap.add_statementTemplate(ps)
+    return ap
+
+
+def full_turtle(ap):
+    converter = AP2SHACLConverter(ap, deterministic=True)
+    converter.convert_AP_SHACL()
+    return converter.sg.serialize(format="turtle")
+
+
+def incremental_turtle(writer):
+    f = io.StringIO()
+    writer.write(f)
+    return f.getvalue()
+
+
+def same_triples(ttl1, ttl2):
+    # compare parsed Turtle, as both are written relative to @base
+    return isomorphic(Graph().parse(data=ttl1), Graph().parse(data=ttl2))
+
+
+def test_update():
+    writer = IncrementalWriter()
+    ap = make_ap()
+    regenerated = writer.update(AP2SHACLConverter(ap, deterministic=True))
+    assert regenerated == ["BookShape", "AuthorShape"]
+    assert same_triples(incremental_turtle(writer), full_turtle(ap))
+    # nothing changed
+    regenerated = writer.update(AP2SHACLConverter(make_ap(), deterministic=True))
+    assert regenerated == []
+    # one property statement changed
+    ap = make_ap("Book title")
+    regenerated = writer.update(AP2SHACLConverter(ap, deterministic=True))
+    assert regenerated == ["BookShape"]
+    ttl = incremental_turtle(writer)
+    assert same_triples(ttl, full_turtle(ap))
+    assert '"Book title"@en' in ttl
+    # a property statement for a new shape
+    ps = StatementTemplate()
+    ps.add_shape("PublisherShape")
+    ps.add_property("foaf:name")
+    ap.add_statementTemplate(ps)
+    regenerated = writer.update(AP2SHACLConverter(ap, deterministic=True))
+    assert regenerated == ["PublisherShape"]
+    assert same_triples(incremental_turtle(writer), full_turtle(ap))
+    # namespaces changed, so everything is
+    ap.add_namespace("ex", "http://example.org/terms#")
+    regenerated = writer.update(AP2SHACLConverter(ap, deterministic=True))
+    assert regenerated == ["BookShape", "AuthorShape", "PublisherShape"]
+
+
+def test_update_ntriples():
+    writer = IncrementalWriter("nt")
+    writer.update(AP2SHACLConverter(make_ap(), deterministic=True))
+    ap = make_ap("Book title")
+    assert writer.update(AP2SHACLConverter(ap, deterministic=True)) == ["BookShape"]
+    converter = AP2SHACLConverter(ap, deterministic=True)
+    converter.convert_AP_SHACL()
+    nt = incremental_turtle(writer)
+    assert isomorphic(Graph().parse(data=nt, format="nt"), converter.sg)
+    with pytest.raises(ValueError) as e:
+        IncrementalWriter("rdfxml")
+    assert str(e.value) == "Output format rdfxml unknown."
@@ -0,0 +1,50 @@
+import pytest
+import io
+from ap2shacl import NTriplesWriter, term2NT
+from rdflib import Graph, Dataset, URIRef, Literal, BNode, XSD, SH, RDF
+
+
+def test_term2NT():
+    assert term2NT(URIRef("http://example.org/a")) == "<http://example.org/a>"
+    assert term2NT(BNode("b1")) == "_:b1"
+    assert term2NT(Literal("plain")) == '"plain"'
+    assert term2NT(Literal("name", lang="en-US")) == '"name"@en-US'
+    assert term2NT(Literal(1)) == '"1"^^<http://www.w3.org/2001/XMLSchema#integer>'
+    assert (
+        term2NT(Literal("True", datatype=XSD.boolean))
+        == '"true"^^<http://www.w3.org/2001/XMLSchema#boolean>'
+    )
+    assert term2NT(Literal('say "hi"\\\nbye')) == '"say \\"hi\\"\\\\\\nbye"'
+    with pytest.raises(TypeError) as e:
+        term2NT("http://example.org/a")
+    assert str(e.value) == "Cannot write 'http://example.org/a' as N-Triples."
+
+
+def test_NTriplesWriter():
+    triples = [
+        (URIRef("http://example.org/a"), RDF.type, SH.PropertyShape),
+        (URIRef("http://example.org/a"), SH.name, Literal('A\n"a"', lang="en")),
+        (URIRef("http://example.org/a"), SH["in"], BNode("list")),
+        (BNode("list"), RDF.first, Literal(2)),
+        (BNode("list"), RDF.rest, RDF.nil),
+    ]
+    f = io.StringIO()
+    writer = NTriplesWriter(f)
+    for t in triples + triples[:2]:
+        writer.add(t)
+    assert len(writer) == 5
+    assert len(f.getvalue().splitlines()) == 5
+    writer.forget()
+    writer.add(triples[0])
+    assert len(writer) == 6
+    g = Graph().parse(data=f.getvalue(), format="nt")
+    assert len(g) == 5
+    for t in triples[:2]:
+        assert t in g
+    f = io.BytesIO()
+    writer = NTriplesWriter(f, "http://example.org/shapes")
+    for t in triples:
+        writer.add(t)
+    ds = Dataset().parse(data=f.getvalue(), format="nquads")
+    g = ds.graph(URIRef("http://example.org/shapes"))
+    assert len(g) == 5
@@ -327,3 +327,43 @@ def test_convert_message(test_Converter):
 def test_convert_TAP_AP(test_Converter):
     c = test_Converter
     c.convert_TAP_AP()
+
+
+@pytest.mark.parametrize("reader", ["dctap", "fast"])
+def test_conversion_plan(reader):
+    c = TAP2APConverter(tapFileName, configFileName, reader=reader)
+    c.ap.load_shapeInfo(shapesFileName)
+    c.ap.load_metadata(aboutFileName)
+    c.ap.add_metadata("language", "fr")  # for labels; lang is for other text
+    plan = c.conversion_plan(["propertyLabel", "note", "mandatory"])
+    assert list(plan.keys()) == ["propertyLabel", "mandatory", "note"]
+    ps = StatementTemplate()
+    plan["propertyLabel"]("Titre", ps)
+    plan["note"]("In English.", ps)
+    plan["mandatory"]("TRUE", ps)
+    assert ps.labels == {"fr": "Titre"}
+    assert ps.notes == {"en": "In English."}
+    assert ps.mandatory == True
+    # elements not in the plan are ignored
+    sc = {"propertyID": "dct:title", "propertyLabel": "Titre", "severity": "Warning"}
+    ps = c.convert_statement("BookShape", sc, plan)
+    assert ps.properties == ["dct:title"]
+    assert ps.severity == ""
+    ps = c.convert_statement("BookShape", sc)  # plan for all elements
+    assert ps.severity == "Warning"
+    # the plan for a TAP covers the elements it has
+    c.convert_TAP_AP()
+    expected = TAP2APConverter(tapFileName, configFileName, reader=reader)
+    expected.ap.load_shapeInfo(shapesFileName)
+    expected.ap.load_metadata(aboutFileName)
+    expected.ap.add_metadata("language", "fr")
+    full_plan = expected.conversion_plan()
+    expected.conversion_plan = lambda elements=None: full_plan
+    expected.convert_TAP_AP()
+    keys = [ps.key() for ps in c.ap.statementTemplates]
+    assert keys == [ps.key() for ps in expected.ap.statementTemplates]
+    assert len(keys) == 7
+    notes = [ps.notes for ps in c.ap.statementTemplates if ps.notes]
+    assert notes and all(list(n.keys()) == ["en"] for n in notes)
+    labels = [ps.labels for ps in c.ap.statementTemplates]
+    assert all(list(label.keys()) == ["fr"] for label in labels)
@@ -0,0 +1,84 @@
+import pytest
+from copy import deepcopy
+from dctap import csvreader
+from dctap.config import get_config
+from ap import AP
+from tap2ap import TAP2APConverter, FastTAPReader
+
+configFileName = "dctap.yml"
+tapFileName = "tests/tap2ap/TestData/tap.csv"
+trickyTapFileName = "tests/tap2ap/TestData/trickyTAP.csv"
+namespaceFileName = "tests/tap2ap/TestData/namespaces.csv"
+aboutFileName = "tests/tap2ap/TestData/about.csv"
+shapesFileName = "tests/tap2ap/TestData/shapes.csv"
+
+
+@pytest.fixture(scope="module")
+def config_dict():
+    return get_config(nondefault_configfile_name=configFileName)
+
+
+def by_shape(statements):
+    """Return dict of shapeID: list of statement template dicts."""
+    shapes = dict()
+    for sh_id, sc in statements:
+        shapes.setdefault(sh_id, [])
+        if sc is not None:
+            shapes[sh_id].append(sc)
+    return shapes
+
+
+def dctap_by_shape(csv_text, config_dict):
+    shapes_dict = csvreader(csvfile_str=csv_text, config_dict=deepcopy(config_dict))
+    shapes = dict()
+    for shape in shapes_dict["shapes"]:
+        shapes[shape["shapeID"]] = shape.get("statement_templates", [])
+    return shapes
+
+
+@pytest.mark.parametrize("fname", [tapFileName, trickyTapFileName])
+def test_same_as_dctap(config_dict, fname):
+    with open(fname, "r") as csv_file:
+        csv_text = csv_file.read()
+    statements = FastTAPReader(config_dict).read(csv_text)
+    assert by_shape(statements) == dctap_by_shape(csv_text, config_dict)
+
+
+def test_tricky_values(config_dict):
+    with open(trickyTapFileName, "r") as csv_file:
+        shapes = by_shape(FastTAPReader(config_dict).read(csv_file.read()))
+    assert list(shapes.keys()) == ["default", "BookShape", "AuthorShape", "EmptyShape"]
+    title = shapes["default"][0]
+    assert title["propertyLabel"] == "Title"
+    assert title["mandatory"] == "true"
+    assert title["repeatable"] == "false"
+    assert title["note"] == "a note, with comma"
+    assert shapes["AuthorShape"][1]["valueConstraint"] == 18
+    assert shapes["BookShape"][1]["valueConstraint"] == ["en", "fr", "de"]
+    assert shapes["EmptyShape"] == []
+
+
+def test_fallback(config_dict):
+    reader = FastTAPReader(config_dict)
+    assert reader.read("shapeID,propertyID\n") is None  # no rows
+    assert reader.read("shapeID,label\nBookShape,Book\n") is None
+    assert reader.read('shapeID,"propertyID"\nBookShape,dct:title\n') is None
+
+
+def test_converter(config_dict):
+    converters = dict()
+    for reader in ["dctap", "fast"]:
+        c = TAP2APConverter(tapFileName, configFileName, config_dict, reader)
+        assert c.tap["reader"] == reader
+        c.convert_namespaces("csv", namespaceFileName)
+        c.ap.load_metadata(aboutFileName)
+        c.ap.load_shapeInfo(shapesFileName)
+        c.convert_TAP_AP()
+        converters[reader] = c
+    assert converters["fast"].tap["warnings_dict"] == {}
+    assert converters["fast"].ap == converters["dctap"].ap
+    with pytest.raises(ValueError):
+        TAP2APConverter(tapFileName, configFileName, config_dict, "slow")
+    csv_text = 'shapeID,"propertyID"\nBookShape,dct:title\n'
+    c = TAP2APConverter(csv_text, configFileName, None, "fast")
+    assert c.tap["reader"] == "dctap"  # fell back
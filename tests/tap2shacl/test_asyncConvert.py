@@ -0,0 +1,105 @@
+import pytest
+import asyncio, shutil, threading, time
+from tap2shacl.asyncConvert import AsyncConverter, convert_tap_async
+from tap2shacl.batchConvert import Profile
+from rdflib import Graph
+
+configFileName = "dctap.yml"
+profile_dir = "examples/SimpleBook/"
+
+
+def simpleBook(output=None):
+    return Profile(
+        profile_dir + "tap.csv",
+        profile_dir + "namespaces.csv",
+        profile_dir + "about.csv",
+        profile_dir + "shapes.csv",
+        output,
+    )
+
+
+class SlowConverter(AsyncConverter):
+    """Records how many conversions run at once, each taking a while."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.running = 0
+        self.most_running = 0
+        self.count_lock = threading.Lock()
+
+    def convert_in_worker(self, *args):
+        with self.count_lock:
+            self.running = self.running + 1
+            self.most_running = max(self.most_running, self.running)
+        time.sleep(0.05)
+        try:
+            return super().convert_in_worker(*args)
+        finally:
+            with self.count_lock:
+                self.running = self.running - 1
+
+
+def test_convert_tap_async(tmp_path):
+    p = simpleBook()
+    output = asyncio.run(
+        convert_tap_async(p.tap, configFileName, p.namespaces, p.about, p.shapes)
+    )
+    assert len(Graph().parse(data=output.decode("utf-8"), format="turtle")) > 0
+    fname = str(tmp_path / "shacl.nt")
+    result = asyncio.run(
+        convert_tap_async(
+            p.tap, configFileName, p.namespaces, p.about, p.shapes, fname, "nt"
+        )
+    )
+    assert result == fname
+    assert len(Graph().parse(fname, format="nt")) > 0
+
+
+def test_convert_all(tmp_path):
+    profiles = [simpleBook(str(tmp_path / ("%d.ttl" % i))) for i in range(6)]
+    profiles.append(Profile("missing.csv", "", "", "", str(tmp_path / "x.ttl")))
+
+    async def convert_all():
+        async with SlowConverter(configFileName, max_workers=2) as converter:
+            ticks = 0
+            task = asyncio.ensure_future(converter.convert_all(profiles))
+            while not task.done():  # the loop keeps running meanwhile
+                ticks = ticks + 1
+                await asyncio.sleep(0.01)
+            return (converter, await task, ticks)
+
+    converter, results, ticks = asyncio.run(convert_all())
+    assert [r.output for r in results[:6]] == [p.output for p in profiles[:6]]
+    assert results[6].error.startswith("FileNotFoundError")
+    assert converter.most_running == 2
+    assert ticks > 5
+
+
+def test_cancel():
+    async def cancel():
+        async with SlowConverter(configFileName, max_workers=1) as converter:
+            tasks = [
+                asyncio.ensure_future(converter.convert(simpleBook())) for i in range(3)
+            ]
+            await asyncio.sleep(0.01)
+            for task in tasks:
+                task.cancel()
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            await asyncio.sleep(0.1)  # let the started conversion stop
+            return (converter, results)
+
+    converter, results = asyncio.run(cancel())
+    assert all(isinstance(r, asyncio.CancelledError) for r in results)
+    assert converter.running == 0
+
+
+def test_config_mismatch():
+    p = simpleBook()
+    converter = AsyncConverter(configFileName)
+    with pytest.raises(ValueError):
+        asyncio.run(
+            convert_tap_async(
+                p.tap, "other.yml", p.namespaces, p.about, p.shapes, converter=converter
+            )
+        )
+    converter.close()
@@ -0,0 +1,163 @@
+import pytest
+import os, shutil, subprocess, sys
+from tap2shacl import TAP2SHACLConverter
+from tap2shacl.batchConvert import (
+    BatchConverter,
+    Profile,
+    find_profiles,
+    read_manifest,
+    read_profiles,
+)
+from rdflib import Graph
+
+configFileName = "dctap.yml"
+examplesDir = "examples"
+
+
+@pytest.fixture(scope="module")
+def test_BatchConverter():
+    converter = BatchConverter(configFileName)
+    return converter
+
+
+def test_Profile_from_dir():
+    p = Profile.from_dir("examples/SimpleBook")
+    assert p.tap == os.path.join("examples/SimpleBook", "tap.csv")
+    assert p.namespaces == os.path.join("examples/SimpleBook", "namespaces.csv")
+    assert p.about == os.path.join("examples/SimpleBook", "about.csv")
+    assert p.shapes == os.path.join("examples/SimpleBook", "shapes.csv")
+    assert p.output == os.path.join("examples/SimpleBook", "shacl.ttl")
+
+
+def test_find_profiles():
+    profiles = find_profiles(examplesDir)
+    assert len(profiles) == 2
+    assert profiles[0].tap == os.path.join(examplesDir, "SHACLPerson", "tap.csv")
+    assert profiles[1].tap == os.path.join(examplesDir, "SimpleBook", "tap.csv")
+
+
+def test_read_manifest(tmp_path):
+    manifest = tmp_path / "manifest.csv"
+    book_dir = os.path.abspath("examples/SimpleBook")
+    manifest.write_text(
+        "profile,tap,output\n"
+        + book_dir
+        + ",,book.ttl\n,,\n"
+        + book_dir
+        + ",tap.csv,\n"
+    )
+    profiles = read_manifest(str(manifest))
+    assert len(profiles) == 2
+    assert profiles[0].tap == os.path.join(book_dir, "tap.csv")
+    assert profiles[0].output == os.path.join(book_dir, "book.ttl")
+    assert profiles[1].output == os.path.join(book_dir, "shacl.ttl")
+    assert read_profiles(str(manifest)) == profiles
+    assert read_profiles(book_dir) == [Profile.from_dir(book_dir)]
+    with pytest.raises(ValueError) as e:
+        read_profiles("notAFolder")
+    assert str(e.value) == "No profile folder or manifest file notAFolder"
+
+
+def test_namespace_table(test_BatchConverter):
+    c = test_BatchConverter
+    fname = "examples/SimpleBook/namespaces.csv"
+    table = c.namespace_table(fname)
+    assert table["xsd"] == "http://www.w3.org/2001/XMLSchema#"
+    assert c.namespace_table(fname) is table
+    assert len(c.namespace_tables) == 1
+
+
+def test_convert_all(test_BatchConverter, tmp_path):
+    c = test_BatchConverter
+    c.output_dir = str(tmp_path)
+    profiles = find_profiles(examplesDir)
+    results = c.convert_all(profiles)
+    output_fnames = [r.output for r in results]
+    assert [r.error for r in results] == [None, None]
+    assert output_fnames == [
+        os.path.join(str(tmp_path), "SHACLPerson.ttl"),
+        os.path.join(str(tmp_path), "SimpleBook.ttl"),
+    ]
+    for profile, fname in zip(profiles, output_fnames):
+        single = TAP2SHACLConverter(profile.tap, configFileName)
+        single.convertTAP2AP(profile.namespaces, profile.about, profile.shapes)
+        single.convertAP2SHACL()
+        assert len(Graph().parse(fname)) == len(single.sg)
+
+
+def test_convert_all_jobs(tmp_path):
+    # deterministic, so that unlabelled property shapes have the same names
+    c = BatchConverter(configFileName, str(tmp_path), deterministic=True)
+    profiles = find_profiles(examplesDir)
+    # a folder of its own, so that its output is not SimpleBook's
+    bad_dir = str(tmp_path / "profiles" / "BadBook")
+    shutil.copytree("examples/SimpleBook", bad_dir)
+    bad_profile = Profile.from_dir(bad_dir)
+    bad_profile.shapes = "notAFile.csv"
+    profiles.insert(1, bad_profile)
+    serial_results = c.convert_all(profiles)
+    serial_output = [open(r.output).read() for r in serial_results if r.output]
+    results = c.convert_all(profiles, jobs=2)
+    assert [r.profile for r in results] == profiles
+    assert results[0].error is None
+    assert results[1].output is None
+    assert results[1].error.startswith("FileNotFoundError")
+    assert results[2].error is None
+    for r in results:
+        if r.output:
+            assert len(Graph().parse(r.output)) > 0
+    output = [open(r.output).read() for r in results if r.output]
+    assert len(serial_output) == 2
+    assert output == serial_output
+
+
+def test_convert_all_same_output(tmp_path):
+    for folder in ["a", "b"]:
+        shutil.copytree("examples/SimpleBook", str(tmp_path / folder / "Book"))
+    profiles = [Profile.from_dir(str(tmp_path / f / "Book")) for f in ["a", "b"]]
+    profiles.insert(1, Profile.from_dir("examples/SHACLPerson"))
+    c = BatchConverter(configFileName, str(tmp_path / "out"))
+    results = c.convert_all(profiles)
+    assert [r.profile for r in results] == profiles
+    assert results[1].error is None
+    assert results[1].output == str(tmp_path / "out" / "SHACLPerson.ttl")
+    for r in [results[0], results[2]]:
+        assert r.output is None
+        assert r.error.startswith("Output file " + str(tmp_path / "out" / "Book.ttl"))
+    assert not os.path.exists(str(tmp_path / "out" / "Book.ttl"))
+
+
+def test_convert_all_jobs_broken_pool(tmp_path):
+    c = BatchConverter(configFileName, str(tmp_path))
+    # the workers cannot read the config, so none of them starts
+    c.config_fname = str(tmp_path / "notAConfig.yml")
+    profiles = find_profiles(examplesDir)
+    results = c.convert_all(profiles, jobs=2)
+    assert [r.profile for r in results] == profiles
+    for r in results:
+        assert r.output is None
+        assert r.error.startswith("BrokenProcessPool")
+
+
+def test_jobs_argument():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.path.abspath("src")
+    command = [sys.executable, "-m", "tap2shacl", "-b", examplesDir, "-j", "-1"]
+    result = subprocess.run(command, env=env, capture_output=True, text=True)
+    assert result.returncode == 2
+    assert "-j/--jobs: must be 0 or more" in result.stderr
+
+
+def test_convert_all_format(tmp_path):
+    c = BatchConverter(configFileName, str(tmp_path), format="nt")
+    profile = Profile.from_dir("examples/SimpleBook")
+    assert c.output_fname(profile) == os.path.join(str(tmp_path), "SimpleBook.nt")
+    c.output_dir = None
+    assert c.output_fname(profile) == os.path.join("examples/SimpleBook", "shacl.nt")
+    profile.output = str(tmp_path / "SimpleBook.txt")
+    [result] = c.convert_all([profile])
+    assert result.output == profile.output
+    single = TAP2SHACLConverter(profile.tap, configFileName)
+    single.convertTAP2AP(profile.namespaces, profile.about, profile.shapes)
+    single.convertAP2SHACL()
+    assert len(Graph().parse(result.output, format="nt")) == len(single.sg)
@@ -0,0 +1,76 @@
+import pytest
+import os, time, shutil
+from tap2shacl.outputCache import OutputCache
+from tap2shacl.batchConvert import BatchConverter, Profile
+
+configFileName = "dctap.yml"
+
+
+@pytest.fixture
+def test_OutputCache(tmp_path):
+    return OutputCache(str(tmp_path / "cache"), max_size=1000, max_age=3600)
+
+
+def test_key(test_OutputCache, tmp_path):
+    cache = test_OutputCache
+    a = tmp_path / "a.csv"
+    a.write_text("x,y\n")
+    key = cache.key([str(a)], ("turtle",))
+    assert len(key) == 64
+    assert key == cache.key([str(a)], ("turtle",))
+    assert key != cache.key([str(a)], ("nt",))
+    missing_key = cache.key([str(tmp_path / "missing.csv")], ("turtle",))
+    assert key != missing_key
+    a.write_text("x,z\n")
+    assert key != cache.key([str(a)], ("turtle",))
+
+
+def test_fetch_store(test_OutputCache, tmp_path):
+    cache = test_OutputCache
+    out = tmp_path / "out.ttl"
+    assert not cache.fetch("k1", str(out))
+    assert not out.exists()
+    out.write_text("turtle")
+    cache.store("k1", str(out))
+    copy = tmp_path / "copy.ttl"
+    assert cache.fetch("k1", str(copy))
+    assert copy.read_text() == "turtle"
+    cache.clear()
+    assert not cache.fetch("k1", str(copy))
+
+
+def test_evict(test_OutputCache, tmp_path):
+    cache = test_OutputCache
+    out = tmp_path / "out.ttl"
+    out.write_text("x" * 400)
+    for key in ["k1", "k2"]:
+        cache.store(key, str(out))
+    old = time.time() - 60
+    os.utime(cache.entry_fname("k1"), (old, old))
+    cache.store("k3", str(out))  # 1200 bytes, so least recently used k1 goes
+    assert [os.path.basename(e[2]) for e in cache.entries()] == ["k2", "k3"]
+    old = time.time() - 7200
+    os.utime(cache.entry_fname("k2"), (old, old))
+    cache.evict()  # k2 is too old
+    assert [os.path.basename(e[2]) for e in cache.entries()] == ["k3"]
+
+
+def test_BatchConverter_cache(test_OutputCache, tmp_path):
+    profile_dir = tmp_path / "SimpleBook"
+    shutil.copytree("examples/SimpleBook", str(profile_dir))
+    profile = Profile.from_dir(str(profile_dir))
+    c = BatchConverter(configFileName, cache=test_OutputCache)
+    test_OutputCache.max_size = 10**6
+    [result] = c.convert_all([profile])
+    assert result.error is None
+    assert not result.cached
+    first_output = open(result.output).read()
+    os.remove(result.output)
+    [result] = c.convert_all([profile])
+    assert result.cached
+    assert open(result.output).read() == first_output
+    with open(profile.tap, "a") as tap_file:
+        tap_file.write("\nAuthorShape,foaf:mbox,Email,FALSE,TRUE,IRI,,,,,,,,\n")
+    [result] = c.convert_all([profile])
+    assert not result.cached
+    assert open(result.output).read() != first_output
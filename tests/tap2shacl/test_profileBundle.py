@@ -0,0 +1,104 @@
+import pytest
+import os, subprocess, sys, zipfile
+from tap2shacl.profileBundle import read_files, read_zip, is_bundle
+from tap2shacl.batchConvert import BatchConverter, Profile, read_profiles
+from tap2shacl.outputCache import OutputCache, digest_inputs
+from rdflib import Graph
+
+configFileName = "dctap.yml"
+profileDir = "examples/SimpleBook"
+parts = ["tap", "namespaces", "about", "shapes"]
+
+
+def make_zip(fname, names, config=None):
+    """Zip the SimpleBook files, named in dict names of part: name in zip."""
+    with zipfile.ZipFile(fname, "w") as zip_file:
+        for part in names.keys():
+            zip_file.write(os.path.join(profileDir, part + ".csv"), names[part])
+        if config:
+            zip_file.write(config, "SimpleBook/dctap.yml")
+    return str(fname)
+
+
+@pytest.fixture
+def test_zip(tmp_path):
+    names = dict((part, "SimpleBook/Book AP - " + part + ".csv") for part in parts)
+    return make_zip(tmp_path / "SimpleBook.zip", names)
+
+
+def test_read_files():
+    bundle = read_files(Profile.from_dir(profileDir))
+    with open(os.path.join(profileDir, "tap.csv"), "rb") as f:
+        assert bundle.tap == f.read()
+    assert len(bundle.contents()) == 4
+    assert bundle.config is None
+    assert bundle.config_dict() is None
+    with pytest.raises(FileNotFoundError):
+        read_files(Profile.from_dir("examples"))
+
+
+def test_read_zip(test_zip, tmp_path):
+    assert is_bundle(test_zip)
+    assert not is_bundle(os.path.join(profileDir, "tap.csv"))
+    bundle = read_zip(test_zip)
+    assert bundle.contents() == read_files(Profile.from_dir(profileDir)).contents()
+    assert bundle.config is None
+    names = {"tap": "tap.csv", "about": "about.csv"}
+    bundle = read_zip(make_zip(tmp_path / "b.zip", names, configFileName))
+    assert bundle.shapes == b""
+    assert "prefixes" in bundle.config_dict().keys()
+    with pytest.raises(ValueError):
+        read_zip(make_zip(tmp_path / "c.zip", {"shapes": "shapes.csv"}))
+    names = {"tap": "tap.csv", "shapes": "x/tap.csv"}
+    with pytest.raises(ValueError):
+        read_zip(make_zip(tmp_path / "d.zip", names))
+
+
+def test_convert_bundle(test_zip, tmp_path):
+    profiles = read_profiles(test_zip)
+    assert profiles[0].bundle == test_zip
+    assert profiles[0].output == str(tmp_path / "SimpleBook.ttl")
+    cache = OutputCache(str(tmp_path / "cache"))
+    converter = BatchConverter(configFileName, format="nt", cache=cache)
+    results = converter.convert_all(profiles)
+    assert results[0].error is None
+    assert results[0].output == str(tmp_path / "SimpleBook.nt")
+    expected = Graph().parse(os.path.join(profileDir, "shacl.ttl"))
+    assert len(Graph().parse(results[0].output, format="nt")) == len(expected)
+    assert converter.convert_all(profiles)[0].cached
+
+
+def test_cache_key_unchanged():
+    """Keys from the contents read once are the same as from the files."""
+    converter = BatchConverter(configFileName, cache=OutputCache())
+    profile = Profile.from_dir(profileDir)
+    fnames = [
+        profile.tap,
+        configFileName,
+        profile.namespaces,
+        profile.about,
+        profile.shapes,
+    ]
+    options = ("turtle", False, False, None)
+    assert converter.cache_key(profile) == digest_inputs(fnames, options)
+
+
+def run_cli(args):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.path.abspath("src")
+    command = [sys.executable, "-m", "tap2shacl"] + args
+    return subprocess.run(command, env=env, capture_output=True, text=True)
+
+
+def test_bundle_cli(test_zip, tmp_path):
+    output = str(tmp_path / "SimpleBook.nq")
+    options = ["-c", configFileName, "-f", "nquads", "-g", "http://example.org/g"]
+    result = run_cli([test_zip, output, "--no-cache", "--columnar"] + options)
+    assert result.returncode == 0, result.stderr
+    with open(output, "r") as f:
+        lines = [line for line in f.read().splitlines() if not line.startswith("#")]
+    assert lines
+    assert all(line.endswith(" <http://example.org/g> .") for line in lines)
+    result = run_cli([test_zip, output, "-ns", "ns.csv"] + options)
+    assert result.returncode != 0
+    assert "-ns cannot be used with a zip" in result.stderr
@@ -0,0 +1,117 @@
+import pytest
+import json, threading
+from urllib.request import urlopen, Request
+from urllib.error import HTTPError
+from tap2shacl.server import ConversionService, ConversionServer, RequestError
+from tap2shacl import TAP2SHACLConverter
+from rdflib import Graph
+from rdflib.compare import isomorphic
+
+configFileName = "dctap.yml"
+profile_dir = "examples/SimpleBook/"
+
+
+def read_profile():
+    request = dict()
+    for name in ["tap", "namespaces", "about", "shapes"]:
+        with open(profile_dir + name + ".csv", "r") as csv_file:
+            request[name] = csv_file.read()
+    return request
+
+
+@pytest.fixture(scope="module")
+def test_server():
+    service = ConversionService(configFileName)
+    server = ConversionServer(service, port=0, quiet=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield "http://%s:%d" % server.server_address[:2]
+    server.shutdown()
+    server.server_close()
+
+
+def post(url, data):
+    body = json.dumps(data).encode("utf-8")
+    request = Request(url, data=body, headers={"Content-Type": "application/json"})
+    return urlopen(request)
+
+
+def expected_graph():
+    c = TAP2SHACLConverter(profile_dir + "tap.csv", configFileName)
+    c.convertTAP2AP(
+        profile_dir + "namespaces.csv",
+        profile_dir + "about.csv",
+        profile_dir + "shapes.csv",
+    )
+    c.convertAP2SHACL()
+    return Graph().parse(data=c.sg.serialize(format="turtle"), format="turtle")
+
+
+def test_convert_service():
+    service = ConversionService(configFileName)
+    output = service.convert(read_profile())
+    g = Graph().parse(data=output.decode("utf-8"), format="turtle")
+    assert isomorphic(g, expected_graph())
+    service.convert(dict(read_profile(), format="nt"))
+    assert service.status()["conversions"] == 2
+    assert service.status()["namespaceTables"] == 1  # read once, reused
+    with pytest.raises(RequestError):
+        service.convert(dict(read_profile(), format="rdfxml"))
+    with pytest.raises(RequestError):
+        service.convert({"shapes": "shapeID"})
+    for name, value in [
+        ("deterministic", "false"),
+        ("stream", 1),
+        ("graph", ["http://example.org/g"]),
+    ]:
+        with pytest.raises(RequestError):
+            service.convert(dict(read_profile(), **{name: value}))
+    assert service.status()["conversions"] == 2
+
+
+def test_convert_http(test_server):
+    response = post(test_server + "/convert", read_profile())
+    assert response.headers["Content-Type"].startswith("text/turtle")
+    g = Graph().parse(data=response.read().decode("utf-8"), format="turtle")
+    assert isomorphic(g, expected_graph())
+    response = post(test_server + "/convert", dict(read_profile(), format="nt"))
+    assert response.headers["Content-Type"] == "application/n-triples"
+    g = Graph().parse(data=response.read().decode("utf-8"), format="nt")
+    assert len(g) == len(expected_graph())
+
+
+def test_concurrent_requests(test_server):
+    results = [None] * 8
+
+    def convert(i):
+        response = post(test_server + "/convert", dict(read_profile(), format="nt"))
+        results[i] = len(Graph().parse(data=response.read().decode(), format="nt"))
+
+    threads = [threading.Thread(target=convert, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [len(expected_graph())] * 8
+
+
+def test_errors(test_server):
+    status = json.loads(urlopen(test_server + "/status").read())
+    assert status["config"] == configFileName
+    with pytest.raises(HTTPError) as e:
+        post(test_server + "/convert", dict(read_profile(), format="rdfxml"))
+    assert e.value.code == 400
+    assert "unknown" in json.loads(e.value.read())["error"]
+    with pytest.raises(HTTPError) as e:
+        post(test_server + "/convert", dict(read_profile(), deterministic="false"))
+    assert e.value.code == 400
+    assert "deterministic" in json.loads(e.value.read())["error"]
+    with pytest.raises(HTTPError) as e:
+        post(test_server + "/convert", {"tap": "shapeID,propertyID\nS,"})
+    assert e.value.code == 422
+    with pytest.raises(HTTPError) as e:
+        urlopen(Request(test_server + "/convert", data=b"not json"))
+    assert e.value.code == 400
+    with pytest.raises(HTTPError) as e:
+        urlopen(test_server + "/nothing")
+    assert e.value.code == 404
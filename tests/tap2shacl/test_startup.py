@@ -0,0 +1,43 @@
+import pytest
+import tap2shacl
+from benchmarks.startupBenchmark import (
+    import_times,
+    heavy_modules,
+    parse_import_times,
+    total_import_time,
+)
+
+
+@pytest.mark.parametrize("args", [["--version"], ["--help"]])
+def test_cli_start_is_light(args):
+    times = import_times(args)
+    assert "tap2shacl" in times
+    loaded = [name for name in times if name.split(".")[0] in heavy_modules]
+    assert loaded == []
+
+
+def test_total_import_time():
+    text = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       100 |        100 |   codecs.aliases",
+            "import time:       200 |        300 | codecs",
+            "import time:        50 |         50 |     json.scanner",
+            "import time:        30 |         80 |   json.decoder",
+            "import time:        20 |        100 | json",
+        ]
+    )
+    times = parse_import_times(text)
+    assert times["codecs.aliases"] == (1, 100)
+    assert times["json.scanner"] == (2, 50)
+    assert times["json"] == (0, 100)
+    assert total_import_time(times) == 400
+
+
+def test_lazy_attributes():
+    assert "TAP2SHACLConverter" in dir(tap2shacl)
+    from tap2shacl.tap2shaclConverter import TAP2SHACLConverter
+
+    assert tap2shacl.TAP2SHACLConverter is TAP2SHACLConverter
+    with pytest.raises(AttributeError):
+        tap2shacl.NoSuchThing
@@ -0,0 +1,44 @@
+import pytest
+from benchmarks.syntheticProfile import SyntheticProfile
+from benchmarks.scalingBenchmark import time_phases, phases
+from rdflib import SH
+
+configFileName = "dctap.yml"
+
+
+@pytest.fixture(scope="module")
+def synthetic_profile(tmp_path_factory):
+    synthetic = SyntheticProfile(shapes=3, rows_per_shape=8, fan_out=2)
+    return synthetic.write(str(tmp_path_factory.mktemp("synthetic")))
+
+
+@pytest.mark.parametrize("reader", ["dctap", "fast"])
+def test_time_phases(synthetic_profile, reader):
+    times = time_phases(synthetic_profile, configFileName, reader)
+    assert times["reader"] == reader
+    for phase in phases:
+        assert times[phase] >= 0
+    assert times["statementTemplates"] == 3 * 8
+    assert times["triples"] > 0
+
+
+def test_synthetic_shacl(synthetic_profile):
+    from tap2shacl import TAP2SHACLConverter
+
+    c = TAP2SHACLConverter(synthetic_profile.tap, configFileName, reader="fast")
+    c.convertTAP2AP(
+        synthetic_profile.namespaces, synthetic_profile.about, synthetic_profile.shapes
+    )
+    assert list(c.ap.shapeInfo.keys()) == ["Shape0", "Shape1", "Shape2"]
+    for shape in c.ap.shapeInfo.keys():
+        templates = [ps for ps in c.ap.statementTemplates if ps.shapes == [shape]]
+        assert len(templates) == 8
+    picklist = c.ap.statementTemplates[1]
+    assert picklist.valueConstraints == ["value%d" % i for i in range(5)]
+    fan_out = c.ap.statementTemplates[2]
+    assert fan_out.valueShapes == ["Shape1", "Shape2"]
+    multi_valued = c.ap.statementTemplates[0]
+    assert multi_valued.valueClasses == ["ex:ClassA", "ex:ClassB"]
+    c.convertAP2SHACL()
+    # rows 2 and 6 of each shape refer to two other shapes
+    assert len(list(c.sg.triples((None, SH.node, None)))) == 3 * 2 * 2
@@ -1,7 +1,10 @@
 import pytest
 from tap2shacl import TAP2SHACLConverter, TAP2APConverter, AP2SHACLConverter
+from ap import ColumnarAP, PhaseTimer
 from rdflib import Graph, URIRef
-import pprint
+from rdflib.compare import isomorphic
+from csv import DictReader
+import io, json, os, pprint, pstats, subprocess, sys, tracemalloc
 
 tapFileName = "tests/tap2shacl/TestData/booksTAP.csv"
 configFileName = "dctap.yml"
@@ -56,3 +59,204 @@ def test_convertTAP2SHACL(test_Converter):
         if stmt not in expected_sg:
             print(stmt)
         assert stmt in expected_sg
+
+
+def test_deterministic(tmp_path):
+    # same TAP without property labels, so property shapes need generated names
+    unlabelled_tap = tmp_path / "unlabelledTAP.csv"
+    with open(tapFileName, "r") as tap_file:
+        lines = tap_file.read().splitlines()
+    rows = [line.split(",", 3) for line in lines]
+    unlabelled_tap.write_text(
+        "\n".join(",".join(row[:2] + row[3:]) for row in rows) + "\n"
+    )
+    outputs = []
+    for i in range(2):
+        c = TAP2SHACLConverter(str(unlabelled_tap), configFileName, deterministic=True)
+        c.convertTAP2AP(namespaceFileName, aboutFileName, shapesFileName)
+        c.convertAP2SHACL()
+        fname = tmp_path / ("shacl%d.ttl" % i)
+        c.dump_shacl(str(fname))
+        outputs.append(fname.read_bytes())
+    assert outputs[0] == outputs[1]
+    c = TAP2SHACLConverter(str(unlabelled_tap), configFileName)
+    c.convertTAP2AP(namespaceFileName, aboutFileName, shapesFileName)
+    c.convertAP2SHACL()
+    fname = tmp_path / "shacl_random.ttl"
+    c.dump_shacl(str(fname))
+    assert fname.read_bytes() != outputs[0]
+
+
+def test_stream_shacl(tmp_path):
+    c = TAP2SHACLConverter(tapFileName, configFileName)
+    c.convertTAP2AP(namespaceFileName, aboutFileName, shapesFileName)
+    fname = str(tmp_path / "shacl.ttl")
+    c.stream_shacl(fname)
+    assert len(c.sg) == 0
+    sg = Graph().parse(fname)
+    # compare with the parsed output of dump_shacl, as both are written
+    # relative to @base
+    c.convertAP2SHACL()
+    dump_fname = str(tmp_path / "dump.ttl")
+    c.dump_shacl(dump_fname)
+    expected_sg = Graph().parse(dump_fname)
+    assert len(sg) == len(expected_sg) == len(c.sg)
+    for stmt in expected_sg:
+        assert stmt in sg
+
+
+def test_in_memory():
+    def text(fname):
+        with open(fname, "r") as f:
+            return f.read()
+
+    with open(shapesFileName, "r") as f:
+        shape_rows = list(DictReader(f))
+    c = TAP2SHACLConverter(io.StringIO(text(tapFileName)), configFileName)
+    c.convertTAP2AP(
+        text(namespaceFileName),
+        io.BytesIO(text(aboutFileName).encode("utf-8")),
+        shape_rows,
+    )
+    c.convertAP2SHACL()
+    expected = TAP2SHACLConverter(tapFileName, configFileName)
+    expected.convertTAP2AP(namespaceFileName, aboutFileName, shapesFileName)
+    assert c.ap.namespaces == expected.ap.namespaces
+    assert c.ap.metadata == expected.ap.metadata
+    assert len(c.sg) == len(Graph().parse(shaclFileName))
+
+
+@pytest.mark.parametrize("reader", ["dctap", "fast"])
+@pytest.mark.parametrize("format", ["turtle", "nt", "nquads"])
+def test_write_pipeline(reader, format):
+    c = TAP2SHACLConverter(tapFileName, configFileName, None, True, reader)
+    c.load_profile(namespaceFileName, aboutFileName, shapesFileName)
+    graph = "http://example.org/g"
+    f = io.BytesIO()
+    c.write_pipeline(f, format, graph)
+    assert len(c.ap.statementTemplates) == 0  # converted without the AP
+    expected = TAP2SHACLConverter(tapFileName, configFileName, None, True, reader)
+    expected.convertTAP2AP(namespaceFileName, aboutFileName, shapesFileName)
+    expected_f = io.BytesIO()
+    expected.write_output(expected_f, format, graph=graph)
+    output = f.getvalue()
+    expected_output = expected_f.getvalue()
+    if format == "nquads":
+        # compare the triples, all in the one graph
+        assert output.count(b" <" + graph.encode() + b"> .") == output.count(b"\n") - 1
+        format = "nt"
+        output = output.replace(b" <" + graph.encode() + b"> .", b" .")
+        expected_output = expected_output.replace(
+            b" <" + graph.encode() + b"> .", b" ."
+        )
+    g = Graph().parse(data=output, format=format)
+    assert isomorphic(g, Graph().parse(data=expected_output, format=format))
+    with pytest.raises(ValueError):
+        c.write_pipeline(io.BytesIO(), "xml")
+
+
+def test_timer(tmp_path):
+    c = TAP2SHACLConverter(tapFileName, configFileName)
+    c.convertTAP2AP(namespaceFileName, aboutFileName, shapesFileName)
+    c.convertAP2SHACL()
+    c.dump_shacl(str(tmp_path / "shacl.ttl"))
+    phases = dict((phase.name, phase) for phase in c.timer.phases)
+    assert list(phases.keys()) == [
+        "config load",
+        "TAP read",
+        "namespace conversion",
+        "shapeInfo load",
+        "metadata load",
+        "TAP to AP",
+        "AP to SHACL",
+        "output",
+    ]
+    assert phases["TAP read"].rows == phases["TAP to AP"].rows == 7
+    assert phases["shapeInfo load"].rows == 2
+    assert phases["AP to SHACL"].triples == phases["output"].triples == len(c.sg)
+
+
+def test_profile_cli(tmp_path):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.path.abspath("src")
+    stats = str(tmp_path / "run.prof")
+    command = [sys.executable, "-m", "tap2shacl", tapFileName, str(tmp_path / "o.nt")]
+    command += ["-c", configFileName, "-ns", namespaceFileName, "-a", aboutFileName]
+    command += ["-s", shapesFileName, "-f", "nt", "--no-cache"]
+    command += ["--profile", "json", "--cprofile", stats]
+    result = subprocess.run(command, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    report = json.loads(result.stderr[: result.stderr.rindex("}") + 1])
+    phases = [phase["name"] for phase in report["phases"]]
+    assert phases[-1] == "AP to SHACL output"
+    assert report["phases"][-1]["triples"] == 73
+    assert pstats.Stats(stats).total_calls > 0
+
+
+@pytest.mark.parametrize("option", [["--profile"], ["--memory-report"]])
+def test_report_skips_cache(option, tmp_path):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.path.abspath("src")
+    command = [sys.executable, "-m", "tap2shacl", tapFileName, str(tmp_path / "o.ttl")]
+    command += ["-c", configFileName, "-ns", namespaceFileName, "-a", aboutFileName]
+    command += ["-s", shapesFileName, "--cacheDir", str(tmp_path / "cache")]
+    for i in range(2):
+        result = subprocess.run(
+            command + option, env=env, capture_output=True, text=True
+        )
+        assert result.returncode == 0, result.stderr
+        assert "from cache" not in result.stdout
+        assert "TAP to AP" in result.stderr
+
+
+@pytest.mark.parametrize(
+    "args", [["-b", "examples"], ["--serve", "0"], ["-w"], ["book.zip"]]
+)
+def test_profile_single_only(args):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.path.abspath("src")
+    command = [sys.executable, "-m", "tap2shacl"] + args + ["--profile", "table"]
+    result = subprocess.run(command, env=env, capture_output=True, text=True)
+    assert result.returncode != 0
+    assert "--profile reports on converting a single TAP" in result.stderr
+
+
+def test_memory_report():
+    was_tracing = tracemalloc.is_tracing()
+    try:
+        timer = PhaseTimer(trace_memory=True)
+        c = TAP2SHACLConverter(tapFileName, configFileName, timer=timer)
+        c.convertTAP2AP(namespaceFileName, aboutFileName, shapesFileName)
+        c.convertAP2SHACL()
+        assert c.timer is timer
+        for phase in timer.phases:
+            assert phase.peak >= phase.memory > 0
+        phases = dict((phase.name, phase) for phase in timer.phases)
+        sites = [a["site"] for a in phases["AP to SHACL"].allocations]
+        assert any(site.startswith("rdflib") for site in sites)
+        sites = [a["site"] for a in phases["TAP read"].allocations]
+        assert any(site.startswith("dctap") for site in sites)
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+
+@pytest.mark.parametrize("reader", ["dctap", "fast"])
+def test_columnar_backend(reader, tmp_path):
+    outputs = dict()
+    for backend in ["objects", "columnar"]:
+        c = TAP2SHACLConverter(
+            tapFileName, configFileName, None, True, reader, backend=backend
+        )
+        c.convertTAP2AP(namespaceFileName, aboutFileName, shapesFileName)
+        fname = tmp_path / (backend + ".ttl")
+        c.stream_shacl(str(fname))
+        outputs[backend] = (c.ap, fname.read_bytes())
+    ap, columnar_ap = outputs["objects"][0], outputs["columnar"][0]
+    assert type(columnar_ap) == ColumnarAP
+    assert columnar_ap.statementTemplates == ap.statementTemplates
+    assert outputs["columnar"][1] == outputs["objects"][1]
+    c.convertAP2SHACL()
+    assert isomorphic(c.sg, Graph().parse(shaclFileName))
+    with pytest.raises(ValueError):
+        TAP2APConverter(tapFileName, configFileName, backend="rows")
@@ -0,0 +1,73 @@
+import pytest
+import os, shutil, subprocess, sys
+from tap2shacl.watch import ProfileWatcher
+from tap2shacl.batchConvert import Profile
+from rdflib import Graph
+
+configFileName = "dctap.yml"
+
+
+@pytest.fixture
+def test_ProfileWatcher(tmp_path):
+    profile_dir = tmp_path / "SimpleBook"
+    shutil.copytree("examples/SimpleBook", str(profile_dir))
+    profile = Profile.from_dir(str(profile_dir))
+    watcher = ProfileWatcher(
+        profile, configFileName, profile.output, interval=0.01, debounce=0.01
+    )
+    return watcher
+
+
+def test_convert(test_ProfileWatcher):
+    w = test_ProfileWatcher
+    assert w.convert() == ["BookShape", "AuthorShape"]
+    first_output = open(w.output).read()
+    assert len(Graph().parse(w.output)) > 0
+    assert w.convert() is None  # nothing changed
+    batchConverter = w.batchConverter
+    with open(w.profile.tap, "r") as tap_file:
+        tap = tap_file.read()
+    with open(w.profile.tap, "w") as tap_file:
+        tap_file.write(tap.replace("Title of the book.", "Title of this book."))
+    assert w.convert() == ["BookShape"]
+    assert w.batchConverter is batchConverter  # config not read again
+    output = open(w.output).read()
+    assert output != first_output
+    assert "Title of this book." in output
+    with open(w.profile.tap, "w") as tap_file:
+        tap_file.write(tap)
+    assert w.convert() == ["BookShape"]
+    assert open(w.output).read() == first_output
+
+
+def test_wait_for_change(test_ProfileWatcher):
+    w = test_ProfileWatcher
+    assert not w.wait_for_change(timeout=0.05)
+    stat = os.stat(w.profile.shapes)
+    os.utime(w.profile.shapes, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert w.wait_for_change(timeout=0.05)
+    assert not w.wait_for_change(timeout=0.05)
+
+
+def test_reader_backend(test_ProfileWatcher, tmp_path):
+    w = test_ProfileWatcher
+    w.convert()
+    expected = Graph().parse(w.output)
+    fast = ProfileWatcher(
+        w.profile,
+        configFileName,
+        str(tmp_path / "fast.ttl"),
+        reader="fast",
+        backend="columnar",
+    )
+    assert fast.convert() == ["BookShape", "AuthorShape"]
+    assert len(Graph().parse(fast.output)) == len(expected)
+
+
+def test_watch_stream_cli():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.path.abspath("src")
+    command = [sys.executable, "-m", "tap2shacl", "-w", "--stream"]
+    result = subprocess.run(command, env=env, capture_output=True, text=True)
+    assert result.returncode != 0
+    assert "--stream cannot be used in watch mode" in result.stderr